@@ -21,7 +21,7 @@
 
 
 import numpy as np
-from scipy import signal
+from pydsm.ft import extract_tones
 
 __all__ = ['find_tone']
 
@@ -32,7 +32,9 @@ def find_tone(x_in, f, fs=1, start=0, N=None, adjust_N=False, window='hanning',
 
     This is a complicate function to extract information (amplitude and
     phase) about a tone embedded in noise. In spite of its sophistication
-    this function may not always work correctly.
+    this function may not always work correctly. It is a thin wrapper
+    around :func:`pydsm.ft.extract_tones`, that should be preferred in new
+    code.
 
     Parameters
     ----------
@@ -84,17 +86,10 @@ def find_tone(x_in, f, fs=1, start=0, N=None, adjust_N=False, window='hanning',
         N2 = int(np.round(P*samples_per_period))
     else:
         N2 = int(np.min((Nmax, N)))
-    if window == 'boxcar' or window is None:
-        data = x_in[start:N2+start]
-    else:
-        win = signal.get_window(window, N2)
-        adj = np.sum(win)/N2
-        win = win/adj
-        data = x_in[start:N2+start]*win
-    x_cos = np.cos(2*np.pi*fn*np.arange(start, N2+start))
-    x_sin = np.sin(2*np.pi*fn*np.arange(start, N2+start))
-    b = 2*np.dot(x_cos, data)/N2
-    a = 2*np.dot(x_sin, data)/N2
+    # extract_tones gives the phasor b-1j*a
+    X = extract_tones(x_in[start:N2+start], fn, window=window, t0=start)
+    b = X.real
+    a = -X.imag
     if output == 'complex':
         return b+1j*a
     elif output == 'xy':
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2013, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Benchmarks for the NTF design functions
+"""
+
+import numpy as np
+from scipy import signal
+from scipy.optimize import fmin_l_bfgs_b
+from pydsm.delsig import (evalTF, synthesizeNTF, synthesizeNTF_many, clans,
+                          ds_optzeros, ds_synNTFobj1, ds_synNTFobj1_grad)
+from pydsm.NTFdesign import (ntf_fir_weighting, ntf_fir_minmax,
+                             quantization_noise_gain)
+from pydsm.NTFdesign.helpers import spread_fir_uc_zeros
+from pydsm.NTFdesign.weighting import q0_weighting
+from pydsm.NTFdesign.psychoacoustic import audio_noise_weighting
+
+_modeler_modules = {'cvxpy_old': 'cvxpy_tinoco',
+                    'cvxpy': 'cvxpy',
+                    'picos': 'picos'}
+
+
+def check_modeler(modeler):
+    """
+    Skip the current benchmark if the modeler is not installed
+    """
+    try:
+        __import__(_modeler_modules[modeler])
+    except ImportError:
+        raise NotImplementedError("Modeler '{}' not installed".
+                                  format(modeler))
+
+
+class NtfFirWeighting(object):
+    """
+    FIR NTF design from a noise weighting filter
+    """
+    params = [['cvxpy_old', 'cvxpy', 'picos'], [8, 16, 24]]
+    param_names = ['modeler', 'order']
+    number = 1
+    repeat = 1
+    timeout = 300
+
+    def setup(self, modeler, order):
+        check_modeler(modeler)
+        # signal and filter specification
+        fsig = 1000.
+        B = 400.
+        OSR = 64
+        fphi = B*OSR*2
+        w0 = 2*fsig/fphi
+        B0 = 2*B/fphi
+        w1 = (np.sqrt(B0**2+4*w0**2)-B0)/2
+        w2 = (np.sqrt(B0**2+4*w0**2)+B0)/2
+        self.hz = signal.butter(4, [w1, w2], 'bandpass', output='zpk')
+        self.H_inf = 1.5
+        self.ff = np.linspace(0, 0.5, 1024)
+
+    def design(self, modeler, order):
+        return ntf_fir_weighting(order, self.hz, self.H_inf,
+                                 modeler=modeler, show_progress=False)
+
+    def time_ntf_fir_weighting(self, modeler, order):
+        self.design(modeler, order)
+
+    def track_lee_slack(self, modeler, order):
+        ntf = self.design(modeler, order)
+        vv = np.abs(evalTF(ntf, np.exp(2j*np.pi*self.ff)))
+        return self.H_inf-np.max(vv)
+
+    def track_quantization_noise_gain(self, modeler, order):
+        ntf = self.design(modeler, order)
+        return quantization_noise_gain(ntf, self.hz)
+
+
+class NtfFirMinmax(object):
+    """
+    FIR NTF design by min-max optimization
+    """
+    params = [['cvxpy_old', 'cvxpy', 'picos'], [8, 16], [0., 0.2]]
+    param_names = ['modeler', 'order', 'f0']
+    number = 1
+    repeat = 1
+    timeout = 300
+
+    def setup(self, modeler, order, f0):
+        check_modeler(modeler)
+
+    def time_ntf_fir_minmax(self, modeler, order, f0):
+        ntf_fir_minmax(order, 32, 1.5, f0, modeler=modeler,
+                       show_progress=False)
+
+
+class SynthesizeNTF(object):
+    """
+    DELSIG style NTF design
+    """
+    params = [[2, 4, 6, 8, 12], [0, 1, 3], [0., 0.2]]
+    param_names = ['order', 'opt', 'f0']
+
+    def time_synthesizeNTF(self, order, opt, f0):
+        synthesizeNTF(order, 32, opt, 1.5, f0)
+
+
+class SynthesizeNTFGrid(object):
+    """
+    DELSIG style NTF design over a grid of specifications
+    """
+    params = [['loop', 'many']]
+    param_names = ['method']
+
+    def setup(self, method):
+        order = np.asarray([2, 3, 4, 5, 6, 8])
+        osr = np.asarray([16, 32, 64, 128])
+        H_inf = np.linspace(1.3, 3., 10)
+        self.specs = [a.ravel() for a in np.meshgrid(order, osr, H_inf)]
+
+    def time_synthesizeNTF_grid(self, method):
+        if method == 'loop':
+            for order, osr, H_inf in zip(*self.specs):
+                synthesizeNTF(order, osr, 1, H_inf)
+        else:
+            synthesizeNTF_many(self.specs[0], self.specs[1], 1, self.specs[2])
+
+
+class SynthesizeNTFZeroOptimization(object):
+    """
+    Zero optimization step of synthesizeNTF (opt=3), with finite
+    difference or analytic gradients
+    """
+    params = [['approx', 'analytic'], [4, 8, 12, 14]]
+    param_names = ['gradient', 'order']
+
+    def setup(self, gradient, order):
+        self.osr = 64
+        self.p = synthesizeNTF(order, self.osr, 1, 1.5)[1]
+        x0 = ds_optzeros(order, 1)
+        self.x0 = x0[x0 > 0]
+        self.bounds = [(0., 1.)]*self.x0.size
+
+    def optimize(self, gradient):
+        if gradient == 'approx':
+            return fmin_l_bfgs_b(ds_synNTFobj1, self.x0,
+                                 args=(self.p, self.osr, 0.),
+                                 approx_grad=True, bounds=self.bounds)
+        else:
+            return fmin_l_bfgs_b(ds_synNTFobj1_grad, self.x0,
+                                 args=(self.p, self.osr, 0.),
+                                 bounds=self.bounds)
+
+    def time_zero_optimization(self, gradient, order):
+        self.optimize(gradient)
+
+    def track_objective_evaluations(self, gradient, order):
+        return self.optimize(gradient)[2]['funcalls']
+    track_objective_evaluations.unit = 'evaluations'
+
+
+class Clans(object):
+    """
+    CLANS design of multi-bit NTFs
+    """
+    params = [[4, 5, 6], [3, 9, 17], [0.9, 0.99]]
+    param_names = ['order', 'nq', 'rmax']
+
+    def time_clans(self, order, nq, rmax):
+        clans(order, 32, nq, rmax, 1)
+
+
+class SpreadFirUcZeros(object):
+    """
+    Spreading of FIR NTF zeros on the unit circle by noise gain
+    """
+    params = [['fast', 'generic'], [8, 12, 20]]
+    param_names = ['path', 'order']
+    timeout = 120
+
+    def setup(self, path, order):
+        if path == 'fast':
+            self.cf = quantization_noise_gain
+        else:
+            # Hide the function identity to force the generic path
+            self.cf = lambda *args, **kwargs: \
+                quantization_noise_gain(*args, **kwargs)
+
+    def time_spread_fir_uc_zeros(self, path, order):
+        spread_fir_uc_zeros(order, 64, self.cf,
+                            cf_kwargs={'bounds': (0, 0.5/64)})
+
+
+class Q0AudioWeighting(object):
+    """
+    Quadratic form from an audio noise weighting, vectorized or scalar
+    """
+    params = [[True, False], [8, 24]]
+    param_names = ['vectorized', 'order']
+
+    def setup(self, vectorized, order):
+        w = audio_noise_weighting(64)
+        if vectorized:
+            self.w = w
+        else:
+            self.w = lambda f: w(f)
+            self.w.points = w.points
+
+    def time_q0_weighting(self, vectorized, order):
+        q0_weighting(order, self.w)
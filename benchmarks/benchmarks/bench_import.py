@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Benchmarks for the import time of the PyDSM modules
+"""
+
+import sys
+import subprocess
+
+
+class ImportTime(object):
+    """
+    Import time of the main modules in a fresh interpreter
+    """
+    params = [['pydsm', 'pydsm.delsig', 'pydsm.NTFdesign',
+               'pydsm.simulation']]
+    param_names = ['module']
+
+    def timeraw_import(self, module):
+        return "import {}".format(module)
+
+    def track_loaded_modules(self, module):
+        code = "import sys, {}; print(len(sys.modules))".format(module)
+        return int(subprocess.check_output([sys.executable, '-c', code]))
+
+    track_loaded_modules.unit = 'modules'
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2013, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Benchmarks for the ΔΣ modulator simulator
+"""
+
+import numpy as np
+import os
+import tempfile
+import scipy.linalg as la
+from scipy import signal
+import warnings
+from timeit import default_timer as timer
+from pydsm.delsig import (simulateDSM, simulateDSM_many, simulateQDSM,
+                          simulateSNR, synthesizeNTF, mapQtoR,
+                          maxStableAmplitude)
+from pydsm.delsig._simulateQDSM_scipy import _qntf_realization
+from pydsm.delsig._simulateDSM import HAS_CBLAS
+from pydsm.exceptions import PyDsmSlowPathWarning
+
+
+def abcd_from_ntf(ntf, channels=1):
+    """
+    ABCD matrix of a bank of independent modulators sharing the same NTF
+
+    Each modulator has its own input and quantizer, so that the result
+    has as many inputs and quantizers as ``channels``.
+    """
+    z, p, k = ntf
+    A, B2, C, D2 = signal.zpk2ss(p, z, -1)
+    order = A.shape[0]
+    A = la.block_diag(*([A]*channels))
+    B1 = la.block_diag(*([-B2]*channels))
+    B2 = la.block_diag(*([B2]*channels))
+    C = la.block_diag(*([C]*channels))
+    return np.vstack((np.hstack((A, B1, B2)),
+                      np.hstack((C, np.eye(channels),
+                                 np.zeros((channels, channels))))))
+
+
+class SimulateDSM(object):
+    """
+    Simulation speed as a function of the modulator and of the backend
+    """
+    params = [['scipy_blas', 'cblas', 'scipy'],
+              [2, 5, 8],
+              [2, 17],
+              [10000, 100000],
+              [1, 2]]
+    param_names = ['backend', 'order', 'nlev', 'N', 'channels']
+    timeout = 120
+
+    def setup(self, backend, order, nlev, N, channels):
+        if backend == 'cblas' and not HAS_CBLAS:
+            raise NotImplementedError("Cblas libraries not available")
+        if backend == 'scipy' and (channels > 1 or N > 10000):
+            # Slow simulator, only single quantizer
+            raise NotImplementedError("Case too slow or unsupported")
+        warnings.simplefilter('ignore', PyDsmSlowPathWarning)
+        ntf = synthesizeNTF(order, 32, 1)
+        if channels == 1:
+            self.H = ntf
+        else:
+            self.H = abcd_from_ntf(ntf, channels)
+        self.nlev = [nlev]*channels
+        t = np.arange(N)
+        self.u = np.asarray([0.5*(nlev-1)*np.sin(2*np.pi*(85+10*i)/N*t)
+                             for i in range(channels)])
+        if channels == 1:
+            self.u = self.u[0]
+
+    def time_simulateDSM(self, backend, order, nlev, N, channels):
+        simulateDSM(self.u, self.H, self.nlev, backend=backend)
+
+    def track_samples_per_second(self, backend, order, nlev, N, channels):
+        best = np.inf
+        for i in range(3):
+            tic = timer()
+            simulateDSM(self.u, self.H, self.nlev, backend=backend)
+            best = min(best, timer()-tic)
+        return N*channels/best
+
+    track_samples_per_second.unit = 'samples/s'
+
+
+class SimulateDSMPrecision(object):
+    """
+    Single versus double precision simulation
+    """
+    params = [['scipy_blas', 'cblas'],
+              ['float64', 'float32'],
+              [2, 5]]
+    param_names = ['backend', 'dtype', 'order']
+
+    def setup(self, backend, dtype, order):
+        if backend == 'cblas' and not HAS_CBLAS:
+            raise NotImplementedError("Cblas libraries not available")
+        self.H = synthesizeNTF(order, 32, 1)
+        self.u = 0.5*np.sin(2*np.pi*85/100000*np.arange(100000))
+
+    def time_simulateDSM(self, backend, dtype, order):
+        simulateDSM(self.u, self.H, backend=backend, dtype=dtype)
+
+
+class SimulateDSMStore(object):
+    """
+    Cost of storing the state and the quantizer input while simulating
+    """
+    params = [[False, True]]
+    param_names = ['store']
+
+    def setup(self, store):
+        self.H = synthesizeNTF(5, 32, 1)
+        self.u = 0.5*np.sin(2*np.pi*85/100000*np.arange(100000))
+
+    def time_simulateDSM(self, store):
+        simulateDSM(self.u, self.H, store_xn=store, store_xmax=store,
+                    store_y=store)
+
+
+class SimulateDSMOut(object):
+    """
+    Simulation into caller supplied outputs, possibly memory mapped
+    """
+    params = [['alloc', 'int8', 'memmap']]
+    param_names = ['out']
+
+    def setup(self, out):
+        N = 1000000
+        self.H = synthesizeNTF(5, 32, 1)
+        self.u = 0.5*np.sin(2*np.pi*85/N*np.arange(N))
+        self.dir = tempfile.mkdtemp()
+        if out == 'alloc':
+            self.v = None
+        elif out == 'int8':
+            self.v = np.empty(N, dtype=np.int8)
+        else:
+            fu = os.path.join(self.dir, 'u.npy')
+            np.save(fu, self.u)
+            self.u = np.load(fu, mmap_mode='r')
+            self.v = np.lib.format.open_memmap(
+                os.path.join(self.dir, 'v.npy'), mode='w+',
+                dtype=np.int8, shape=(N,))
+
+    def teardown(self, out):
+        self.u = self.v = None
+        for f in os.listdir(self.dir):
+            os.remove(os.path.join(self.dir, f))
+        os.rmdir(self.dir)
+
+    def time_simulateDSM(self, out):
+        simulateDSM(self.u, self.H, out_v=self.v)
+
+
+class SimulateDSMMany(object):
+    """
+    Many independent simulations run concurrently on a pool of threads
+    """
+    params = [[1, 2, 4]]
+    param_names = ['workers']
+
+    def setup(self, workers):
+        self.H = synthesizeNTF(5, 32, 1)
+        t = np.arange(100000)
+        self.uu = [0.5*np.sin(2*np.pi*(85+10*i)/100000*t) for i in range(8)]
+
+    def time_simulateDSM_many(self, workers):
+        simulateDSM_many(self.uu, self.H, workers=workers)
+
+
+class SimulateQDSM(object):
+    """
+    Quadrature modulator simulated with complex arithmetic vs. its
+    real-doubled equivalent
+    """
+    params = [['complex', 'real_doubled'],
+              [2, 5, 8],
+              [100000]]
+    param_names = ['mode', 'order', 'N']
+
+    def setup(self, mode, order, N):
+        z, p, k = synthesizeNTF(order, 32, 1)
+        rot = np.exp(2j*np.pi*0.1)
+        A, B1, B2, C, D1 = _qntf_realization(z*rot, p*rot)
+        self.abcd = np.vstack((np.hstack((A, B1, B2)),
+                               np.hstack((C, D1, np.zeros((1, 1))))))
+        self.abcd_r = mapQtoR(self.abcd)
+        n = np.arange(N)
+        self.u = 0.5*np.exp(2j*np.pi*(0.1+1./1024)*n)
+        self.u_r = np.vstack((self.u.real, self.u.imag))
+
+    def time_simulate(self, mode, order, N):
+        if mode == 'complex':
+            simulateQDSM(self.u, self.abcd)
+        else:
+            simulateDSM(self.u_r, self.abcd_r, nlev=[2, 2])
+
+
+class SimulateSNR(object):
+    """
+    SNR versus amplitude curve, with amplitudes simulated in batches
+    """
+    params = [[1, 4, 8, 16], [2, 5, 8]]
+    param_names = ['batch', 'order']
+
+    def setup(self, batch, order):
+        self.H = synthesizeNTF(order, 32, 1)
+
+    def time_simulateSNR(self, batch, order):
+        simulateSNR(self.H, 32, batch=batch)
+
+
+class MaxStableAmplitude(object):
+    """
+    Stability map of an NTF over a set of input frequencies
+    """
+    params = [[1, 8], [1, 4]]
+    param_names = ['batch', 'workers']
+    timeout = 300
+
+    def setup(self, batch, workers):
+        self.ntf = synthesizeNTF(5, 32, 1)
+        self.f = np.linspace(0.001, 1./64, 16)
+
+    def time_max_stable_amplitude(self, batch, workers):
+        maxStableAmplitude(self.ntf, self.f, batch=batch, workers=workers)
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2013, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Benchmarks for the Fourier transform, correlation and merit factor utilities
+"""
+
+import numpy as np
+from scipy import signal
+from timeit import default_timer as timer
+from pydsm.ft import (fft_centered, dtft, dtft_hermitian, idtft_hermitian,
+                      WelchPSD, extract_tones)
+from pydsm.correlations import raw_acorr, raw_xcorr
+from pydsm.decimation import decimation_chain
+from pydsm.delsig import synthesizeNTF, evalTF, simulateDSM
+from pydsm.ir import (impulse_response, impulse_responses,
+                      iter_impulse_response)
+from pydsm.tf import TF
+from pydsm.relab import cplxpair
+from pydsm.audio_weightings import f_zpk
+from pydsm.iso226 import iso226_spl_itpl, ISO226Surface
+from pydsm.NTFdesign import quantization_noise_gain
+from pydsm.NTFdesign.weighting import q0_weighting
+
+
+class FFTCentered(object):
+    params = [[1024, 65536, 1048576]]
+    param_names = ['N']
+
+    def setup(self, N):
+        self.x = np.random.RandomState(0).randn(N)
+
+    def time_fft_centered(self, N):
+        fft_centered(self.x)
+
+
+class Welch(object):
+    params = [[1024, 65536], [4096, 65536]]
+    param_names = ['block', 'nperseg']
+
+    def setup(self, block, nperseg):
+        self.x = np.random.RandomState(0).randn(1048576)
+
+    def time_welch_psd_streaming(self, block, nperseg):
+        est = WelchPSD(nperseg=nperseg)
+        for k in range(0, len(self.x), block):
+            est.update(self.x[k:k+block])
+        est.psd()
+
+    def time_scipy_welch(self, block, nperseg):
+        signal.welch(self.x, nperseg=nperseg)
+
+
+class Decimation(object):
+    params = [[4096, 262144], [64, 128]]
+    param_names = ['block', 'ratio']
+
+    def setup(self, block, ratio):
+        self.v = np.sign(np.random.RandomState(0).randn(1048576))
+
+    def time_decimation_chain(self, block, ratio):
+        dec = decimation_chain(ratio)
+        for k in range(0, len(self.v), block):
+            dec.update(self.v[k:k+block])
+
+    def time_scipy_decimate(self, block, ratio):
+        signal.decimate(self.v, ratio, ftype='fir')
+
+
+class ExtractTones(object):
+    params = [[1, 100], [3, 10]]
+    param_names = ['rows', 'ntones']
+
+    def setup(self, rows, ntones):
+        self.x = np.random.RandomState(0).randn(rows, 65536)
+        self.f = 0.0123*np.arange(1, ntones+1)
+
+    def time_extract_tones(self, rows, ntones):
+        extract_tones(self.x, self.f)
+
+    def time_windowed_fft(self, rows, ntones):
+        win = signal.get_window('hann', self.x.shape[1])
+        np.fft.rfft(self.x*win, axis=-1)
+
+
+class DTFT(object):
+    params = [[64, 1024], [100, 10000]]
+    param_names = ['N', 'nf']
+
+    def setup(self, N, nf):
+        self.x = np.random.RandomState(0).randn(N)
+        self.ff = np.linspace(0, 0.5, nf)
+
+    def time_dtft(self, N, nf):
+        X = dtft(self.x)
+        for f in self.ff:
+            X(f)
+
+    def time_dtft_hermitian(self, N, nf):
+        X = dtft_hermitian(self.x)
+        for f in self.ff:
+            X(f)
+
+
+class IDTFTHermitian(object):
+    params = [[8, 32, 128]]
+    param_names = ['P']
+
+    def setup(self, P):
+        self.hz = signal.butter(4, 1./64, output='zpk')
+        self.w = lambda f: 1./(1.+(f*64.)**8)
+
+    def time_idtft_hermitian(self, P):
+        idtft_hermitian(self.w, np.arange(P+1))
+
+    def time_q0_weighting(self, P):
+        q0_weighting(P, self.hz)
+
+
+class Correlations(object):
+    params = [[10000, 1000000], [16, 256]]
+    param_names = ['N', 'lags']
+
+    def setup(self, N, lags):
+        rs = np.random.RandomState(0)
+        self.x = rs.randn(N)
+        self.y = rs.randn(N)
+
+    def time_raw_acorr(self, N, lags):
+        raw_acorr(self.x, lags)
+
+    def time_raw_xcorr(self, N, lags):
+        raw_xcorr(self.x, self.y, lags)
+
+    def track_acorr_samples_per_second(self, N, lags):
+        tic = timer()
+        raw_acorr(self.x, lags)
+        return N/(timer()-tic)
+
+    track_acorr_samples_per_second.unit = 'samples/s'
+
+
+class QuantizationNoiseGain(object):
+    params = [[2, 5, 8], ['none', 'filter', 'function']]
+    param_names = ['order', 'weighting']
+
+    def setup(self, order, weighting):
+        self.ntf = synthesizeNTF(order, 64, 1)
+        if weighting == 'none':
+            self.w = None
+        elif weighting == 'filter':
+            self.w = signal.butter(4, 1./64, output='zpk')
+        else:
+            self.w = lambda f: 1./(1.+(f*64.)**8)
+
+    def time_quantization_noise_gain(self, order, weighting):
+        quantization_noise_gain(self.ntf, self.w)
+
+
+class EvalTF(object):
+    """
+    Frequency response of the 64th order F-weighting filter
+    """
+    params = [[1000, 100000]]
+    param_names = ['N']
+
+    def setup(self, N):
+        self.s = 2j*np.pi*np.logspace(1, 6, N)
+
+    def time_evalTF_f_zpk(self, N):
+        evalTF(f_zpk, self.s)
+
+
+class TFCache(object):
+    """
+    Repeated evaluations of the same NTF as a tuple or as a cached TF
+    """
+    params = [['tuple', 'TF']]
+    param_names = ['form']
+
+    def setup(self, form):
+        self.ntf = synthesizeNTF(5, 32, 1)
+        if form == 'TF':
+            self.ntf = TF(self.ntf)
+        self.u = 0.5*np.sin(2*np.pi*85/1024*np.arange(1024))
+        self.f = np.linspace(0, 0.5, 256)
+
+    def time_simulate_short(self, form):
+        simulateDSM(self.u, self.ntf)
+
+    def time_impulse_response(self, form):
+        impulse_response(self.ntf)
+
+    def time_evalTF(self, form):
+        evalTF(self.ntf, np.exp(2j*np.pi*self.f))
+
+
+class ImpulseResponses(object):
+    """
+    Impulse responses of a family of bandpass filters, as in the design
+    loops, and streaming of a slowly decaying one
+    """
+    params = [[1, 32]]
+    param_names = ['filters']
+
+    def setup(self, filters):
+        self.hh = [signal.butter(4, [w, 1.5*w], 'bandpass', output='zpk')
+                   for w in np.linspace(0.01, 0.1, filters)]
+        self.slow = ([], [0.999]*4, 1.)
+
+    def time_impulse_responses(self, filters):
+        impulse_responses(self.hh)
+
+    def time_iter_slow(self, filters):
+        for chunk in iter_impulse_response(self.slow, chunk=4096):
+            pass
+
+
+class Cplxpair(object):
+    """
+    Pairing of 1000 roots, and of a batch of 10^4 sets of 8 roots
+    """
+
+    def setup(self):
+        rng = np.random.RandomState(0)
+        z = rng.randn(500)+1j*rng.randn(500)
+        self.x = np.concatenate((z, np.conj(z)))
+        rng.shuffle(self.x)
+        z = rng.randn(10000, 3)+1j*rng.randn(10000, 3)
+        self.xx = np.hstack((z, np.conj(z), rng.randn(10000, 2)))
+
+    def time_cplxpair_1000(self):
+        cplxpair(self.x)
+
+    def time_cplxpair_batch(self):
+        cplxpair(self.xx, dim=1)
+
+
+class ISO226Sweep(object):
+    """
+    Equal loudness contours over a sweep of loudness levels
+    """
+    params = [['itpl', 'surface', 'table']]
+    param_names = ['method']
+
+    def setup(self, method):
+        self.f = np.logspace(np.log10(20.), np.log10(12500.), 256)
+        self.L_N = np.linspace(0., 90., 1000)
+        self.surface = ISO226Surface()
+
+    def time_iso226_sweep(self, method):
+        if method == 'itpl':
+            for L_N in self.L_N:
+                iso226_spl_itpl(L_N)(self.f)
+        elif method == 'surface':
+            self.surface(self.f, self.L_N[:, np.newaxis])
+        else:
+            self.surface.table(self.f, self.L_N)
@@ -32,6 +32,9 @@ else:
 #***********************************************************************#
 class cvxpy_array(object):
 
+    # Attributes (no per-instance dictionary)
+    __slots__ = ['shape','data','type']
+
     # Method: __init__
     def __init__(self,m,n):
         """
@@ -42,58 +45,53 @@ class cvxpy_array(object):
         """
 
         self.shape = (m,n)
-        temp1 = {}
-        for i in range(0,m,1):
-            temp2 = {}
-            for j in range(0,n,1):
-                temp2[j] = 0.0
-            temp1[i] = temp2
-        self.data = temp1
+        self.data = [[0.0]*n for i in range(0,m,1)]
         self.type = ARRAY
     
-    # Method:__getattribute__
-    def __getattribute__(self,name):
-
-        # Transpose
-        if name == 'T':
-            new_ar = cvxpy_array(self.shape[1],self.shape[0])
-            for i in range(0,self.shape[0],1):
-                for j in range(0,self.shape[1],1):
-                    new_ar.data[j][i] = self.data[i][j]
-            return new_ar
+    # Property: T
+    @property
+    def T(self):
 
-        # Variables
-        elif name == 'variables':
-            l = []
-            for i in range(0,self.shape[0],1):
-                for j in range(0,self.shape[1],1):
-                    if not np.isscalar(self.data[i][j]):
-                        l += self.data[i][j].variables
-            return cvxpy_list(set(l))
-
-        # Parameters
-        elif name == 'parameters':
-            l = []
-            for i in range(0,self.shape[0],1):
-                for j in range(0,self.shape[1],1):
-                    if not np.isscalar(self.data[i][j]):
-                        l += self.data[i][j].parameters
-            return cvxpy_list(set(l))
+        new_ar = cvxpy_array(self.shape[1],self.shape[0])
+        for i in range(0,self.shape[0],1):
+            for j in range(0,self.shape[1],1):
+                new_ar.data[j][i] = self.data[i][j]
+        return new_ar
 
-        # Value
-        elif name == 'value':
-            mat = cvxpy_matrix(np.zeros((self.shape[0],self.shape[1])),np.float64)
-            for i in range(0,self.shape[0],1):
-                for j in range(0,self.shape[1],1):
-                    if np.isscalar(self.data[i][j]):
-                        mat[i,j] = self.data[i][j]
-                    else:
-                        mat[i,j] = self.data[i][j].value
-            return mat
-        
-        # Other attribute
-        else:
-            return object.__getattribute__(self,name)
+    # Property: variables
+    @property
+    def variables(self):
+
+        l = set()
+        for row in self.data:
+            for x in row:
+                if not np.isscalar(x):
+                    l.update(x.variables)
+        return cvxpy_list(l)
+
+    # Property: parameters
+    @property
+    def parameters(self):
+
+        l = set()
+        for row in self.data:
+            for x in row:
+                if not np.isscalar(x):
+                    l.update(x.parameters)
+        return cvxpy_list(l)
+
+    # Property: value
+    @property
+    def value(self):
+
+        mat = cvxpy_matrix(np.zeros((self.shape[0],self.shape[1])),np.float64)
+        for i in range(0,self.shape[0],1):
+            for j in range(0,self.shape[1],1):
+                if np.isscalar(self.data[i][j]):
+                    mat[i,j] = self.data[i][j]
+                else:
+                    mat[i,j] = self.data[i][j].value
+        return mat
     
     # Method: __setitem__
     def __setitem__(self,key,value):
@@ -459,6 +457,9 @@ class cvxpy_array(object):
 #***********************************************************************#
 class cvxpy_var(cvxpy_array):
 
+    # Attributes
+    __slots__ = []
+
     # Method: __init__
     def __init__(self,m,n,structure=None,name=None):
         """
@@ -522,6 +523,9 @@ class cvxpy_var(cvxpy_array):
 #***********************************************************************#
 class cvxpy_param(cvxpy_array):
 
+    # Attributes
+    __slots__ = []
+
     # Method: __init__
     def __init__(self,m,n,attribute=None,name=None):
         """
@@ -592,18 +596,13 @@ class cvxpy_matrix(np.matrix):
         pass
 
 
-    # Method:__getattr__
-    def __getattribute__(self,name):
+    # Property: I
+    @property
+    def I(self):
 
-        # Inverse
-        if name == 'I':
-            temp = np.array(self.copy())
-            temp = np.array(np.matrix(temp).I)
-            return cvxpy_matrix(temp,np.dtype(np.float64))
-
-        # Other attribute
-        else:
-            return np.matrix.__getattribute__(self,name)
+        temp = np.array(self.copy())
+        temp = np.array(np.matrix(temp).I)
+        return cvxpy_matrix(temp,np.dtype(np.float64))
 
 
     # Method: __add__
@@ -697,16 +696,11 @@ class cvxpy_spmatrix(sp.lil_matrix):
                 self.cols[j].append(i)
                 self.datac[j].append(value)
 
-    # Method:__getattr__
-    def __getattribute__(self,name):
+    # Property: T
+    @property
+    def T(self):
 
-        # Inverse
-        if name == 'T':
-            return cvxpy_spmatrix(self.transpose())
-        
-        # Other attribute
-        else:
-            return sp.lil_matrix.__getattribute__(self,name)
+        return cvxpy_spmatrix(self.transpose())
 
     # Method: __add__
     def __add__(self,other):
@@ -767,6 +761,9 @@ class cvxpy_spmatrix(sp.lil_matrix):
 #***********************************************************************#
 class cvxpy_sparray(object):
 
+    # Attributes (no per-instance dictionary)
+    __slots__ = ['shape','type','rows','data','nnz','cols','datac']
+
     # Method: __init__
     def __init__(self,m,n):
         """
@@ -801,53 +798,54 @@ class cvxpy_sparray(object):
                 self.cols[j].append(i)
                 self.datac[j].append(value)
         
-    # Method:__getattribute__
-    def __getattribute__(self,name):
+    # Property: T
+    @property
+    def T(self):
 
-        # Transpose
-        if name == 'T':
-            new_ar = cvxpy_sparray(self.shape[1],self.shape[0])
-            for i in range(0,self.shape[0],1):
-                rowi_indeces = self.rows[i]
-                rowi_values = self.data[i]
-                for k in range(0,len(rowi_indeces)):
-                    new_ar[rowi_indeces[k],i] = rowi_values[k]
-            return new_ar
+        new_ar = cvxpy_sparray(self.shape[1],self.shape[0])
+        for i in range(0,self.shape[0],1):
+            rowi_indeces = self.rows[i]
+            rowi_values = self.data[i]
+            for k in range(0,len(rowi_indeces)):
+                new_ar[rowi_indeces[k],i] = rowi_values[k]
+        return new_ar
 
-        # Variables
-        elif name == 'variables':
-            l = []
-            for i in range(0,self.shape[0],1):
-                for obj in self.data[i]:
-                    if not np.isscalar(obj):
-                        l += obj.variables
-            return cvxpy_list(set(l))
-
-        # Parameters
-        elif name == 'parameters':
-            l = []
-            for i in range(0,self.shape[0],1):
-                for obj in self.data[i]:
-                    if not np.isscalar(obj):
-                        l += obj.parameters
-            return cvxpy_list(set(l))
+    # Property: variables
+    @property
+    def variables(self):
 
-        # Value
-        elif name == 'value':
-            mat = cvxpy_spmatrix((self.shape[0],self.shape[1]),np.float64)
-            for i in range(0,self.shape[0],1):
-                rowi_indeces = self.rows[i]
-                rowi_values = self.data[i]
-                for k in range(0,len(rowi_indeces)):
-                    if np.isscalar(rowi_values[k]):
-                        mat[i,rowi_indeces[k]] = rowi_values[k] 
-                    else:
-                        mat[i,rowi_indeces[k]] = rowi_values[k].value
-            return mat
-        
-        # Other attribute
-        else:
-            return object.__getattribute__(self,name)
+        l = set()
+        for i in range(0,self.shape[0],1):
+            for obj in self.data[i]:
+                if not np.isscalar(obj):
+                    l.update(obj.variables)
+        return cvxpy_list(l)
+
+    # Property: parameters
+    @property
+    def parameters(self):
+
+        l = set()
+        for i in range(0,self.shape[0],1):
+            for obj in self.data[i]:
+                if not np.isscalar(obj):
+                    l.update(obj.parameters)
+        return cvxpy_list(l)
+
+    # Property: value
+    @property
+    def value(self):
+
+        mat = cvxpy_spmatrix((self.shape[0],self.shape[1]),np.float64)
+        for i in range(0,self.shape[0],1):
+            rowi_indeces = self.rows[i]
+            rowi_values = self.data[i]
+            for k in range(0,len(rowi_indeces)):
+                if np.isscalar(rowi_values[k]):
+                    mat[i,rowi_indeces[k]] = rowi_values[k] 
+                else:
+                    mat[i,rowi_indeces[k]] = rowi_values[k].value
+        return mat
 
     # Method: __setitem__
     def __setitem__(self,key,value):
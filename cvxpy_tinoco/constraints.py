@@ -29,6 +29,9 @@ from functools import reduce
 #***********************************************************************#
 class cvxpy_constr(object):
 
+    # Attributes (no per-instance dictionary)
+    __slots__ = ['left','type','right']
+
     # Method: __init__
     def __init__(self,left,constraint_type,right):
         """
@@ -43,28 +46,25 @@ class cvxpy_constr(object):
         self.type = constraint_type
         self.right = right
 
-    # Method: __getattribute__
-    def __getattribute__(self,name):
-
-        # Variables
-        if name == 'variables':
-            if self.type == BELONGS:
-                return self.left.variables
-            else:
-                return cvxpy_list(set(self.left.variables + 
-                                      self.right.variables))
-
-        # Parameters
-        elif name == 'parameters':
-            if self.type == BELONGS:
-                return self.left.parameters
-            else:
-                return cvxpy_list(set(self.left.parameters + 
-                                      self.right.parameters))
-
-        # Other
+    # Property: variables
+    @property
+    def variables(self):
+
+        if self.type == BELONGS:
+            return self.left.variables
         else:
-            return object.__getattribute__(self,name)
+            return cvxpy_list(set(self.left.variables + 
+                                  self.right.variables))
+
+    # Property: parameters
+    @property
+    def parameters(self):
+
+        if self.type == BELONGS:
+            return self.left.parameters
+        else:
+            return cvxpy_list(set(self.left.parameters + 
+                                  self.right.parameters))
 
     # Method: __str__
     def __str__(self):
@@ -111,24 +111,26 @@ class cvxpy_constr(object):
 #***********************************************************************#
 class cvxpy_list(list):
 
-    # Method: __getattributes__
-    def __getattribute__(self,name):
+    # Attributes (no per-instance dictionary)
+    __slots__ = []
 
-        # Variables
-        if name == 'variables':
-            all_vars = reduce(lambda x,y: x+y,
-                              list([x.variables for x in self]),[])
-            return cvxpy_list(set(all_vars))
+    # Property: variables
+    @property
+    def variables(self):
 
-        # Parameters
-        elif name == 'parameters':
-            all_params = reduce(lambda x,y: x+y,
-                                list([x.parameters for x in self]),[])
-            return cvxpy_list(set(all_params))
+        all_vars = set()
+        for x in self:
+            all_vars.update(x.variables)
+        return cvxpy_list(all_vars)
 
-        # Other
-        else:
-            return object.__getattribute__(self,name)
+    # Property: parameters
+    @property
+    def parameters(self):
+
+        all_params = set()
+        for x in self:
+            all_params.update(x.parameters)
+        return cvxpy_list(all_params)
                     
     # Method: _get_eq
     def _get_eq(self):
@@ -23,23 +23,55 @@ from .expand import expand
 from ..defs import *
 import scipy.sparse as sp
 from cvxopt import solvers
+from cvxopt import misc
 from ..scalars import cvxpy_obj
 from ..constraints import cvxpy_list
+from timeit import default_timer as timer
 
 # Function: call_solver
 def call_solver(p,quiet):
     """
     Calls solver. 
 
+    The returned dictionary is the one produced by cvxopt, with an
+    extra ``'timing'`` entry mapping the name of each phase
+    (``'pm_expand'``, ``'construct_c'``, ``'construct_Ab'``,
+    ``'construct_Gh'``, ``'construct_F'``, ``'solver'``) to the
+    wall-clock time in seconds spent in it. For cone programs, 
+    ``'kkt'`` is the part of the solver time spent factorizing
+    the KKT systems.
+
     :param p: Convex cvxpy_program. 
               Assumed to be expanded.
     :param quiet: Boolean.
     """
 
+    data = construct_program(p)
+    return run_solver(data,p.options,quiet)
+
+# Function: construct_program
+def construct_program(p):
+    """
+    Constructs the problem data c, G, h, A, b, dims (and F for
+    nonlinear programs) handed to cvxopt.
+
+    Parameters (and expressions of parameters) left in the program
+    are evaluated with their current values, and every entry of A,
+    b and h that depends on them is recorded in ``'params'`` so that
+    it can be updated later by :func:`patch_program` without
+    constructing the program again.
+
+    :param p: Convex cvxpy_program. 
+              Assumed to be expanded.
+    """
+
     # Set printing format for cvxopt sparse matrices
     opt.spmatrix_str = opt.printing.spmatrix_str_triplet 	
+    timing = {}
+    params = {'A':[], 'b':[], 'h':[]}
     
     # Expand objects defined via partial minimization
+    t0 = timer()
     constr_list = cvxpy_list(pm_expand(p.constraints))
     
     # Get variables
@@ -53,40 +85,143 @@ def call_solver(p,quiet):
     var_to_index = {}
     for i in range(0,n,1):
         var_to_index[variables[i]] = i
+    timing['pm_expand'] = timer()-t0
 
     # Construct objective vector
+    t0 = timer()
     c = construct_c(p.objective,var_to_index,n,p.action)
+    timing['construct_c'] = timer()-t0
 
     # Construct Ax == b
-    A,b = construct_Ab(constr_list._get_eq(),var_to_index,n)
+    t0 = timer()
+    A,b = construct_Ab(constr_list._get_eq(),var_to_index,n,params)
+    timing['construct_Ab'] = timer()-t0
 
     # Construct  Gx <= h
+    t0 = timer()
     G,h,dim_l,dim_q,dim_s = construct_Gh(constr_list._get_ineq_in(),
-                                         var_to_index,n)
+                                         var_to_index,n,params)
+    timing['construct_Gh'] = timer()-t0
     
     # Construct F
+    t0 = timer()
     F = construct_F(constr_list._get_ineq_in(),var_to_index,n)
+    timing['construct_F'] = timer()-t0
+
+    # Return data
+    return {'c':c, 'G':G, 'h':h, 'A':A, 'b':b,
+            'dims':{'l':dim_l, 'q':dim_q, 's':dim_s},
+            'F':F, 'variables':variables, 'mapping':var_to_index,
+            'params':params, 'timing':timing}
+
+# Function: patch_program
+def patch_program(data):
+    """
+    Updates the entries of A, b and h that depend on 
+    parameters using the current parameter values.
+
+    :param data: Dictionary returned by construct_program.
+    """
+
+    params = data['params']
+    A = data['A']
+    b = data['b']
+    h = data['h']
+    for i,j,base,terms in params['A']:
+        A[i,j] = _evaluate(base,terms)
+    for i,base,terms in params['b']:
+        b[i] = _evaluate(base,terms)
+    for i,base,terms in params['h']:
+        h[i] = _evaluate(base,terms)
+
+# Function: run_solver
+def run_solver(data,options,quiet):
+    """
+    Calls cvxopt on constructed problem data and stores
+    the numerical values of the variables.
+
+    :param data: Dictionary returned by construct_program.
+    :param options: Dictionary.
+    :param quiet: Boolean.
+    """
 
     # Call cvxopt
-    solvers.options['maxiters'] = p.options['maxiters']
-    solvers.options['abstol'] = p.options['abstol']
-    solvers.options['reltol'] = p.options['reltol']
-    solvers.options['feastol'] = p.options['feastol']
+    solvers.options['maxiters'] = options['maxiters']
+    solvers.options['abstol'] = options['abstol']
+    solvers.options['reltol'] = options['reltol']
+    solvers.options['feastol'] = options['feastol']
     solvers.options['show_progress'] = not quiet
-    dims = {'l':dim_l, 'q':dim_q, 's':dim_s}
+    c = data['c']
+    G = data['G']
+    h = data['h']
+    A = data['A']
+    b = data['b']
+    F = data['F']
+    dims = data['dims']
+    t_kkt = [0.]
+    t0 = timer()
     if F is None:
-        r =  solvers.conelp(c,G,h,dims,A,b)
+        _check_kkt_dims(c,b,dims)
+        r =  solvers.conelp(c,G,h,dims,A,b,
+                            kktsolver=_timed_kktsolver(G,dims,A,t_kkt))
     else:
         r =  solvers.cpl(c,F,G,h,dims,A,b)
+    t_solver = timer()-t0
 
     # Store numerical values
     if r['status'] != PRIMAL_INFEASIBLE:
-        for v in variables:
-            v.value =  r['x'][var_to_index[v]]
+        mapping = data['mapping']
+        for v in data['variables']:
+            v.value =  r['x'][mapping[v]]
 
     # Return result
+    r['timing'] = dict(data['timing'],solver=t_solver)
+    if F is None:
+        r['timing']['kkt'] = t_kkt[0]
     return r
 
+# Function: _check_kkt_dims
+def _check_kkt_dims(c,b,dims):
+    """
+    Repeats the dimension check that cvxopt makes before
+    using its default KKT solvers, and skips when given
+    a KKT solver function.
+
+    :param c: Matrix.
+    :param b: Matrix.
+    :param dims: Dictionary.
+    """
+
+    cdim_pckd = (dims['l'] + sum(dims['q']) +
+                 sum([k*(k+1)/2 for k in dims['s']]))
+    if (solvers.options.get('kktreg') is None and
+        (b.size[0] > c.size[0] or b.size[0] + cdim_pckd < c.size[0])):
+        raise ValueError("Rank(A) < p or Rank([G; A]) < n")
+
+# Function: _timed_kktsolver
+def _timed_kktsolver(G,dims,A,t_kkt):
+    """
+    Returns the KKT solver that cvxopt would use by default
+    for a cone program, accumulating in t_kkt[0] the time 
+    spent in its factorizations.
+
+    :param G: Matrix.
+    :param dims: Dictionary.
+    :param A: Matrix.
+    :param t_kkt: List with one number.
+    """
+
+    if dims['q'] or dims['s']:
+        factor = misc.kkt_qr(G,dims,A)
+    else:
+        factor = misc.kkt_chol2(G,dims,A)
+    def kktsolver(W):
+        t0 = timer()
+        f = factor(W)
+        t_kkt[0] += timer()-t0
+        return f
+    return kktsolver
+
 # Function: construct_c
 def construct_c(objective,mapping,n,action):
     """
@@ -99,8 +234,8 @@ def construct_c(objective,mapping,n,action):
     """
 
     # Check objective
-    if (objective.type != CONSTANT and 
-        objective.type != VARIABLE):
+    if (objective.type != VARIABLE and 
+        not objective.is_constant()):
         raise TypeError('Bad objective: Cannot construct c')
 
     # Construct c vector
@@ -122,7 +257,7 @@ def construct_c(objective,mapping,n,action):
     return c
 
 # Function: construct_Ab
-def construct_Ab(constr_list,mapping,n):
+def construct_Ab(constr_list,mapping,n,params=None):
     """
     Constructs matrix A and vector b from a list 
     of equality constraints. 
@@ -130,6 +265,8 @@ def construct_Ab(constr_list,mapping,n):
     :param constr_list: List of equality constraints.
     :param mapping: Dictionary.
     :param n: Number of variables.
+    :param params: Dictionary with lists ``'A'`` and ``'b'`` where 
+                   entries that depend on parameters are recorded.
     """
 
     # Sort constraints
@@ -153,33 +290,55 @@ def construct_Ab(constr_list,mapping,n):
         return lx
 
     constr_list.sort(key=cmp_keys)
+    if params is None:
+        params = {'A':[], 'b':[]}
+
+    # Preallocate triplets (each term yields at most one entry)
+    nnz = 0
+    for constr in constr_list:
+        left = constr.left
+        if (left.type == TREE and left.item.type == OPERATOR and
+            left.item.name == SUMMATION):
+            nnz += len(left.children)+1
+        else:
+            nnz += 2
+    V = np.empty(nnz,dtype=np.float64)
+    I = np.empty(nnz,dtype=np.intc)
+    J = np.empty(nnz,dtype=np.intc)
+    bv = np.empty(len(constr_list),dtype=np.float64)
+    k = 0
+    m = 0
+
+    # Accepted rows, keyed by their sparsity pattern
+    patterns = {}
     
     # Construct matrices
-    Ab = None
     for constr in constr_list:
 
         # Get elements
         left = constr.left
         right = constr.right
 
-        # New row
-        t = sp.lil_matrix((1,n+1))
+        # New row (column n holds the right hand side). 
+        # Terms that depend on parameters are kept in tp.
+        t = {}
+        tp = {}
         
         # Deal with right element
-        if right.type == CONSTANT:
-            t[0,n] += right.value*1.
-        elif right.type == VARIABLE:
-            t[0,mapping[right]] += -1.
+        if right.type == VARIABLE:
+            _accumulate(t,mapping[right],-1.)
+        elif right.is_constant():
+            _accumulate_obj(t,tp,n,1.,right)
         else:
             raise TypeError('Bad equality: Cannot construct A,b')
 
         # Left is a variable
         if left.type == VARIABLE:
-            t[0,mapping[left]] += 1.
+            _accumulate(t,mapping[left],1.)
    
-        # Left is a constant
-        elif left.type == CONSTANT:
-             t[0,n] += -left.value*1.
+        # Left is a constant or a parameter
+        elif left.type != TREE:
+            _accumulate_obj(t,tp,n,-1.,left)
 
         # Left is an operation tree
         elif left.type == TREE and left.item.type == OPERATOR:
@@ -189,22 +348,28 @@ def construct_Ab(constr_list,mapping,n):
                 for arg in left.children:
                     if (arg.type == TREE and
                         arg.item.type == OPERATOR and
-                        arg.item.name == MULTIPLICATION):
+                        arg.item.name == MULTIPLICATION and
+                        arg.children[1].type == VARIABLE):
                         ch1 = arg.children[1]
                         ch0 = arg.children[0]
-                        t[0,mapping[ch1]] += ch0.value*1.
+                        _accumulate_obj(t,tp,mapping[ch1],1.,ch0)
                     elif arg.type == VARIABLE:
-                        t[0,mapping[arg]] += 1.
-                    elif arg.type == CONSTANT:
-                        t[0,n] += -arg.value*1.
+                        _accumulate(t,mapping[arg],1.)
+                    elif arg.is_constant():
+                        _accumulate_obj(t,tp,n,-1.,arg)
                     else:
                         raise TypeError('Bad equality: Cannot construct A,b')
 
             # Multiplication
-            elif left.item.name == MULTIPLICATION:
+            elif (left.item.name == MULTIPLICATION and
+                  left.children[1].type == VARIABLE):
                 op1 = left.children[0]
                 op2 = left.children[1]
-                t[0,mapping[op2]] += 1.*op1.value
+                _accumulate_obj(t,tp,mapping[op2],1.,op1)
+
+            # Expression of parameters
+            elif left.is_constant():
+                _accumulate_obj(t,tp,n,-1.,left)
             
             # Error
             else:
@@ -213,51 +378,105 @@ def construct_Ab(constr_list,mapping,n):
         # Error
         else:
             raise TypeError('Bad equality: Cannot construct A,b')
-        
-        # Compute norm
-        t = t.tocsr()
-        t_norm = np.sqrt((t*t.T)[0,0])
-
-        # Process
-        if t_norm < EPSILON:
-            continue
-        if Ab is None:
-            Ab = t
+
+        # Row that depends on parameters: keep its full pattern
+        if tp:
+            cols = sorted(set([j for j in t if t[j] != 0.]) | set(tp))
+            vals = np.array([_evaluate(t.get(j,0.),tp.get(j,[]))
+                             for j in cols],dtype=np.float64)
+            for j in tp:
+                if j == n:
+                    params['b'].append((m,t.get(j,0.),tp[j]))
+                else:
+                    params['A'].append((m,j,t.get(j,0.),tp[j]))
+
+        # Numeric row: drop cancelled entries and redundant rows
         else:
-            t_c = t.nonzero()[1]
-            Ab_c = Ab.nonzero()[1]
-            c_overlap = True
-            for x in t_c:
-                if x not in Ab_c:
-                    c_overlap = False
-                    break
+            cols = sorted([j for j in t if t[j] != 0.])
+            vals = np.array([t[j] for j in cols],dtype=np.float64)
+            t_norm = np.sqrt(np.dot(vals,vals))
+            if t_norm < EPSILON:
+                continue
+            key = tuple(cols)
             valid_row = True
-            if c_overlap:
-                tn = t/t_norm
-                for i in range(Ab.shape[0]-1,-1,-1):
-                    s = Ab[i,:]
-                    s_c = s.nonzero()[1]
-                    if len(s_c) < len(t_c):
+            if key in patterns:
+                tn = vals/t_norm
+                for s in patterns[key]:
+                    e = s-np.dot(tn,s)*tn
+                    if np.sqrt(np.dot(e,e)) < EPSILON:
+                        valid_row = False
                         break
-                    if set(s_c) == set(t_c):
-                        e = s-(tn*s.T)*tn
-                        if np.sqrt((e*e.T)[0,0]) < EPSILON:
-                            valid_row = False
-                            break
-            if valid_row:
-                Ab = sp.vstack((Ab,t)).tocsr()
+            if not valid_row:
+                continue
+            patterns.setdefault(key,[]).append(vals)
+
+        # Store row
+        bv[m] = 0.
+        for j,v in zip(cols,vals):
+            if j != n:
+                V[k] = v
+                I[k] = m
+                J[k] = j
+                k += 1
+            else:
+                bv[m] = v
+        m += 1
 
     # Return matrices
-    if Ab is None:
-        Ab = opt.spmatrix(0.0,[],[],(0,n+1))
+    if k == 0:
+        A = opt.spmatrix(0.0,[],[],(m,n))
     else:
-        nz = Ab.nonzero()
-        Ab = opt.spmatrix(Ab.data.tolist(),nz[0].tolist(),
-                          nz[1].tolist(),Ab.shape)
-    return Ab[:,0:n],opt.matrix(Ab[:,n])
+        A = opt.spmatrix(V[:k].tolist(),I[:k].tolist(),J[:k].tolist(),(m,n))
+    return A,opt.matrix(bv[:m].tolist(),(m,1),'d')
+
+# Function: _accumulate
+def _accumulate(row,j,value):
+    """
+    Adds value to entry j of a row stored as a dictionary.
+
+    :param row: Dictionary.
+    :param j: Column index.
+    :param value: Number.
+    """
+
+    row[j] = row.get(j,0.)+value
+
+# Function: _accumulate_obj
+def _accumulate_obj(row,prow,j,coef,obj):
+    """
+    Adds coef times a constant or parametric object to entry j
+    of a row. Constants are added to row, while parameters and
+    expressions of parameters are recorded in prow.
+
+    :param row: Dictionary.
+    :param prow: Dictionary of lists of (coef,object) terms.
+    :param j: Column index.
+    :param coef: Number.
+    :param obj: cvxpy_obj, parameter or tree of parameters.
+    """
+
+    if type(obj) is cvxpy_obj:
+        _accumulate(row,j,coef*obj.value)
+    else:
+        prow.setdefault(j,[]).append((coef,obj))
+
+# Function: _evaluate
+def _evaluate(base,terms):
+    """
+    Evaluates base plus the sum of coef times the current 
+    value of each parametric term.
+
+    :param base: Number.
+    :param terms: List of (coef,object) pairs.
+    """
+
+    value = base
+    for coef,obj in terms:
+        value += coef*obj.value
+    return value*1.
 
 # Function: construct_Gh
-def construct_Gh(constr_list,mapping,n):
+def construct_Gh(constr_list,mapping,n,params=None):
     """
     Creates the matrix G and vector h from a list 
     of inequality and membership constraints.
@@ -265,6 +484,8 @@ def construct_Gh(constr_list,mapping,n):
     :param constr_list: List of inequality and membership constraints.
     :param mapping: Dictionary.
     :param n: Number of varaibles.
+    :param params: Dictionary with list ``'h'`` where entries 
+                   that depend on parameters are recorded.
     """
 
     # Check constraints
@@ -273,46 +494,64 @@ def construct_Gh(constr_list,mapping,n):
             if c.right.type != SET:
                 raise TypeError('Bad constraint: Cannot construct G,h')
         else:
-            if ((c.left.type != VARIABLE and c.left.type != CONSTANT) or
-                (c.right.type != VARIABLE and c.right.type != CONSTANT)):
+            if ((c.left.type != VARIABLE and not c.left.is_constant()) or
+                (c.right.type != VARIABLE and not c.right.is_constant())):
                 raise TypeError('Bad constraint: Cannot construct G,h')
+    if params is None:
+        params = {'h':[]}
 
-    # Initialize G,h and dimensions
+    # Initialize dimensions
     dim_l = 0
     dim_q = []
     dim_s = []
-    G = opt.spmatrix(0.0,[],[],(0,n))
-    h = opt.matrix(0.0,(0,1))
 
-    # Nonnegative Orthant
-    for c in constr_list:
-        
-        # Left is constant or variable
-        if c.left.type == CONSTANT or c.left.type == VARIABLE:
-
-            # Get constraint elements
-            t = c.type
-            ob1 = c.left
-            ob2 = c.right
-
-            # New row
-            rowG = opt.spmatrix(0.0,[],[],(1,n))
-            rowh = opt.matrix(0.0,(1,1))
-            if ob1.type == VARIABLE:
-                rowG[0,mapping[ob1]]+=1. if t==LESS_EQUALS else -1.
-            else:
-                rowh[0,0]+=-ob1.value*1. if t==LESS_EQUALS else ob1.value*1.
-            if ob2.type == VARIABLE:
-                rowG[0,mapping[ob2]]+=1. if t==GREATER_EQUALS else -1.
-            else:
-                rowh[0,0]+=-ob2.value*1. if t==GREATER_EQUALS else ob2.value*1.
+    # Nonnegative Orthant (at most two entries per row)
+    lin_list = [c for c in constr_list if c.left.type != ARRAY]
+    V = np.empty(2*len(lin_list),dtype=np.float64)
+    I = np.empty(2*len(lin_list),dtype=np.intc)
+    J = np.empty(2*len(lin_list),dtype=np.intc)
+    hv = np.zeros(len(lin_list),dtype=np.float64)
+    k = 0
+    for c in lin_list:
 
-            # Append to G,h
-            G = opt.sparse([G,rowG])
-            h = opt.matrix([h,rowh])
+        # Get constraint elements
+        t = c.type
+        ob1 = c.left
+        ob2 = c.right
 
-            # Increment size of cone
-            dim_l += 1
+        # New row
+        tp = {}
+        if ob1.type == VARIABLE:
+            V[k] = 1. if t==LESS_EQUALS else -1.
+            I[k] = dim_l
+            J[k] = mapping[ob1]
+            k += 1
+        else:
+            row = {}
+            _accumulate_obj(row,tp,0,-1. if t==LESS_EQUALS else 1.,ob1)
+            hv[dim_l] += row.get(0,0.)
+        if ob2.type == VARIABLE:
+            V[k] = 1. if t==GREATER_EQUALS else -1.
+            I[k] = dim_l
+            J[k] = mapping[ob2]
+            k += 1
+        else:
+            row = {}
+            _accumulate_obj(row,tp,0,-1. if t==GREATER_EQUALS else 1.,ob2)
+            hv[dim_l] += row.get(0,0.)
+        if tp:
+            params['h'].append((dim_l,hv[dim_l],tp[0]))
+            hv[dim_l] = _evaluate(hv[dim_l],tp[0])
+
+        # Increment size of cone
+        dim_l += 1
+    if k == 0:
+        G_blocks = [opt.spmatrix(0.0,[],[],(dim_l,n))]
+    else:
+        G_blocks = [opt.spmatrix(V[:k].tolist(),I[:k].tolist(),
+                                 J[:k].tolist(),(dim_l,n))]
+    h_blocks = [opt.matrix(hv.tolist(),(dim_l,1),'d')]
+    offset = dim_l
         
     # Second order cone
     for c in constr_list:
@@ -324,11 +563,15 @@ def construct_Gh(constr_list,mapping,n):
             # Get G,h, section
             el = c.left
             set_atom = c.right
-            newG,newh,r = set_atom._construct(el,mapping,n)
+            newp = []
+            newG,newh,r = set_atom._construct(el,mapping,n,newp)
 
-            # Attach to G,h
-            G = opt.sparse([G,newG])
-            h = opt.matrix([h,newh])
+            # Collect G,h blocks
+            G_blocks.append(newG)
+            h_blocks.append(newh)
+            for i,base,terms in newp:
+                params['h'].append((offset+i,base,terms))
+            offset += newG.size[0]
 
             # Attach size of cone
             dim_q = dim_q + [r]
@@ -343,14 +586,22 @@ def construct_Gh(constr_list,mapping,n):
             # Get G,h, section
             el = c.left
             set_atom = c.right
-            newG,newh,t = set_atom._construct(el,mapping,n)
+            newp = []
+            newG,newh,t = set_atom._construct(el,mapping,n,newp)
 
-            # Attach to G,h
-            G = opt.sparse([G,newG])
-            h = opt.matrix([h,newh])
+            # Collect G,h blocks
+            G_blocks.append(newG)
+            h_blocks.append(newh)
+            for i,base,terms in newp:
+                params['h'].append((offset+i,base,terms))
+            offset += newG.size[0]
 
             # Attach size of cone
             dim_s = dim_s + [t]
+
+    # Stack all blocks at once
+    G = opt.sparse(G_blocks)
+    h = opt.matrix(h_blocks)
       
     # Return 
     return G,h,dim_l,dim_q,dim_s
@@ -373,8 +624,8 @@ def construct_F(constr_list,mapping,n):
             if c.right.type != SET:
                 raise TypeError('Bad constraint: Cannot construct F')
         else:
-            if ((c.left.type != VARIABLE and c.left.type != CONSTANT) or
-                (c.right.type != VARIABLE and c.right.type != CONSTANT)):
+            if ((c.left.type != VARIABLE and not c.left.is_constant()) or
+                (c.right.type != VARIABLE and not c.right.is_constant())):
                 raise TypeError('Bad constraint: Cannot construct F')
 
     # Lists
@@ -420,9 +671,7 @@ def construct_F(constr_list,mapping,n):
                 f = opt.matrix(0.0,(len(fs),1))
                 for i in range(0,len(fs),1):
                     f[i] = fs[i](x)
-                Df = opt.spmatrix(0.0,[],[],(0,n))
-                for i in range(0,len(grads),1):
-                    Df = opt.sparse([Df,grads[i](x).T])
+                Df = opt.sparse([g(x).T for g in grads])
                 return f,Df
             else:
                 return None,None
@@ -432,9 +681,7 @@ def construct_F(constr_list,mapping,n):
             f = opt.matrix(0.0,(len(fs),1))
             for i in range(0,len(fs),1):
                 f[i] = fs[i](x)
-            Df = opt.spmatrix(0.0,[],[],(0,n))
-            for i in range(0,len(grads),1):
-                Df = opt.sparse([Df,grads[i](x).T])
+            Df = opt.sparse([g(x).T for g in grads])
             H = opt.spmatrix(0.0,[],[],(n,n))
             for i in range(0,len(hess),1):
                 H = H + z[i]*hess[i](x)
@@ -40,6 +40,11 @@ def expand(arg):
     elif type(arg) is cvxpy_scalar_var:
         return arg,[]
 
+    # Parameter or expression of parameters (kept symbolic)
+    elif (type(arg) is cvxpy_scalar_param or
+          (type(arg) is cvxpy_tree and arg.is_constant())):
+        return arg,[]
+
     # Summation
     elif (type(arg) is cvxpy_tree and 
           arg.item.type == OPERATOR and
@@ -60,9 +65,14 @@ def expand(arg):
             # Multiplication
             if (child.type == TREE and
                 child.item.type == OPERATOR and
-                child.item.name == MULTIPLICATION):
+                child.item.name == MULTIPLICATION and
+                not child.is_constant()):
                 child_var,child_constr = expand(child.children[1])
-                new_children += [child.children[0].value*child_var]
+                coef = child.children[0]
+                if type(coef) is cvxpy_obj:
+                    new_children += [coef.value*child_var]
+                else:
+                    new_children += [coef*child_var]
                 new_constr += child_constr
                     
             # Else
@@ -20,17 +20,30 @@
 import numpy as np
 from ..defs import *
 from .call_solver import call_solver
+from .call_solver import construct_program
+from .call_solver import patch_program
+from .call_solver import run_solver
+from timeit import default_timer as timer
 
 # Function
-def solve_prog(p,quiet):
+def solve_prog(p,quiet,data=None):
     """
     Solves optimization program.
 
+    The time spent in each phase is stored in ``p.timing``, the
+    solver status, iteration count and final residuals in ``p.info``.
+
     :param p: cvxpy_program
+    :param data: Problem data returned by compile_prog or ``None``.
+                 If given, its parameter dependent entries are 
+                 updated and the solver is called directly.
     """
 
     # Expand
-    p_expanded = p._get_expanded_program()
+    if data is None:
+        t0 = timer()
+        p_expanded = p._get_expanded_program()
+        t_expand = timer()-t0
 
     # Compute signs
     if p.action == MINIMIZE:
@@ -41,7 +54,21 @@ def solve_prog(p,quiet):
     # Solve convex relaxation
     if not quiet:
         print('\nCalling CVXOPT ...')
-    sol = call_solver(p_expanded,quiet)
+    if data is None:
+        sol = call_solver(p_expanded,quiet)
+        p.timing = dict(sol['timing'],expand=t_expand)
+    else:
+        t0 = timer()
+        patch_program(data)
+        t_patch = timer()-t0
+        sol = run_solver(data,p.options,quiet)
+        p.timing = {'patch':t_patch, 'solver':sol['timing']['solver'],
+                    'kkt':sol['timing']['kkt']}
+    
+    p.info = {'status':sol['status']}
+    for key in ['iterations','primal infeasibility',
+                'dual infeasibility','gap','relative gap']:
+        p.info[key] = sol.get(key)
     
     valid = True
 
@@ -64,3 +91,17 @@ def solve_prog(p,quiet):
 
     # Return optimal value
     return obj,valid
+
+# Function
+def compile_prog(p):
+    """
+    Expands a program without substituting its parameters and
+    constructs its problem data once.
+
+    :param p: cvxpy_program
+    """
+
+    data = construct_program(p._get_expanded_program())
+    if data['F'] is not None:
+        raise ValueError('Program cannot be compiled')
+    return data
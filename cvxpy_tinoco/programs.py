@@ -25,6 +25,7 @@ from .constraints import *
 from .procedures.expand import expand
 from .procedures.re_eval import re_eval
 from .procedures.solve_prog import solve_prog
+from .procedures.solve_prog import compile_prog
 
 #***********************************************************************#
 # Class definition: cvxpy_program                                       #
@@ -72,6 +73,13 @@ class cvxpy_program(object):
         else:
             self.options = CONFIGURATION.copy()
 
+        # Phase timings and solver statistics of the last solve
+        self.timing = {}
+        self.info = {}
+
+        # Problem data constructed by compile
+        self.compiled = None
+
     # Method: _get_expanded_objects
     def _get_expanded_objects(self,args):
         """
@@ -123,22 +131,19 @@ class cvxpy_program(object):
         return cvxpy_program(self.action,new_obj,more_constr+obj_constr,
                              [],self.options,self.name)
     
-    # Method: __getattribute__
-    def __getattribute__(self,name):
+    # Property: variables
+    @property
+    def variables(self):
 
-        # Variables
-        if name == 'variables':
-            return cvxpy_list(set(self.constraints.variables + 
-                                  self.objective.variables))
+        return cvxpy_list(set(self.constraints.variables + 
+                              self.objective.variables))
 
-        # Parameters
-        elif name == 'parameters':
-            return cvxpy_list(set(self.constraints.parameters + 
-                                  self.objective.parameters))
+    # Property: parameters
+    @property
+    def parameters(self):
 
-        # Other
-        else:
-            return object.__getattribute__(self,name)
+        return cvxpy_list(set(self.constraints.parameters + 
+                              self.objective.parameters))
 
     # Method: solve
     def solve(self,quiet=False,return_status=False):
@@ -147,6 +152,17 @@ class cvxpy_program(object):
         parameter values.
         """
 
+        # Compiled program
+        if self.compiled is not None:
+            for param in self.parameters:
+                if np.isnan(param.value):
+                    raise ValueError('Invalid parameter value: NaN')
+            obj,valid = solve_prog(self,quiet,self.compiled)
+            if return_status:
+                return obj,valid
+            else:
+                return obj
+
         # Check DCP
         if not self.is_dcp():
             raise ValueError('Program is not DCP')
@@ -167,11 +183,30 @@ class cvxpy_program(object):
 
         # Solve new program
         obj,valid = solve_prog(new_p,quiet)
+        self.timing = new_p.timing
+        self.info = new_p.info
         if return_status:
             return obj,valid
         else:
             return obj
     
+    # Method: compile
+    def compile(self):
+        """
+        Constructs the problem data once, keeping track of
+        the entries that depend on parameters. Subsequent calls
+        to solve only update these entries with the current
+        parameter values before calling the solver.
+        """
+
+        # Check DCP
+        if not self.is_dcp():
+            raise ValueError('Program is not DCP')
+
+        # Construct problem data
+        self.compiled = compile_prog(self)
+        return self
+
     # Method: __str__
     def __str__(self):
 
@@ -26,6 +26,12 @@ from functools import reduce
 #***********************************************************************#
 class cvxpy_obj(object):
 
+    # Attributes (no per-instance dictionary)
+    __slots__ = ['type','value','name']
+
+    # Shape
+    shape = (1,1)
+
     # Method: __init__
     def __init__(self,object_type,value,name):
         """
@@ -39,10 +45,24 @@ class cvxpy_obj(object):
         self.type = object_type
         self.value = value
         self.name = name
-        self.shape = (1,1)
-        self.variables = cvxpy_list()
-        self.parameters = cvxpy_list()        
-        self.T = self
+
+    # Property: T
+    @property
+    def T(self):
+
+        return self
+
+    # Property: variables
+    @property
+    def variables(self):
+
+        return cvxpy_list()
+
+    # Property: parameters
+    @property
+    def parameters(self):
+
+        return cvxpy_list()
 
     def __lt__(self, other):
         return self.name < other.name
@@ -79,6 +99,14 @@ class cvxpy_obj(object):
 
         return True
 
+    # Method: is_constant
+    def is_constant(self):
+        """
+        Determines if object does not depend on variables.
+        """
+
+        return True
+
     # Method: is_nonnegative_constant
     def is_nonnegative_constant(self):
         """
@@ -123,8 +151,8 @@ class cvxpy_obj(object):
         :param op: Keyword (See cvxpy.defs)
         """
 
-        # Create operator
-        operator = cvxpy_obj(OPERATOR,np.NaN,SUMMATION)
+        # Get operator
+        operator = SUMMATION_OPERATOR
 
         # Create args to combine
         if (type(self) is cvxpy_tree and
@@ -191,8 +219,8 @@ class cvxpy_obj(object):
         :param op: Keyword (See cvxpy.defs)
         """
 
-        # Create operator
-        operator = cvxpy_obj(OPERATOR,np.NaN,SUMMATION)
+        # Get operator
+        operator = SUMMATION_OPERATOR
 
         # Create args to combine
         if (type(self) is cvxpy_tree and
@@ -265,8 +293,8 @@ class cvxpy_obj(object):
         :param other: Other operand.
         """
 
-        # Create operator
-        operator = cvxpy_obj(OPERATOR,np.NaN,MULTIPLICATION)
+        # Get operator
+        operator = MULTIPLICATION_OPERATOR
 
         # Number
         if np.isscalar(other):
@@ -361,6 +389,9 @@ class cvxpy_obj(object):
 #***********************************************************************#
 class cvxpy_scalar_var(cvxpy_obj):
 
+    # Attributes
+    __slots__ = []
+
     # Variable counter
     i = 0
 
@@ -380,16 +411,19 @@ class cvxpy_scalar_var(cvxpy_obj):
         # Call parent constructor
         cvxpy_obj.__init__(self,VARIABLE,np.NaN,name)
 
-    # Method: __getattribute__
-    def __getattribute__(self,name):
+    # Property: variables
+    @property
+    def variables(self):
 
-        # Variables
-        if name == 'variables':
-            return cvxpy_list([self])
+        return cvxpy_list([self])
 
-        # Other
-        else:
-            return object.__getattribute__(self,name)
+    # Method: is_constant
+    def is_constant(self):
+        """
+        Determines if object does not depend on variables.
+        """
+
+        return False
 
     # Method: is_nonnegative_constant
     def is_nonnegative_constant(self):
@@ -412,6 +446,9 @@ class cvxpy_scalar_var(cvxpy_obj):
 #***********************************************************************#
 class cvxpy_scalar_param(cvxpy_obj):
 
+    # Attributes
+    __slots__ = ['attribute']
+
     # Param counter
     i = 0
 
@@ -435,16 +472,11 @@ class cvxpy_scalar_param(cvxpy_obj):
         # Store attribute
         self.attribute = attribute
 
-    # Method: __getattribute__
-    def __getattribute__(self,name):
+    # Property: parameters
+    @property
+    def parameters(self):
 
-        # Parameters
-        if name == 'parameters':
-            return cvxpy_list([self])
-
-        # Other
-        else:
-            return object.__getattribute__(self,name)
+        return cvxpy_list([self])
 
     # Method: __setattr__
     def __setattr__(self,name,value):
@@ -491,6 +523,9 @@ class cvxpy_scalar_param(cvxpy_obj):
 #***********************************************************************#
 class cvxpy_tree(cvxpy_obj):
 
+    # Attributes
+    __slots__ = ['item','children']
+
     # Method: __init__
     def __init__(self,item,children):
         """
@@ -500,47 +535,51 @@ class cvxpy_tree(cvxpy_obj):
         :param children: List of scalar objects.
         """
 
+        # The value of a tree is computed from its children
         self.item = item
         self.children = children
-        cvxpy_obj.__init__(self,TREE,np.NaN,'')
+        self.type = TREE
+        self.name = ''
 
-    # Method: __getattribute__
-    def __getattribute__(self,name):
-        
-        # Variables
-        if name == 'variables':
-            l = list([x.variables for x in self.children])
-            return cvxpy_list(set(reduce(lambda x,y:x+y,l,[])))
-        
-        # Parameters
-        elif name == 'parameters':
-            l = list([x.parameters for x in self.children])
-            return cvxpy_list(set(reduce(lambda x,y:x+y,l,[])))
+    # Property: variables
+    @property
+    def variables(self):
 
-        # Value
-        elif name == 'value':
-            
-            # Summation
-            if (self.item.type == OPERATOR and 
-                self.item.name == SUMMATION):
-                return np.sum(list([x.value for x in self.children]))
-
-            # Multiplication
-            elif (self.item.type == OPERATOR and 
-                  self.item.name == MULTIPLICATION):
-                return self.children[0].value*self.children[1].value
-
-            # Function
-            elif self.item.type == FUNCTION:
-                return self.item(list([x.value for x in self.children]))
+        l = set()
+        for x in self.children:
+            l.update(x.variables)
+        return cvxpy_list(l)
+        
+    # Property: parameters
+    @property
+    def parameters(self):
+
+        l = set()
+        for x in self.children:
+            l.update(x.parameters)
+        return cvxpy_list(l)
+
+    # Property: value
+    @property
+    def value(self):
             
-            # Error
-            else:
-                raise TypeError('Invalid tree item')
+        # Summation
+        if (self.item.type == OPERATOR and 
+            self.item.name == SUMMATION):
+            return np.sum(list([x.value for x in self.children]))
 
-        # Other
+        # Multiplication
+        elif (self.item.type == OPERATOR and 
+              self.item.name == MULTIPLICATION):
+            return self.children[0].value*self.children[1].value
+
+        # Function
+        elif self.item.type == FUNCTION:
+            return self.item(list([x.value for x in self.children]))
+            
+        # Error
         else:
-            return object.__getattribute__(self,name)
+            raise TypeError('Invalid tree item')
     
     # Method: __str__
     def __str__(self):
@@ -676,6 +715,14 @@ class cvxpy_tree(cvxpy_obj):
         else:
             raise TypeError('Invalid tree item')
 
+    # Method: is_constant
+    def is_constant(self):
+        """
+        Determines if tree does not depend on variables.
+        """
+
+        return not len(self.variables)
+
     # Method: is_nonnegative_constant
     def is_nonnegative_constant(self):
         """
@@ -736,6 +783,10 @@ class cvxpy_tree(cvxpy_obj):
         else:
             raise TypeError('Invalid tree item')
         
+# Operators (shared by all trees)
+SUMMATION_OPERATOR = cvxpy_obj(OPERATOR,np.NaN,SUMMATION)
+MULTIPLICATION_OPERATOR = cvxpy_obj(OPERATOR,np.NaN,MULTIPLICATION)
+
 # Load modules
 from .arrays import cvxpy_array,cvxpy_sparray
 from .arrays import cvxpy_matrix,cvxpy_spmatrix
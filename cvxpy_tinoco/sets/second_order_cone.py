@@ -50,30 +50,50 @@ class cvxpy_second_order_cone(object):
         return self.name
 
     # Method: _construct
-    def _construct(self,el,mp,n):
+    def _construct(self,el,mp,n,params=None):
 
         m = el.shape[0]-1
-        G = opt.spmatrix(0.0,[],[],(m+1,n))
-        h = opt.matrix(0.0,(m+1,1))
+        V = np.empty(m+1,dtype=np.float64)
+        I = np.empty(m+1,dtype=np.intc)
+        J = np.empty(m+1,dtype=np.intc)
+        h = np.zeros(m+1,dtype=np.float64)
+        k = 0
 
         # y
         y = el[m,0]
         if np.isscalar(y):
-            h[0,0] = y*1.
+            h[0] = y*1.
         elif type(y) is cvxpy_obj:
-            h[0,0] = y.value*1.
+            h[0] = y.value*1.
+        elif y.is_constant():
+            h[0] = y.value*1.
+            if params is not None:
+                params.append((0,0.,[(1.,y)]))
         else:
-            G[0,mp[y]]=-1.
+            V[k] = -1.
+            I[k] = 0
+            J[k] = mp[y]
+            k += 1
 
         # x
         for i in range(0,m,1):
             x = el[i,0]
             if np.isscalar(x):
-                h[i+1,0] = x*1.
+                h[i+1] = x*1.
             elif type(x) is cvxpy_obj:
-                h[i+1,0] = x.value*1.
+                h[i+1] = x.value*1.
+            elif x.is_constant():
+                h[i+1] = x.value*1.
+                if params is not None:
+                    params.append((i+1,0.,[(1.,x)]))
             else:
-                G[i+1,mp[x]] = -1.
+                V[k] = -1.
+                I[k] = i+1
+                J[k] = mp[x]
+                k += 1
+        G = opt.spmatrix(V[:k].tolist(),I[:k].tolist(),J[:k].tolist(),
+                         (m+1,n),'d')
+        h = opt.matrix(h.tolist(),(m+1,1),'d')
         
         # Return G,h
         return G,h,m+1
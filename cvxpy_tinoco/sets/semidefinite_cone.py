@@ -50,19 +50,32 @@ class cvxpy_semidefinite_cone(object):
         return self.name
     
     # Method: _construct
-    def _construct(self,el,mp,n):
+    def _construct(self,el,mp,n,params=None):
 
         m = int(el.shape[0])
-        G = opt.spmatrix(0.0,[],[],(m*m,n))
-        h = opt.matrix(0.0,(m*m,1))
+        V = np.empty(m*m,dtype=np.float64)
+        I = np.empty(m*m,dtype=np.intc)
+        J = np.empty(m*m,dtype=np.intc)
+        h = np.zeros(m*m,dtype=np.float64)
+        k = 0
         for j in range(0,m,1):
             for i in range(0,m,1):
                 if np.isscalar(el[i,j]):
-                    h[j*m+i,0] = el[i,j]*1.
+                    h[j*m+i] = el[i,j]*1.
                 elif type(el[i,j]) is cvxpy_obj:
-                    h[j*m+i,0] = el[i,j].value*1.
+                    h[j*m+i] = el[i,j].value*1.
+                elif el[i,j].is_constant():
+                    h[j*m+i] = el[i,j].value*1.
+                    if params is not None:
+                        params.append((j*m+i,0.,[(1.,el[i,j])]))
                 else:
-                    G[j*m+i,mp[el[i,j]]] = -1.
+                    V[k] = -1.
+                    I[k] = j*m+i
+                    J[k] = mp[el[i,j]]
+                    k += 1
+        G = opt.spmatrix(V[:k].tolist(),I[:k].tolist(),J[:k].tolist(),
+                         (m*m,n),'d')
+        h = opt.matrix(h.tolist(),(m*m,1),'d')
         return G,h,m
 
 # Create instance
@@ -120,15 +120,32 @@ Deprecated submodules
 """
 
 
-from .merit_factors import quantization_noise_gain
-from .minmax import ntf_fir_minmax
-from .delsig import ntf_schreier, ntf_chebyshev, ntf_clans
-from .psychoacoustic import ntf_dunn, ntf_fir_audio_weighting
-from .weighting import (ntf_fir_weighting, ntf_hybrid_weighting,
-                        mult_weightings)
-
-from . import tests as test_suite
-
-from numpy.testing import Tester
-test = Tester().test
-bench = Tester().bench
+# Promote some key functions to the NTFdesign namespace. They are loaded on
+# first access, together with the modules they come from.
+from .._lazy import lazy_attributes, lazy_tester
+
+_lazy = {'quantization_noise_gain': ('.merit_factors',
+                                     'quantization_noise_gain'),
+         'ntf_fir_minmax': ('.minmax', 'ntf_fir_minmax'),
+         'ntf_schreier': ('.delsig', 'ntf_schreier'),
+         'ntf_chebyshev': ('.delsig', 'ntf_chebyshev'),
+         'ntf_clans': ('.delsig', 'ntf_clans'),
+         'ntf_dunn': ('.psychoacoustic', 'ntf_dunn'),
+         'ntf_fir_audio_weighting': ('.psychoacoustic',
+                                     'ntf_fir_audio_weighting'),
+         'ntf_fir_weighting': ('.weighting', 'ntf_fir_weighting'),
+         'ntf_hybrid_weighting': ('.weighting', 'ntf_hybrid_weighting'),
+         'mult_weightings': ('.weighting', 'mult_weightings'),
+         'test_suite': ('.tests', None)}
+
+__all__ = sorted(n for n in _lazy if n != 'test_suite')
+
+# Submodules
+_lazy.update((m, ('.'+m, None))
+             for m in ['delsig', 'filter_based', 'helpers', 'legacy',
+                       'merit_factors', 'minmax', 'psychoacoustic',
+                       'weighting'])
+
+__getattr__, __dir__ = lazy_attributes(__name__, _lazy, globals())
+
+test = lazy_tester(__path__[0])
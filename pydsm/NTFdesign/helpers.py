@@ -44,6 +44,8 @@ Functions
 import numpy as np
 from scipy.optimize import minimize
 from ..utilities import digested_options
+from .merit_factors import (quantization_noise_gain, _filter_weighting,
+                            _weighting_points)
 
 __all__ = ["maxflat_fir_zeros", "spread_fir_uc_zeros"]
 
@@ -141,6 +143,15 @@ def spread_fir_uc_zeros(order, OSR, cf, cf_args=[], cf_kwargs={}, **options):
     The system is implicitly assumed to be low-pass. Hence, the zeros
     are spread on the unit circle in the [0, pi/OSR] range.
 
+    When ``cf`` is :func:`pydsm.NTFdesign.quantization_noise_gain` and the
+    weighting is None, a filter or a function flagged as ``vectorized``, a
+    fast path is taken. The noise gain is integrated on a fixed
+    Gauss-Legendre grid, where the weighting function is evaluated only
+    once, and the exact gradient with respect to the zero angles is passed
+    to the optimizer. In this case, the ``eps`` option is not used. If the
+    grid cannot meet the accuracy of the integrator, the generic path is
+    taken.
+
     See Also
     --------
     scipy.optimize.minimize :  for the parameters passed to the ``L-BFGS-B``
@@ -149,7 +160,7 @@ def spread_fir_uc_zeros(order, OSR, cf, cf_args=[], cf_kwargs={}, **options):
     def dof2zeros(xx):
         zeros[0:xl] = np.exp(1j*xx)
         zeros[xl:2*xl] = zeros[0:xl].conj()
-        if order % 2 is 1:
+        if order % 2 == 1:
             zeros[-1] = 1
         return zeros
 
@@ -162,8 +173,15 @@ def spread_fir_uc_zeros(order, OSR, cf, cf_args=[], cf_kwargs={}, **options):
                             [], ['L_BFGS_B_opts'])
     xl = order // 2
     zeros = np.zeros(order, dtype=complex)
-    xx = minimize(mf, np.linspace(np.pi/OSR/order, np.pi/OSR, xl),
-                  method='l-bfgs-b', options=opts["L_BFGS_B_opts"],
+    x0 = np.linspace(np.pi/OSR/order, np.pi/OSR, xl)
+    jac = False
+    if cf is quantization_noise_gain:
+        qng_mf = _qng_merit(order, x0, *cf_args, **cf_kwargs)
+        if qng_mf is not None:
+            mf = qng_mf
+            jac = True
+    xx = minimize(mf, x0,
+                  method='l-bfgs-b', jac=jac, options=opts["L_BFGS_B_opts"],
                   bounds=[(0, np.pi/OSR)] * xl).x
     return dof2zeros(xx)
 
@@ -174,3 +192,108 @@ spread_fir_uc_zeros.default_options = {"L_BFGS_B_opts":
                                         "maxiter": 15000,
                                         "maxfun": 15000,
                                         "eps": 1E-8}}
+
+
+def _qng_merit(order, x0, w=None, bounds=(0, 0.5), avg=False, **options):
+    """
+    Fast merit function for spread_fir_uc_zeros based on the noise gain.
+
+    Returns a function of the zero angles returning the log10 of the
+    quantization noise gain of the corresponding FIR NTF, together with
+    its gradient.
+
+    The integral is computed on a fixed Gauss-Legendre grid, where the
+    weighting function is evaluated once. The grid is refined until the
+    noise gain at the initial zero angles ``x0`` meets the accuracy
+    required by the ``quad_opts`` of ``quantization_noise_gain``.
+
+    Returns None if the weighting is a function that is not flagged as
+    ``vectorized`` or if the grid refinement does not converge.
+    """
+    opts = digested_options(options, quantization_noise_gain.default_options,
+                            [], ['quad_opts'])
+    if w is None:
+        w = lambda f: np.ones_like(f)
+    elif isinstance(w, tuple) and 2 <= len(w) <= 3:
+        w = _filter_weighting(w)
+    elif not getattr(w, 'vectorized', False):
+        return None
+    quad_opts = _weighting_points(w, opts['quad_opts'], bounds)
+    c = 1./(bounds[1]-bounds[0]) if avg else 2.
+    edges = [bounds[0], bounds[1]]
+    if quad_opts.get('points') is not None:
+        edges.extend(pt for pt in quad_opts['points']
+                     if bounds[0] < pt < bounds[1])
+    edges = np.sort(edges)
+
+    def merit(xx, grid):
+        om, ww = grid
+        # Each couple of zeros at angles +-theta contributes the factor
+        # 4 sin^2((om-theta)/2) 4 sin^2((om+theta)/2) to |NTF|^2.
+        # The half-angle form avoids cancellations in the band.
+        sm = np.sin((om-xx[:, np.newaxis])/2)
+        sp = np.sin((om+xx[:, np.newaxis])/2)
+        fac = 16*(sm*sp)**2
+        h2 = ww*np.prod(fac, axis=0)
+        if order % 2 == 1:
+            h2 *= 4*np.sin(om/2)**2
+        v = np.sum(h2)
+        # Leave-one-out products, without divisions
+        lo = np.ones_like(fac)
+        hi = np.ones_like(fac)
+        if xx.size > 1:
+            lo[1:] = np.cumprod(fac[:-1], axis=0)
+            hi[:-1] = np.cumprod(fac[:0:-1], axis=0)[::-1]
+        dfac = 16*sm*sp*(sm*np.cos((om+xx[:, np.newaxis])/2) -
+                         sp*np.cos((om-xx[:, np.newaxis])/2))
+        rest = ww*lo*hi
+        if order % 2 == 1:
+            rest *= 4*np.sin(om/2)**2
+        g = np.sum(rest*dfac, axis=1)
+        return np.log10(c*v), g/(v*np.log(10))
+
+    def make_grid(n):
+        t, tw = np.polynomial.legendre.leggauss(n)
+        a = edges[:-1, np.newaxis]
+        b = edges[1:, np.newaxis]
+        f = ((b-a)/2*t+(a+b)/2).ravel()
+        fw = ((b-a)/2*tw).ravel()
+        return 2*np.pi*f, fw*w(f)
+
+    x0 = np.asarray(x0, dtype=float)
+    n = max(32, 2*(order+1))
+    grid = make_grid(n)
+    v = 10**merit(x0, grid)[0]
+    for i in range(10):
+        grid2 = make_grid(2*n)
+        v2 = 10**merit(x0, grid2)[0]
+        grid, n = grid2, 2*n
+        if abs(v2-v) <= max(quad_opts['epsabs'], quad_opts['epsrel']*v2):
+            return lambda xx: merit(np.asarray(xx, dtype=float), grid)
+        v = v2
+    return None
+
+
+def _design_stats(modeler):
+    """
+    Prepare the dictionary of statistics about an NTF design.
+
+    All entries are initially ``None`` and get filled by the design
+    function and by the modeler backend, as far as they can provide them.
+    """
+    stats = dict.fromkeys(['q0_weighting', 'modeling', 'solver', 'kkt',
+                           'iterations', 'primal_residual', 'dual_residual',
+                           'status', 'lee_slack'])
+    stats['modeler'] = modeler
+    return stats
+
+
+def _lee_slack(b, a, H_inf, nfft=8192):
+    """
+    Margin between H_inf and the peak gain of the NTF b(z)/a(z).
+
+    The peak gain is estimated on a grid of ``nfft`` points on the unit
+    circle. A negative value means that the Lee constraint is violated.
+    """
+    nfft = max(nfft, 8*len(b))
+    return H_inf-np.max(np.abs(np.fft.rfft(b, nfft)/np.fft.rfft(a, nfft)))
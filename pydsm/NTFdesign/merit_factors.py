@@ -41,12 +41,40 @@ Functions
 
 import numpy as np
 from scipy.integrate import quad
-from ..delsig import evalTF
+from ..delsig._tf import _tf_evaluator
 from ..utilities import digested_options
 
 __all__ = ["quantization_noise_gain"]
 
 
+def _filter_weighting(h):
+    """
+    Weighting function implicitly defined by a filter in zpk or ba form.
+
+    The filter is prepared for evaluation once, so that high order filters
+    are evaluated without overflows at each call.
+    """
+    hp = _tf_evaluator(h, power=True)
+    return lambda f: hp(np.exp(2j*np.pi*np.asarray(f)))
+
+
+def _weighting_points(w, quad_opts, bounds=(0, 0.5)):
+    """
+    Merge the discontinuities declared by a weighting into quad options.
+
+    Weighting functions can report the frequencies where they are not
+    smooth through a ``points`` attribute. These are passed to the
+    integrator, unless points are explicitly given in quad_opts.
+    """
+    points = getattr(w, 'points', None)
+    if points is None or quad_opts.get('points') is not None:
+        return quad_opts
+    points = [pt for pt in points if bounds[0] < pt < bounds[1]]
+    if len(points) == 0:
+        return quad_opts
+    return dict(quad_opts, points=points)
+
+
 def quantization_noise_gain(NTF, w=None, bounds=(0, 0.5), avg=False,
                             **options):
     r"""
@@ -94,7 +122,10 @@ def quantization_noise_gain(NTF, w=None, bounds=(0, 0.5), avg=False,
     Use an on-off weighting function :math:`w(f)` for multiband evaluation.
 
     In case the weighting function has discontinuities, report them to the
-    integrator via the ``quad_points`` parameter.
+    integrator via the ``points`` entry of ``quad_opts``. Alternatively, the
+    weighting function can declare them in a ``points`` attribute, as the
+    weightings returned by
+    :func:`pydsm.NTFdesign.psychoacoustic.audio_noise_weighting` do.
 
     See Also
     --------
@@ -103,16 +134,17 @@ def quantization_noise_gain(NTF, w=None, bounds=(0, 0.5), avg=False,
     # Manage parameters
     if w is None:
         w = lambda f: 1.
-    elif type(w) is tuple and 2 <= len(w) <= 3:
-        h = w
-        w = lambda f: np.abs(evalTF(h, np.exp(2j*np.pi*f)))**2
+    elif isinstance(w, tuple) and 2 <= len(w) <= 3:
+        w = _filter_weighting(w)
     # Manage optional parameters
     opts = digested_options(options, quantization_noise_gain.default_options,
                             [], ['quad_opts'])
     # Compute
+    quad_opts = _weighting_points(w, opts["quad_opts"], bounds)
     c = 1/(bounds[1]-bounds[0]) if avg else 2.
-    return c*quad(lambda f: np.abs(evalTF(NTF, np.exp(2j*np.pi*f)))**2*w(f),
-                  bounds[0], bounds[1], **opts["quad_opts"])[0]
+    ntf = _filter_weighting(NTF)
+    return c*quad(lambda f: ntf(f)*w(f),
+                  bounds[0], bounds[1], **quad_opts)[0]
 
 quantization_noise_gain.default_options = {"quad_opts": {"epsabs": 1E-14,
                                                          "epsrel": 1E-9,
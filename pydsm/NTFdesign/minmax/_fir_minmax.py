@@ -24,6 +24,7 @@ import numpy as np
 from warnings import warn
 from ...exceptions import PyDsmDeprecationWarning
 from ...utilities import digested_options
+from ..helpers import _design_stats, _lee_slack
 
 __all__ = ['ntf_fir_minmax', 'synthesize_ntf_minmax']
 
@@ -55,6 +56,16 @@ def ntf_fir_minmax(order=32, osr=32, H_inf=1.5, f0=0, zf=False,
         Flag controlling the pre-assignement of NTF zeros. If ``False``, the
         design is practiced without any zero pre-assignment. If ``True``, a
         zero is pre-assigned at the modulator center-band. Defaults to False.
+    stats_callback : callable, optional
+        function called with a dictionary of statistics once the design is
+        complete. Its entries are ``modeler``, ``q0_weighting`` (always
+        ``None`` here), ``modeling`` (time spent setting up the optimization
+        problem), ``solver`` (time spent in the solver), ``kkt`` (part of
+        the solver time spent factorizing the KKT systems), ``iterations``,
+        ``primal_residual`` and ``dual_residual`` (final residuals),
+        ``status`` (solver status) and ``lee_slack`` (margin between
+        ``H_inf`` and the peak NTF gain). Times are in seconds. Entries that
+        the modeler in use cannot provide are ``None``. Defaults to None.
 
     Returns
     -------
@@ -130,11 +141,12 @@ def ntf_fir_minmax(order=32, osr=32, H_inf=1.5, f0=0, zf=False,
     # Manage optional parameters
     opts = digested_options(
         options, ntf_fir_minmax.default_options,
-        ['show_progress', 'modeler'], [], False)
+        ['show_progress', 'modeler', 'stats_callback'], [], False)
     dig_opts = {'show_progress': opts['show_progress'],
                 'cvxpy_opts': {},
                 'tinoco_opts': {},
-                'picos_opts': {}}
+                'picos_opts': {},
+                'stats': _design_stats(opts['modeler'])}
     if opts['modeler'] == 'cvxpy':
         opts.update(digested_options(
             options, ntf_fir_minmax.default_options,
@@ -177,6 +189,9 @@ def ntf_fir_minmax(order=32, osr=32, H_inf=1.5, f0=0, zf=False,
         raise ValueError('Incorrect multiband specification')
     # Do the computation
     ntf_ir = _ntf_fir_from_digested(order, osr, H_inf, f0, zf, **dig_opts)
+    if opts['stats_callback'] is not None:
+        dig_opts['stats']['lee_slack'] = _lee_slack(ntf_ir, [1.], H_inf)
+        opts['stats_callback'](dig_opts['stats'])
     return (np.roots(ntf_ir), np.zeros(order), 1.)
 
 ntf_fir_minmax.default_options = {"cvxpy_opts": {'override_kktsolver': False,
@@ -191,7 +206,8 @@ ntf_fir_minmax.default_options = {"cvxpy_opts": {'override_kktsolver': False,
                                                'normalize': True,
                                                'use_indirect': False},
                                   'show_progress': True,
-                                  'modeler': 'cvxpy_old'}
+                                  'modeler': 'cvxpy_old',
+                                  'stats_callback': None}
 
 
 # Following part is deprecated
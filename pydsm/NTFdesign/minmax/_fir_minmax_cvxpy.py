@@ -52,14 +52,20 @@
 
 import numpy as np
 import cvxpy
+from timeit import default_timer as timer
+from ..weighting._fir_weighting_cvxpy import _fill_stats
 
 
 def ntf_fir_from_digested(order, osrs, H_inf, f0s, zf, **opts):
     """
     Synthesize FIR NTF with minmax approach from predigested specification
 
-    Version for the cvxpy_tinoco modeler.
+    Version for the cvxpy modeler.
+
+    Timings and solver statistics are stored in the ``stats`` dictionary
+    option, when provided.
     """
+    t0 = timer()
     verbose = opts['show_progress']
     if opts['cvxpy_opts']['solver'] == 'cvxopt':
         opts['cvxpy_opts']['solver'] = cvxpy.CVXOPT
@@ -132,5 +138,8 @@ def ntf_fir_from_digested(order, osrs, H_inf, f0s, zf, **opts):
         F += [MM << 0]
     target = cvxpy.Minimize(cvxpy.max_entries(gg))
     p = cvxpy.Problem(target, F)
+    t1 = timer()
     p.solve(verbose=verbose, **opts['cvxpy_opts'])
+    t2 = timer()
+    _fill_stats(opts.get('stats', {}), p, t2-t0, t2-t1)
     return np.hstack((1, np.asarray(c.value)[0, ::-1]))
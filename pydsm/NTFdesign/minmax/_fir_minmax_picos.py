@@ -53,14 +53,20 @@
 import numpy as np
 import picos
 import cvxopt
+from timeit import default_timer as timer
+from ..weighting._fir_weighting_picos import _fill_stats
 
 
 def ntf_fir_from_digested(order, osrs, H_inf, f0s, zf, **opts):
     """
     Synthesize FIR NTF with minmax approach from predigested specification
 
-    Version for the cvxpy_tinoco modeler.
+    Version for the picos modeler.
+
+    Timings and solver statistics are stored in the ``stats`` dictionary
+    option, when provided.
     """
+    t0 = timer()
     verbose = 1 if opts.get('show_progress', True) else 0
     if 'maxiters' in opts['picos_opts']:
         opts['picos_opts']['maxit'] = opts['picos_opts']['maxiters']
@@ -139,5 +145,8 @@ def ntf_fir_from_digested(order, osrs, H_inf, f0s, zf, **opts):
     p.add_constraint(picos.NormP_Exp(gg, 100) < mx)
     p.set_objective('min', mx)
     p.set_options(**opts['picos_opts'])
-    p.solve(verbose=verbose)
+    t1 = timer()
+    sol = p.solve(verbose=verbose)
+    t2 = timer()
+    _fill_stats(opts.get('stats', {}), p, sol, t2-t0, t2-t1)
     return np.hstack((1, np.asarray(c.value)[0, ::-1]))
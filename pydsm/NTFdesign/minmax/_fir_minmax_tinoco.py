@@ -52,6 +52,8 @@
 
 import numpy as np
 import cvxpy_tinoco
+from timeit import default_timer as timer
+from ..weighting._fir_weighting_tinoco import _fill_stats
 
 
 def ntf_fir_from_digested(order, osrs, H_inf, f0s, zf, **opts):
@@ -59,7 +61,11 @@ def ntf_fir_from_digested(order, osrs, H_inf, f0s, zf, **opts):
     Synthesize FIR NTF with minmax approach from predigested specification
 
     Version for the cvxpy_tinoco modeler.
+
+    Timings and solver statistics are stored in the ``stats`` dictionary
+    option, when provided.
     """
+    t0 = timer()
     quiet = not opts['show_progress']
 
     # State space representation of NTF
@@ -138,4 +144,5 @@ def ntf_fir_from_digested(order, osrs, H_inf, f0s, zf, **opts):
     p = cvxpy_tinoco.program(cvxpy_tinoco.minimize(cvxpy_tinoco.max(gg)), F)
     p.options.update(opts["tinoco_opts"])
     p.solve(quiet)
+    _fill_stats(opts.get('stats', {}), p, timer()-t0)
     return np.hstack((1, np.asarray(c.value)[0, ::-1]))
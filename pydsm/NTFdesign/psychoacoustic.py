@@ -38,6 +38,7 @@ Functions
     dunn_optzeros_cplx       -- helper function for NTF zeros
     ntf_dunn                 -- NTF design a la Dunn
     ntf_fir_audio_weighting  -- FIR NTF design with psychoacustic weighting
+    audio_noise_weighting    -- noise weighting from an audio weighting
 
 
 Deprecated functions
@@ -58,11 +59,10 @@ from .. import audio_weightings
 from .weighting import ntf_fir_weighting
 from warnings import warn
 from ..exceptions import PyDsmDeprecationWarning
-import collections
 
 __all__ = ["dunn_optzeros", "dunn_optzeros_cplx", "synthesize_ntf_dunn",
            "synthesize_ntf_from_audio_weighting",
-           "ntf_dunn", "ntf_fir_audio_weighting"]
+           "ntf_dunn", "ntf_fir_audio_weighting", "audio_noise_weighting"]
 
 
 def dunn_optzeros(n):
@@ -269,30 +269,80 @@ def ntf_fir_audio_weighting(
     scipy.integrate.quad : for the meaning of the integrator parameters.
     cvxopt : for the optimizer parameters
     """
-    if not isinstance(audio_weighting, collections.Callable):
-        if audio_weighting == 'f':
-            audio_weighting = audio_weightings.f_weighting
-        elif audio_weighting == 'a':
-            audio_weighting = audio_weightings.a_weighting
-        elif audio_weighting == 'b':
-            audio_weighting = audio_weightings.b_weighting
-        elif audio_weighting == 'c':
-            audio_weighting = audio_weightings.c_weighting
-        elif audio_weighting == 'd':
-            audio_weighting = audio_weightings.d_weighting
-
-    def w(f):
-        ma = undbp(-max_attn)
-        fx = f*audio_band*2*osr
-        w = audio_weighting(fx) if fx <= audio_band else 0
-        return max(w, ma)
-
+    w = audio_noise_weighting(osr, audio_weighting, audio_band, max_attn)
     return ntf_fir_weighting(order, w, H_inf, normalize, **options)
 
 ntf_fir_audio_weighting.default_options = \
     ntf_fir_weighting.default_options.copy()
 
 
+_audio_weightings = {'f': audio_weightings.f_weighting,
+                     'a': audio_weightings.a_weighting,
+                     'b': audio_weightings.b_weighting,
+                     'c': audio_weightings.c_weighting,
+                     'd': audio_weightings.d_weighting}
+
+
+def audio_noise_weighting(osr, audio_weighting='f', audio_band=22.05E3,
+                          max_attn=120):
+    """
+    Noise weighting function derived from an audio weighting function.
+
+    Maps an audio weighting, expressed on real frequencies in Hz, onto the
+    normalized frequency axis of a ΔΣ modulator, zeroing it outside the
+    signal band and clipping very large attenuations.
+
+    Parameters
+    ----------
+    osr : float
+        the oversampling ratio
+    audio_weighting : callable or string
+        audio weighting function, taking a frequency in Hz and returning the
+        weighting at that frequency in terms of acoustic power. It must
+        accept array arguments. Strings 'a', 'b', 'c', 'd' and 'f' select the
+        corresponding function in the :mod:`pydsm.audio_weightings` module.
+        Defaults to 'f'.
+    audio_band : float, optional
+        how large the audio bandwidth to consider. The signal band is from
+        0 to audio_band Hz. Defaults to 22.05 kHz
+    max_attn : float, optional
+        clip very large attenuations to this value (in dB). Defaults to
+        120 dB.
+
+    Returns
+    -------
+    w : callable
+        noise weighting function of the normalized frequency f in [0, 1/2].
+        It accepts scalars as well as arrays. The band edge at 0.5/osr, where
+        the function is discontinuous, is reported in its ``points``
+        attribute, so that integrators can split the integration domain
+        there.
+
+    Notes
+    -----
+    The returned function is flagged as ``vectorized``, which lets
+    :func:`pydsm.NTFdesign.weighting.q0_weighting` evaluate it on whole
+    frequency grids rather than point by point.
+    """
+    if not callable(audio_weighting):
+        try:
+            audio_weighting = _audio_weightings[audio_weighting]
+        except KeyError:
+            raise ValueError("Unknown audio weighting")
+    ma = undbp(-max_attn)
+
+    def w(f):
+        fx = np.asarray(f, dtype=float)*(audio_band*2*osr)
+        inband = fx <= audio_band
+        ww = np.where(inband,
+                      audio_weighting(np.where(inband, fx, audio_band)), 0.)
+        return np.maximum(ww, ma)[()]
+
+    w.points = [0.5/osr]
+    w.vectorized = True
+    return w
+
+
 # Following part is deprecated
 
 def synthesize_ntf_dunn(order=3, osr=64, H_inf=1.5):
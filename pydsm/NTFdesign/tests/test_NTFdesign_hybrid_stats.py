@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+from numpy.testing import TestCase, run_module_suite
+from unittest import SkipTest
+from pydsm.NTFdesign import ntf_hybrid_weighting
+
+__all__ = ["TestNTF_HybridStats"]
+
+
+class TestNTF_HybridStats(TestCase):
+
+    def setUp(self):
+        # Same Schreier-type design as in test_NTFdesign_hybrid
+        self.order = 3
+        self.OSR = 64
+        self.e_p = [0.6692, 0.7652 - 0.2795j, 0.7652 + 0.2795j]
+
+    def w(self, f):
+        return 1. if f <= 0.5/self.OSR else 1E-12
+
+    def test_ntf_hybrid_tinoco_stats(self):
+        try:
+            import cvxpy_tinoco     # analysis:ignore
+        except ImportError:
+            raise SkipTest("Modeler 'cvxpy_old' not installed")
+        stats = []
+        ntf_hybrid_weighting(self.order, self.w, H_inf=1.5,
+                             poles=self.e_p,
+                             show_progress=False,
+                             modeler='cvxpy_old',
+                             quad_opts={"points": [0.5/self.OSR]},
+                             stats_callback=stats.append)
+        self.assertEqual(len(stats), 1)
+        s = stats[0]
+        self.assertEqual(s['modeler'], 'cvxpy_old')
+        self.assertEqual(s['status'], 'optimal')
+        self.assertTrue(s['q0_weighting'] > 0)
+        self.assertTrue(s['iterations'] > 0)
+        self.assertTrue(-1e-4 < s['lee_slack'] < 1.5)
+
+if __name__ == '__main__':
+    run_module_suite()
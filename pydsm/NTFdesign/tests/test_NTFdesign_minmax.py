@@ -228,6 +228,26 @@ class TestSynthesizeNTFminmax(TestCase):
         np.testing.assert_allclose(k, e_k, rtol=1e-6)
         np.testing.assert_allclose(z, e_z, rtol=1e-3, atol=3e-2)
 
+    def test_LP8_tinoco_stats(self):
+        try:
+            import cvxpy_tinoco     # analysis:ignore
+        except:
+            raise SkipTest("Modeler 'cvxpy_old' not installed")
+        stats = []
+        ntf_fir_minmax(order=8, show_progress=False, modeler='cvxpy_old',
+                       stats_callback=stats.append)
+        self.assertEqual(len(stats), 1)
+        s = stats[0]
+        self.assertEqual(s['modeler'], 'cvxpy_old')
+        self.assertEqual(s['status'], 'optimal')
+        self.assertIsNone(s['q0_weighting'])
+        self.assertTrue(s['iterations'] > 0)
+        self.assertTrue(0 < s['kkt'] <= s['solver'])
+        self.assertTrue(s['modeling'] > 0)
+        self.assertTrue(s['primal_residual'] < 1e-6)
+        self.assertTrue(s['dual_residual'] < 1e-6)
+        self.assertTrue(-1e-4 < s['lee_slack'] < 1.5)
+
 
 if __name__ == '__main__':
     run_module_suite()
@@ -86,6 +86,26 @@ class TestNTF_Filter(TestCase):
                                  show_progress=False)
         np.testing.assert_allclose(np.sort(ntf1[0]), self.z_e, rtol=1e-5)
 
+    def test_ntf_cvxpy_old_threads(self):
+        # Designs sharing the same compiled program, in parallel
+        try:
+            import cvxpy_tinoco     # analysis:ignore
+        except:
+            raise SkipTest("Modeler 'cvxpy_old' not installed")
+        from concurrent.futures import ThreadPoolExecutor
+        hh = [signal.butter(4, [w, 1.5*w], 'bandpass', output='zpk')
+              for w in [0.02, 0.05, 0.1, 0.2]]
+
+        def design(h):
+            return ntf_fir_weighting(8, h, modeler='cvxpy_old',
+                                     show_progress=False)
+        e_ntfs = [design(h) for h in hh]
+        with ThreadPoolExecutor(4) as pool:
+            ntfs = list(pool.map(design, hh*2))
+        for ntf, e_ntf in zip(ntfs, e_ntfs*2):
+            np.testing.assert_allclose(np.sort(ntf[0]), np.sort(e_ntf[0]),
+                                       rtol=1e-9)
+
     def test_ntf_butt_bp8_cvxpy_cvxopt(self):
         try:
             import cvxpy     # analysis:ignore
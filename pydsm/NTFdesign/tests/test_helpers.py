@@ -45,5 +45,54 @@ class TestNTFdesignHelpers(TestCase):
         zeros2 = cplxpair(zeros2)
         np.testing.assert_almost_equal(zeros1, zeros2, 4)
 
+    def test_uc_zeros_12(self):
+        order = 12
+        OSR = 64
+        zeros1 = spread_fir_uc_zeros(order, OSR,
+                                     quantization_noise_gain,
+                                     cf_kwargs={'bounds': (0, 0.5/OSR)})
+        zeros1 = cplxpair(zeros1)
+        zeros2 = ds_optzeros(order)
+        zeros2 = np.exp(1j*np.pi*zeros2/OSR)
+        zeros2 = cplxpair(zeros2)
+        np.testing.assert_almost_equal(zeros1, zeros2, 4)
+
+    def test_uc_zeros_weighted(self):
+        # Fast path vs generic cost function path
+        order = 6
+        OSR = 64
+        w = lambda f: 1.+(2*f*OSR)**2
+        w.vectorized = True
+        kwargs = {'w': w, 'bounds': (0, 0.5/OSR)}
+        zeros1 = spread_fir_uc_zeros(order, OSR,
+                                     quantization_noise_gain,
+                                     cf_kwargs=kwargs)
+        zeros2 = spread_fir_uc_zeros(order, OSR,
+                                     lambda *args, **kwargs:
+                                     quantization_noise_gain(*args, **kwargs),
+                                     cf_kwargs=kwargs)
+        np.testing.assert_almost_equal(cplxpair(zeros1), cplxpair(zeros2), 6)
+
+    def test_uc_zeros_scalar_weighting(self):
+        # Weightings accepting only scalars take the generic path. The
+        # discontinuity is declared by the weighting, also for the fast path
+        order = 6
+        OSR = 64
+
+        def w_scalar(f):
+            return 1. if f <= 0.25/OSR else 2.
+        w_scalar.points = [0.25/OSR]
+
+        def w_vector(f):
+            return np.where(f <= 0.25/OSR, 1., 2.)
+        w_vector.points = [0.25/OSR]
+        w_vector.vectorized = True
+        zeros = []
+        for w in [w_scalar, w_vector]:
+            zeros.append(cplxpair(spread_fir_uc_zeros(
+                order, OSR, quantization_noise_gain,
+                cf_kwargs={'w': w, 'bounds': (0, 0.5/OSR)})))
+        np.testing.assert_almost_equal(zeros[0], zeros[1], 6)
+
 if __name__ == '__main__':
     run_module_suite()
@@ -25,11 +25,12 @@ import numpy as np
 from scipy import signal
 from pydsm.ir import impulse_response
 from pydsm.NTFdesign.legacy import q0_from_filter_ir
-from pydsm.NTFdesign.weighting import q0_weighting
+from pydsm.NTFdesign.weighting import q0_weighting, mult_weightings
+from pydsm.NTFdesign.psychoacoustic import audio_noise_weighting
 from pydsm.NTFdesign import quantization_noise_gain
 import scipy.linalg as la
 
-__all__ = ["TestQ0"]
+__all__ = ["TestQ0", "TestQ0Vectorized"]
 
 
 class TestQ0(TestCase):
@@ -94,5 +95,49 @@ class TestQ0(TestCase):
         gain2 = fir_coeff.dot(Q).dot(fir_coeff.T)
         np.testing.assert_allclose(gain2, gain1)
 
+
+class TestQ0Vectorized(TestCase):
+
+    def setUp(self):
+        self.w = audio_noise_weighting(64)
+
+    def scalar(self):
+        w = self.w
+
+        def ws(f):
+            return w(f)
+        ws.points = w.points
+        return ws
+
+    def test_audio_weighting_vectorized(self):
+        ff = np.linspace(0, 0.5, 1001)
+        ws = np.asarray([self.w(f) for f in ff])
+        np.testing.assert_allclose(self.w(ff), ws, rtol=1E-12)
+        np.testing.assert_equal(self.w.points, [0.5/64])
+        np.testing.assert_equal(self.w(0.1), 1E-12)
+
+    def test_q0_vectorized(self):
+        for P in (4, 12, 24):
+            q0_vec = q0_weighting(P, self.w)
+            q0_quad = q0_weighting(P, self.scalar())
+            np.testing.assert_allclose(q0_vec, q0_quad, atol=1E-14,
+                                       rtol=1E-9)
+
+    def test_mult_weightings(self):
+        hz = signal.butter(3, 0.01, 'lowpass', output='zpk')
+        w = mult_weightings(self.w, hz)
+        np.testing.assert_equal(w.points, [0.5/64])
+        self.assertTrue(w.vectorized)
+        q0_vec = q0_weighting(12, w)
+        q0_quad = q0_weighting(12, mult_weightings(self.scalar(), hz))
+        np.testing.assert_allclose(q0_vec, q0_quad, atol=1E-14, rtol=1E-9)
+
+    def test_quantization_noise_gain(self):
+        ntf = (np.asarray([1., -2., 1.]), np.asarray([1., 0., 0.]))
+        g1 = quantization_noise_gain(ntf, self.w)
+        g2 = quantization_noise_gain(ntf, self.w,
+                                     quad_opts={'points': [0.5/64]})
+        np.testing.assert_allclose(g1, g2)
+
 if __name__ == '__main__':
     run_module_suite()
@@ -37,10 +37,13 @@ The optimization is practiced in two steps:
 
 import numpy as np
 from ...ft import idtft_hermitian
-from ...delsig import evalTF, padr
+from ...delsig import padr
 from warnings import warn
 from ...exceptions import PyDsmDeprecationWarning
 from ...utilities import digested_options
+from ..helpers import _design_stats, _lee_slack
+from ..merit_factors import _weighting_points, _filter_weighting
+from timeit import default_timer as timer
 import scipy.linalg as la
 
 __all__ = ["q0_from_noise_weighting", "q0_weighting",
@@ -67,15 +70,62 @@ def mult_weightings(*ww):
     -------
     w : function
         Overall weighting function
+
+    Notes
+    -----
+    The discontinuities declared by the factors in their ``points``
+    attribute are collected in the ``points`` attribute of the product.
+    The product is flagged as ``vectorized`` when all the factors are.
     """
     wn = [0] * len(ww)
+    points = set()
+    vectorized = True
     for i, wi in enumerate(ww):
-        if type(wi) is tuple and 2 <= len(wi) <= 3:
-            wn[i] = (lambda wi:
-                     lambda f: np.abs(evalTF(wi, np.exp(2j*np.pi*f)))**2)(wi)
+        if isinstance(wi, tuple) and 2 <= len(wi) <= 3:
+            wn[i] = _filter_weighting(wi)
         else:
             wn[i] = wi
-    return lambda f: np.prod([w(f) for w in wn], axis=0)
+            points.update(getattr(wi, 'points', []))
+            vectorized = vectorized and getattr(wi, 'vectorized', False)
+    w = lambda f: np.prod([w(f) for w in wn], axis=0)
+    if len(points) > 0:
+        w.points = sorted(points)
+    w.vectorized = vectorized
+    return w
+
+
+def _q0_gauss(P, w, points, epsabs, epsrel, limit):
+    """
+    Compute q0 for a vectorized weighting by composite Gauss-Legendre rules.
+
+    The interval [0, 1/2] is split at the weighting discontinuities and each
+    panel is subdivided in more and more sub-panels until two successive
+    estimates agree. Returns None if this does not happen within ``limit``
+    sub-panels.
+    """
+    edges = np.unique(np.r_[0., [pt for pt in points if 0 < pt < 0.5], 0.5])
+    x, fw = np.polynomial.legendre.leggauss(_GAUSS_NODES)
+    k = np.arange(P+1)
+    m = 1
+    while len(edges)*m*_GAUSS_NODES < max(32, 2*(P+1)):
+        m *= 2
+    q0 = None
+    while m <= limit:
+        ee = np.concatenate([np.linspace(a, b, m+1)[:-1]
+                             for a, b in zip(edges[:-1], edges[1:])]+[[0.5]])
+        c = (ee[1:]+ee[:-1])/2
+        h = (ee[1:]-ee[:-1])/2
+        f = (c[:, np.newaxis]+h[:, np.newaxis]*x).ravel()
+        wt = (h[:, np.newaxis]*fw).ravel()
+        q = 2*np.cos(2*np.pi*np.outer(k, f)).dot(wt*w(f))
+        if q0 is not None and \
+                np.max(np.abs(q-q0)) <= max(epsabs, epsrel*np.max(np.abs(q))):
+            return q
+        q0 = q
+        m *= 2
+    return None
+
+_GAUSS_NODES = 16
 
 
 def q0_weighting(P, w, **options):
@@ -107,6 +157,16 @@ def q0_weighting(P, w, **options):
     -----
     The Q matrix being synthesized has (P+1) times (P+1) entries.
 
+    If the weighting function has a ``points`` attribute, listing the
+    frequencies where it is discontinuous, these are passed to the
+    integrator, unless ``points`` is explicitly set in ``quad_opts``.
+    If the weighting function has a true ``vectorized`` attribute, it is
+    assumed to accept arrays of frequencies and all the entries of q0 are
+    computed at once by composite Gauss-Legendre rules, split at the
+    discontinuities, with the same tolerances as the integrator. The
+    adaptive integrator is used as a fallback if these rules fail to
+    converge.
+
     Default values for the options not directly documented in the function
     call signature can be checked and updated by changing the function
     ``default_options`` attribute.
@@ -116,14 +176,21 @@ def q0_weighting(P, w, **options):
     scipy.integrate.quad : For the meaning of the integrator parameters.
     """
     # Manage parameters
-    if type(w) is tuple and 2 <= len(w) <= 3:
-        h = w
-        w = lambda f: np.abs(evalTF(h, np.exp(2j*np.pi*f)))**2
+    if isinstance(w, tuple) and 2 <= len(w) <= 3:
+        w = _filter_weighting(w)
     # Manage optional parameters
     opts = digested_options(options, q0_weighting.default_options,
                             [], ['quad_opts'])
+    quad_opts = _weighting_points(w, opts['quad_opts'])
     # Do the computation
-    return idtft_hermitian(w, np.arange(P+1), **opts)
+    if getattr(w, 'vectorized', False):
+        q0 = _q0_gauss(P, w, quad_opts.get('points') or [],
+                       quad_opts.get('epsabs', 1.49E-8),
+                       quad_opts.get('epsrel', 1.49E-8),
+                       quad_opts.get('limit', 50))
+        if q0 is not None:
+            return q0
+    return idtft_hermitian(w, np.arange(P+1), quad_opts=quad_opts)
 
 q0_weighting.default_options = {"quad_opts": {"epsabs": 1E-14,
                                               "epsrel": 1E-9,
@@ -162,6 +229,17 @@ def ntf_fir_from_q0(q0, H_inf=1.5, normalize="auto", **options):
         modeling backend for the optimization problem. Currently, the
         ``cvxpy_old``, ``cvxpy`` and ``picos`` backends are supported.
         Default is ``cvxpy_old``.
+    stats_callback : callable, optional
+        function called with a dictionary of statistics once the design is
+        complete. Its entries are ``modeler``, ``q0_weighting`` (time spent
+        computing the quadratic form from the weighting, if any),
+        ``modeling`` (time spent setting up the optimization problem),
+        ``solver`` (time spent in the solver), ``kkt`` (part of the solver
+        time spent factorizing the KKT systems), ``iterations``,
+        ``primal_residual`` and ``dual_residual`` (final residuals),
+        ``status`` (solver status) and ``lee_slack`` (margin between
+        ``H_inf`` and the peak NTF gain). Times are in seconds. Entries that
+        the modeler in use cannot provide are ``None``. Defaults to None.
     cvxpy_opts : dictionary, optional
        A dictionary of options to use with the ``cvxpy`` modeling library.
        Allowed options include:
@@ -225,11 +303,12 @@ def ntf_fir_from_q0(q0, H_inf=1.5, normalize="auto", **options):
     # Manage optional parameters
     opts = digested_options(
         options, ntf_fir_from_q0.default_options,
-        ['show_progress', 'fix_pos', 'modeler'], [], False)
+        ['show_progress', 'fix_pos', 'modeler', 'stats_callback'], [], False)
     dig_opts = {'show_progress': opts['show_progress'],
                 'cvxpy_opts': {},
                 'tinoco_opts': {},
-                'picos_opts': {}}
+                'picos_opts': {},
+                'stats': _design_stats(opts['modeler'])}
     if opts['modeler'] == 'cvxpy':
         opts.update(digested_options(
             options, ntf_fir_from_q0.default_options,
@@ -279,6 +358,9 @@ def ntf_fir_from_q0(q0, H_inf=1.5, normalize="auto", **options):
     A = np.eye(order, order, 1)
     C = np.zeros((1, order))
     ntf_ir = _ntf_fir_from_digested(Qs, A, C, H_inf, **dig_opts)
+    if opts['stats_callback'] is not None:
+        dig_opts['stats']['lee_slack'] = _lee_slack(ntf_ir, [1.], H_inf)
+        opts['stats_callback'](dig_opts['stats'])
     return (np.roots(ntf_ir), np.zeros(order), 1.)
 
 
@@ -295,7 +377,8 @@ ntf_fir_from_q0.default_options = {"modeler": "cvxpy_old",
                                                 'normalize': True,
                                                 'use_indirect': False},
                                    'show_progress': True,
-                                   'fix_pos': True}
+                                   'fix_pos': True,
+                                   'stats_callback': None}
 
 
 def ntf_fir_weighting(order, w, H_inf=1.5,
@@ -336,6 +419,17 @@ def ntf_fir_weighting(order, w, H_inf=1.5,
         modeling backend for the optimization problem. Currently, the
         ``cvxpy_old``, ``cvxpy`` and ``picos`` backends are supported.
         Default is ``cvxpy_old``.
+    stats_callback : callable, optional
+        function called with a dictionary of statistics once the design is
+        complete. Its entries are ``modeler``, ``q0_weighting`` (time spent
+        computing the quadratic form from the weighting, if any),
+        ``modeling`` (time spent setting up the optimization problem),
+        ``solver`` (time spent in the solver), ``kkt`` (part of the solver
+        time spent factorizing the KKT systems), ``iterations``,
+        ``primal_residual`` and ``dual_residual`` (final residuals),
+        ``status`` (solver status) and ``lee_slack`` (margin between
+        ``H_inf`` and the peak NTF gain). Times are in seconds. Entries that
+        the modeler in use cannot provide are ``None``. Defaults to None.
     cvxpy_opts : dictionary, optional
        A dictionary of options to use with the ``cvxpy`` modeling library.
        Allowed options include:
@@ -417,7 +511,7 @@ def ntf_fir_weighting(order, w, H_inf=1.5,
                              [], ['quad_opts'], False)
     opts2 = digested_options(
         options, ntf_fir_weighting.default_options,
-        ['show_progress', 'fix_pos', 'modeler'], [], False)
+        ['show_progress', 'fix_pos', 'modeler', 'stats_callback'], [], False)
     if opts2['modeler'] == 'cvxpy':
         opts2.update(digested_options(
             options, ntf_fir_weighting.default_options,
@@ -439,7 +533,13 @@ def ntf_fir_weighting(order, w, H_inf=1.5,
             opts2['modeler']))
     digested_options(options, {})
     # Do the computation
+    t0 = timer()
     q0 = q0_weighting(order, w, **opts1)
+    t_q0 = timer()-t0
+    callback = opts2['stats_callback']
+    if callback is not None:
+        opts2['stats_callback'] = (lambda stats:
+                                   callback(dict(stats, q0_weighting=t_q0)))
     return ntf_fir_from_q0(q0, H_inf, normalize, **opts2)
 
 ntf_fir_weighting.default_options = q0_weighting.default_options.copy()
@@ -487,6 +587,17 @@ def ntf_hybrid_weighting(order, w, H_inf=1.5, poles=[],
         modeling backend for the optimization problem. Currently, the
         ``cvxpy_old``, ``cvxpy`` and ``picos`` backends are supported.
         Default is ``cvxpy_old``.
+    stats_callback : callable, optional
+        function called with a dictionary of statistics once the design is
+        complete. Its entries are ``modeler``, ``q0_weighting`` (time spent
+        computing the quadratic form from the weighting, if any),
+        ``modeling`` (time spent setting up the optimization problem),
+        ``solver`` (time spent in the solver), ``kkt`` (part of the solver
+        time spent factorizing the KKT systems), ``iterations``,
+        ``primal_residual`` and ``dual_residual`` (final residuals),
+        ``status`` (solver status) and ``lee_slack`` (margin between
+        ``H_inf`` and the peak NTF gain). Times are in seconds. Entries that
+        the modeler in use cannot provide are ``None``. Defaults to None.
     cvxpy_opts : dictionary, optional
        A dictionary of options to use with the ``cvxpy`` modeling library.
        Allowed options include:
@@ -565,11 +676,12 @@ def ntf_hybrid_weighting(order, w, H_inf=1.5, poles=[],
                              [], ['quad_opts'], False)
     opts2 = digested_options(
         options, ntf_hybrid_weighting.default_options,
-        ['show_progress', 'fix_pos', 'modeler'], [], False)
+        ['show_progress', 'fix_pos', 'modeler', 'stats_callback'], [], False)
     dig_opts = {'show_progress': opts2['show_progress'],
                 'cvxpy_opts': {},
                 'tinoco_opts': {},
-                'picos_opts': {}}
+                'picos_opts': {},
+                'stats': _design_stats(opts2['modeler'])}
     if opts2['modeler'] == 'cvxpy':
         opts2.update(digested_options(
             options, ntf_fir_from_q0.default_options,
@@ -610,7 +722,9 @@ def ntf_hybrid_weighting(order, w, H_inf=1.5, poles=[],
         wn = mult_weightings(w, ([], poles, 1))
     else:
         wn = w
+    t0 = timer()
     q0 = q0_weighting(order, wn, **opts1)
+    dig_opts['stats']['q0_weighting'] = timer()-t0
     if normalize == 'auto':
         q0 = q0/q0[0]
     elif normalize is not None:
@@ -630,6 +744,10 @@ def ntf_hybrid_weighting(order, w, H_inf=1.5, poles=[],
     A[order-1] = -ar[::-1]
     C = -ar[::-1].reshape((1, order))
     ntf_ir = _ntf_fir_from_digested(Qs, A, C, H_inf, **dig_opts)
+    if opts2['stats_callback'] is not None:
+        dig_opts['stats']['lee_slack'] = _lee_slack(ntf_ir, np.poly(poles),
+                                                    H_inf)
+        opts2['stats_callback'](dig_opts['stats'])
     return (np.roots(ntf_ir), poles, 1.)
 
 ntf_hybrid_weighting.default_options = {"modeler": "cvxpy_old",
@@ -646,7 +764,8 @@ ntf_hybrid_weighting.default_options = {"modeler": "cvxpy_old",
                                                      'normalize': True,
                                                      'use_indirect': False},
                                         'show_progress': True,
-                                        'fix_pos': True}
+                                        'fix_pos': True,
+                                        'stats_callback': None}
 ntf_hybrid_weighting.default_options.update(q0_weighting.default_options)
 
 
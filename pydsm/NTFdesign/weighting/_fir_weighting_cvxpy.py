@@ -20,6 +20,7 @@
 
 import numpy as np
 import cvxpy
+from timeit import default_timer as timer
 
 
 def ntf_fir_from_digested(Qs, A, C, H_inf, **opts):
@@ -27,7 +28,11 @@ def ntf_fir_from_digested(Qs, A, C, H_inf, **opts):
     Synthesize FIR NTF from predigested specification
 
     Version for the cvxpy modeler.
+
+    Timings and solver statistics are stored in the ``stats`` dictionary
+    option, when provided.
     """
+    t0 = timer()
     verbose = opts['show_progress']
     if opts['cvxpy_opts']['solver'] == 'cvxopt':
         opts['cvxpy_opts']['solver'] = cvxpy.CVXOPT
@@ -48,5 +53,23 @@ def ntf_fir_from_digested(Qs, A, C, H_inf, **opts):
                     [C, D, np.matrix(-1.)]])
     constraints = [M << 0, X >> 0]
     p = cvxpy.Problem(target, constraints)
+    t1 = timer()
     p.solve(verbose=verbose, **opts['cvxpy_opts'])
+    t2 = timer()
+    _fill_stats(opts.get('stats', {}), p, t2-t0, t2-t1)
     return np.hstack((1, np.asarray(br.value.T)[0]))
+
+
+def _fill_stats(stats, p, elapsed, t_solve):
+    """
+    Fill design statistics from a solved cvxpy problem
+
+    cvxpy does not expose the KKT factorization time nor the final
+    residuals, which are left unset.
+    """
+    solver_stats = getattr(p, 'solver_stats', None)
+    solve_time = getattr(solver_stats, 'solve_time', None)
+    stats['solver'] = solve_time if solve_time is not None else t_solve
+    stats['modeling'] = elapsed-stats['solver']
+    stats['iterations'] = getattr(solver_stats, 'num_iters', None)
+    stats['status'] = p.status
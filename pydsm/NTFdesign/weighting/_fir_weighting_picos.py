@@ -21,14 +21,19 @@
 import numpy as np
 import picos
 import cvxopt
+from timeit import default_timer as timer
 
 
 def ntf_fir_from_digested(Qs, A, C, H_inf, **opts):
     """
     Synthesize FIR NTF from predigested specification
 
-    Version for the cvxpy modeler.
+    Version for the picos modeler.
+
+    Timings and solver statistics are stored in the ``stats`` dictionary
+    option, when provided.
     """
+    t0 = timer()
     verbose = 1 if opts.get('show_progress', True) else 0
     if 'maxiters' in opts['picos_opts']:
         opts['picos_opts']['maxit'] = opts['picos_opts']['maxiters']
@@ -57,5 +62,24 @@ def ntf_fir_from_digested(Qs, A, C, H_inf, **opts):
     p.add_constraint(constraint1)
     p.add_constraint(constraint2)
     p.set_options(**opts['picos_opts'])
-    p.solve(verbose=verbose)
+    t1 = timer()
+    sol = p.solve(verbose=verbose)
+    t2 = timer()
+    _fill_stats(opts.get('stats', {}), p, sol, t2-t0, t2-t1)
     return np.hstack((1, np.asarray(br.value.T)[0]))
+
+
+def _fill_stats(stats, p, sol, elapsed, t_solve):
+    """
+    Fill design statistics from a solved picos problem
+
+    Iteration count and residuals are taken from the ``cvxopt`` solution
+    returned by picos, when available.
+    """
+    info = sol.get('cvxopt_sol', {}) if isinstance(sol, dict) else {}
+    stats['solver'] = t_solve
+    stats['modeling'] = elapsed-t_solve
+    stats['iterations'] = info.get('iterations')
+    stats['primal_residual'] = info.get('primal infeasibility')
+    stats['dual_residual'] = info.get('dual infeasibility')
+    stats['status'] = info.get('status', getattr(p, 'status', None))
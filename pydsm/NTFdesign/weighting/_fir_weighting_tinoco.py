@@ -18,22 +18,49 @@
 # You should have received a copy of the GNU General Public License
 # along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
 
+import threading
 import numpy as np
 import cvxpy_tinoco
+from timeit import default_timer as timer
 
 
-def ntf_fir_from_digested(Qs, A, C, H_inf, **opts):
+# Compiled programs, keyed by order and state space matrices. Each one
+# comes with a lock, since its parameters and variables are shared by all
+# the threads using it
+_programs = {}
+_programs_max = 16
+_programs_lock = threading.Lock()
+
+
+def _get_program(order, A, C):
     """
-    Synthesize FIR NTF from predigested specification
+    Get a compiled program for a given order and state space structure
 
-    Version for the cvxpy_tinoco modeler.
+    The quantization noise weighting matrix and the squared bound on the
+    NTF infinity norm are left as parameters, so that families of designs
+    sharing the same structure only patch the numeric data of the
+    program instead of building it again.
+    """
+    key = (order, A.tobytes(), C.tobytes())
+    with _programs_lock:
+        if key not in _programs:
+            if len(_programs) >= _programs_max:
+                _programs.clear()
+            _programs[key] = _build_program(order, A, C)
+        return _programs[key]
+
+
+def _build_program(order, A, C):
+    """
+    Build and compile the program for a given order and state space
+    structure, returning it together with its default options, its
+    variable and parameters and its lock.
     """
-    quiet = not opts['show_progress']
-    order = np.size(Qs, 0)-1
     br = cvxpy_tinoco.variable(order, 1, name='br')
     b = cvxpy_tinoco.vstack((1, br))
     X = cvxpy_tinoco.variable(order, order, structure='symmetric', name='X')
-    Qs = cvxpy_tinoco.matrix(Qs)
+    Qs = cvxpy_tinoco.parameter(order+1, order+1, name='Qs')
+    H_inf2 = cvxpy_tinoco.parameter(name='H_inf2')
     target = cvxpy_tinoco.norm2(Qs*b)
     A = cvxpy_tinoco.matrix(A)
     B = cvxpy_tinoco.vstack((cvxpy_tinoco.zeros((order-1, 1)), 1.))
@@ -44,13 +71,54 @@ def ntf_fir_from_digested(Qs, A, C, H_inf, **opts):
     M2 = M1*B
     M = cvxpy_tinoco.vstack((
         cvxpy_tinoco.hstack((M1*A-X, M2, C.T)),
-        cvxpy_tinoco.hstack((M2.T, B.T*X*B-H_inf**2, D)),
+        cvxpy_tinoco.hstack((M2.T, B.T*X*B-H_inf2, D)),
         cvxpy_tinoco.hstack((C, D, -1))
         ))
     constraint1 = cvxpy_tinoco.belongs(-M, cvxpy_tinoco.semidefinite_cone)
     constraint2 = cvxpy_tinoco.belongs(X, cvxpy_tinoco.semidefinite_cone)
     p = cvxpy_tinoco.program(cvxpy_tinoco.minimize(target),
                              [constraint1, constraint2])
-    p.options.update(opts["tinoco_opts"])
-    p.solve(quiet)
-    return np.hstack((1, np.asarray(br.value.T)[0]))
+    p.compile()
+    return (p, p.options.copy(), br, Qs, H_inf2, threading.Lock())
+
+
+def ntf_fir_from_digested(Qs, A, C, H_inf, **opts):
+    """
+    Synthesize FIR NTF from predigested specification
+
+    Version for the cvxpy_tinoco modeler.
+
+    Timings and solver statistics are stored in the ``stats`` dictionary
+    option, when provided.
+
+    The program is compiled once for each order and state space
+    structure and reused in subsequent calls. Calls sharing a program
+    from different threads are serialized.
+    """
+    t0 = timer()
+    quiet = not opts['show_progress']
+    order = np.size(Qs, 0)-1
+    A = np.asarray(A, dtype=float)
+    C = np.asarray(C, dtype=float)
+    p, defaults, br, Qs_p, H_inf2_p, lock = _get_program(order, A, C)
+    with lock:
+        Qs_p.value = cvxpy_tinoco.matrix(Qs)
+        H_inf2_p.value = float(H_inf)**2
+        p.options = defaults.copy()
+        p.options.update(opts["tinoco_opts"])
+        p.solve(quiet)
+        _fill_stats(opts.get('stats', {}), p, timer()-t0)
+        return np.hstack((1, np.asarray(br.value.T)[0]))
+
+
+def _fill_stats(stats, p, elapsed):
+    """
+    Fill design statistics from a solved cvxpy_tinoco program
+    """
+    stats['solver'] = p.timing['solver']
+    stats['kkt'] = p.timing.get('kkt')
+    stats['modeling'] = elapsed-p.timing['solver']
+    stats['iterations'] = p.info['iterations']
+    stats['primal_residual'] = p.info['primal infeasibility']
+    stats['dual_residual'] = p.info['dual infeasibility']
+    stats['status'] = p.info['status']
@@ -55,9 +55,11 @@ Utility modules
    :maxdepth: 1
 
    pydsm.correlations
+   pydsm.decimation
    pydsm.ft
    pydsm.ir
    pydsm.relab
+   pydsm.tf
    pydsm.utilities
 
 
@@ -76,15 +78,22 @@ Error handling
 # Read version info
 from ._version import __version__
 
-# Promote some key functions to the pydsm namespace
-from . import delsig
-from . import NTFdesign
-from . import simulation
-from . import audio_weightings
-from . import iso226
+# Promote some key modules to the pydsm namespace. They are loaded on first
+# access, so that short lived processes only pay for what they use.
+from ._lazy import lazy_attributes, lazy_tester
 
-from . import tests as test_suite
+_lazy = {'delsig': ('.delsig', None),
+         'NTFdesign': ('.NTFdesign', None),
+         'simulation': ('.simulation', None),
+         'audio_weightings': ('.audio_weightings', None),
+         'iso226': ('.iso226', None),
+         'test_suite': ('.tests', None)}
 
-from numpy.testing import Tester
-test = Tester().test
-bench = Tester().bench
+# Utility modules
+_lazy.update((m, ('.'+m, None))
+             for m in ['correlations', 'decimation', 'exceptions', 'ft', 'ir',
+                       'relab', 'tf', 'utilities'])
+
+__getattr__, __dir__ = lazy_attributes(__name__, _lazy, globals())
+
+test = lazy_tester(__path__[0])
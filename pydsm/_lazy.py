@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Lazy loading of modules and attributes (private)
+
+Importing SciPy subpackages and matplotlib is slow. Modules that only
+occasionally need them access them through a :func:`lazy_module` proxy,
+and packages promote the names of their submodules through
+:func:`lazy_attributes`, relying on the module level ``__getattr__``
+hook of PEP 562.
+"""
+
+import sys
+import importlib
+
+__all__ = ["lazy_module", "lazy_attributes", "lazy_tester"]
+
+
+class _LazyModule(object):
+    """Proxy importing a module at the first attribute access."""
+
+    def __init__(self, name):
+        self.__dict__['_lazy_name'] = name
+
+    def __getattr__(self, attr):
+        name = self.__dict__['_lazy_name']
+        module = importlib.import_module(name)
+        try:
+            return getattr(module, attr)
+        except AttributeError:
+            # Subpackages that the parent does not import by itself
+            try:
+                return importlib.import_module(name + '.' + attr)
+            except ImportError:
+                raise AttributeError("module '{}' has no attribute '{}'".
+                                     format(name, attr))
+
+    def __repr__(self):
+        return "<lazy module '{}'>".format(self.__dict__['_lazy_name'])
+
+
+def lazy_module(name):
+    """Return a proxy for module name, imported on first use.
+
+    Attributes of the proxy are looked up in the module. If the module
+    lacks them, they are looked up as its subpackages, so that
+    ``lazy_module('scipy').signal`` works on any SciPy version.
+    """
+    return _LazyModule(name)
+
+
+def lazy_attributes(package, attributes, namespace):
+    """Make the attributes of a package load lazily.
+
+    Parameters
+    ----------
+    package : str
+        name of the package
+    attributes : dict
+        maps each attribute name to a couple ``(module, name)``, the
+        attribute being ``name`` in ``module`` (relative to package). If
+        ``name`` is None, the attribute is the module itself.
+    namespace : dict
+        the package namespace, where attributes are stored once loaded.
+
+    Returns
+    -------
+    getattr, dir : callables
+        functions to be installed as the ``__getattr__`` and ``__dir__``
+        of the package.
+
+    Notes
+    -----
+    On Python versions lacking PEP 562, all the attributes are loaded
+    immediately.
+    """
+    def __getattr__(attr):
+        try:
+            module, name = attributes[attr]
+        except KeyError:
+            raise AttributeError("module '{}' has no attribute '{}'".
+                                 format(package, attr))
+        value = importlib.import_module(module, package)
+        if name is not None:
+            value = getattr(value, name)
+        namespace[attr] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(attributes))
+
+    if sys.version_info < (3, 7):
+        for attr in attributes:
+            __getattr__(attr)
+    return __getattr__, __dir__
+
+
+def lazy_tester(path):
+    """Return a test runner for the package at path.
+
+    The runner behaves as the ``test`` method of
+    :class:`numpy.testing.Tester`, which is only imported when the tests are
+    actually run.
+    """
+    def test(*args, **kwargs):
+        from numpy.testing import Tester
+        return Tester(path).test(*args, **kwargs)
+    return test
@@ -18,6 +18,8 @@
 # You should have received a copy of the GNU General Public License
 # along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
 
-from pkg_resources import resource_string
+import os.path
 
-__version__ = resource_string(__name__, 'RELEASE-VERSION').strip()
+with open(os.path.join(os.path.dirname(__file__), 'RELEASE-VERSION'),
+          'rb') as _f:
+    __version__ = _f.read().strip()
@@ -169,7 +169,8 @@ f_zpk = (2*np.pi*np.asarray([0., 0., 0.,
 # numerator and the denominator take very large values (in magnitude). Taking
 # the ratio of large complex values may lead to overflow in numpy even if
 # individually the numerator, the denominator and the result should not
-# overflow.
+# overflow. pydsm.delsig.evalTF takes care of this, evaluating high order zpk
+# transfer functions as a cascade of rescaled zero/pole ratios.
 
 
 def a_weighting(f, normal=True, power=True):
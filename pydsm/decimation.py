@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Streaming decimation filters (:mod:`pydsm.decimation`)
+======================================================
+
+Multi-stage decimators to bring the output of a ΔΣ modulator down to
+(a small multiple of) its baseband rate while it is being produced.
+
+All the decimators are *stateful*: the signal is fed to them one chunk at
+a time through their ``update`` method, and chunks can have any length.
+Feeding a sequence in one go or in chunks gives the same output. This
+makes it possible to analyze very long bitstreams, coming from a
+modulator simulated chunk by chunk or from a memory mapped file, without
+ever holding them in memory at the full rate.
+
+.. currentmodule:: pydsm.decimation
+
+Classes
+-------
+
+.. autosummary::
+   :toctree: generated/
+
+    CICDecimator   -- cascaded integrator comb decimator for integer streams
+    FIRDecimator   -- polyphase FIR decimator
+    DecimationChain  -- cascade of decimation stages
+
+Functions
+---------
+
+.. autosummary::
+   :toctree: generated/
+
+    halfband_fir  -- equiripple half-band FIR design
+    decimation_chain  -- CIC followed by half-band decimation stages
+"""
+
+import numpy as np
+from ._lazy import lazy_module
+sp = lazy_module('scipy')
+
+__all__ = ["CICDecimator", "FIRDecimator", "DecimationChain",
+           "halfband_fir", "decimation_chain"]
+
+
+def _as_channels(x):
+    x = np.asarray(x)
+    if x.ndim == 1:
+        return x[np.newaxis, :], True
+    elif x.ndim == 2:
+        return x, False
+    raise ValueError('chunks must be 1-D or 2-D arrays')
+
+
+class CICDecimator(object):
+    """
+    Cascaded integrator comb (CIC) decimator.
+
+    Works in exact integer arithmetic on integer valued streams, such as
+    the output of a ΔΣ modulator. As in Hogenauer's structure, the
+    integrators are allowed to wrap around: as long as the filter output
+    fits in 64 bits, the result is exact.
+
+    Parameters
+    ----------
+    ratio : int
+        decimation ratio
+    order : int, optional
+        number of integrator and comb sections (defaults to 4)
+    delay : int, optional
+        differential delay of the combs (defaults to 1)
+    normalize : bool, optional
+        if True, divide the output by the filter DC gain and return it
+        as a float array. Otherwise return the raw integer output
+        (defaults to False)
+
+    Attributes
+    ----------
+    gain : int
+        DC gain of the filter, ``(ratio*delay)**order``
+
+    Notes
+    -----
+    The filter output is taken every `ratio` input samples, namely in
+    correspondence of input samples ``ratio-1``, ``2*ratio-1``, etc.
+    A stream of length N thus produces ``N//ratio`` output samples.
+
+    Multiple channels can be processed at once by passing 2-D chunks with
+    one channel per row.
+    """
+    def __init__(self, ratio, order=4, delay=1, normalize=False):
+        self.ratio = int(ratio)
+        self.order = int(order)
+        self.delay = int(delay)
+        if self.ratio < 1 or self.order < 1 or self.delay < 1:
+            raise ValueError('ratio, order and delay must be positive')
+        self.normalize = normalize
+        self.gain = (self.ratio*self.delay)**self.order
+        self.reset()
+
+    def reset(self):
+        """
+        Brings the filter back to its zero initial state.
+        """
+        self._phase = 0
+        self._integ = None
+        self._combs = None
+
+    def update(self, x):
+        """
+        Filters and decimates a chunk of the input stream.
+
+        Parameters
+        ----------
+        x : array_like
+            next chunk of the input. Must be integer valued, either with an
+            integer or a floating point dtype. Either 1-D or 2-D with one
+            channel per row.
+
+        Returns
+        -------
+        y : ndarray
+            decimated output corresponding to the chunk
+        """
+        x, squeeze = _as_channels(x)
+        if x.dtype.kind == 'f':
+            xi = x.astype(np.int64)
+            if np.any(xi != x):
+                raise ValueError('CIC decimator input must be integer valued')
+        elif x.dtype.kind in 'iub':
+            xi = x.astype(np.int64)
+        else:
+            raise TypeError('CIC decimator input must be integer valued')
+        if self._integ is None:
+            self._integ = np.zeros((x.shape[0], self.order), np.int64)
+            self._combs = np.zeros((self.order, x.shape[0], self.delay),
+                                   np.int64)
+        elif x.shape[0] != self._integ.shape[0]:
+            raise ValueError('number of channels changed between chunks')
+        n = x.shape[1]
+        start = self.ratio-1-self._phase
+        self._phase = (self._phase+n) % self.ratio
+        with np.errstate(over='ignore'):
+            # Integrators, at the full rate, in place on a private copy
+            w = xi
+            for i in range(self.order):
+                if n > 0:
+                    w[:, 0] += self._integ[:, i]
+                    np.add.accumulate(w, axis=1, out=w)
+                    self._integ[:, i] = w[:, -1]
+            # Combs, at the decimated rate
+            w = w[:, start::self.ratio]
+            for i in range(self.order):
+                buf = np.concatenate((self._combs[i], w), axis=1)
+                w = buf[:, self.delay:]-buf[:, :-self.delay]
+                self._combs[i] = buf[:, buf.shape[1]-self.delay:]
+        if self.normalize:
+            w = w/float(self.gain)
+        return w[0] if squeeze else w
+
+
+class FIRDecimator(object):
+    """
+    Polyphase FIR decimator.
+
+    Only the output samples that survive decimation are computed. Zero
+    taps, as in half-band filters, are skipped.
+
+    Parameters
+    ----------
+    h : array_like
+        impulse response of the FIR filter
+    ratio : int, optional
+        decimation ratio (defaults to 2)
+
+    Notes
+    -----
+    The filter output is taken every `ratio` input samples, namely in
+    correspondence of input samples ``ratio-1``, ``2*ratio-1``, etc.
+    A stream of length N thus produces ``N//ratio`` output samples.
+
+    Multiple channels can be processed at once by passing 2-D chunks with
+    one channel per row.
+    """
+    def __init__(self, h, ratio=2):
+        self.h = np.asarray(h, dtype=np.float64).ravel()
+        if len(self.h) == 0:
+            raise ValueError('empty impulse response')
+        self.ratio = int(ratio)
+        if self.ratio < 1:
+            raise ValueError('ratio must be positive')
+        self._taps = np.flatnonzero(self.h)
+        self.reset()
+
+    def reset(self):
+        """
+        Brings the filter back to its zero initial state.
+        """
+        self._phase = 0
+        self._tail = None
+
+    def update(self, x):
+        """
+        Filters and decimates a chunk of the input stream.
+
+        Parameters
+        ----------
+        x : array_like
+            next chunk of the input. Either 1-D or 2-D with one channel
+            per row.
+
+        Returns
+        -------
+        y : ndarray
+            decimated output corresponding to the chunk
+        """
+        x, squeeze = _as_channels(x)
+        ll = len(self.h)
+        if self._tail is None:
+            self._tail = np.zeros((x.shape[0], ll-1))
+        elif x.shape[0] != self._tail.shape[0]:
+            raise ValueError('number of channels changed between chunks')
+        buf = np.concatenate((self._tail, x), axis=1)
+        n = x.shape[1]
+        # buf[:, j] is the input sample at time j-(ll-1) relative to the
+        # first sample in the chunk
+        start = ll-1+self.ratio-1-self._phase
+        nout = max(0, (buf.shape[1]-start+self.ratio-1)//self.ratio)
+        stop = start+self.ratio*nout
+        y = np.zeros((x.shape[0], nout))
+        for k in self._taps:
+            y += self.h[k]*buf[:, start-k:stop-k:self.ratio]
+        self._tail = buf[:, buf.shape[1]-(ll-1):].copy()
+        self._phase = (self._phase+n) % self.ratio
+        return y[0] if squeeze else y
+
+
+class DecimationChain(object):
+    """
+    Cascade of decimation stages.
+
+    Parameters
+    ----------
+    stages : sequence
+        decimation stages, such as :class:`CICDecimator` or
+        :class:`FIRDecimator` objects, in processing order
+
+    Attributes
+    ----------
+    ratio : int
+        overall decimation ratio
+
+    Examples
+    --------
+    Baseband output of a modulator with OSR 256, simulated in chunks
+    and decimated on the fly to 4 times the signal bandwidth:
+
+    >>> import numpy as np
+    >>> from pydsm.delsig import synthesizeNTF, simulateDSM
+    >>> from pydsm.decimation import decimation_chain
+    >>> ntf = synthesizeNTF(5, 256, 1)
+    >>> dec = decimation_chain(128)
+    >>> xn = 0
+    >>> yy = []
+    >>> for k in range(8):
+    ...     t = np.arange(k*65536, (k+1)*65536)
+    ...     u = 0.5*np.sin(2*np.pi*t*5./65536)
+    ...     v, xn, _, _ = simulateDSM(u, ntf, x0=xn)
+    ...     yy.append(dec.update(v))
+    >>> y = np.concatenate(yy)
+    >>> len(y)
+    4096
+
+    A bitstream stored on disk can be processed in the same way with
+    :meth:`apply`, e.g. ``dec.apply(np.load(fname, mmap_mode='r'))``.
+    """
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self.ratio = int(np.prod([s.ratio for s in self.stages]))
+
+    def reset(self):
+        """
+        Brings all the stages back to their zero initial state.
+        """
+        for s in self.stages:
+            s.reset()
+
+    def update(self, x):
+        """
+        Processes a chunk of the input stream through all the stages.
+
+        Parameters
+        ----------
+        x : array_like
+            next chunk of the input. Either 1-D or 2-D with one channel
+            per row.
+
+        Returns
+        -------
+        y : ndarray
+            decimated output corresponding to the chunk
+        """
+        for s in self.stages:
+            x = s.update(x)
+        return x
+
+    def apply(self, x, chunksize=1048576):
+        """
+        Processes a whole stream, one chunk at a time.
+
+        Parameters
+        ----------
+        x : array_like or iterable
+            the stream. If an array (possibly a :class:`numpy.memmap`), it
+            is read in chunks of `chunksize` samples along its last axis.
+            Otherwise, it is taken to be an iterable of chunks.
+        chunksize : int, optional
+            number of input samples processed at once when `x` is an array
+            (defaults to 1048576)
+
+        Returns
+        -------
+        y : ndarray
+            the decimated stream
+
+        Notes
+        -----
+        The state of the filters is retained, so that :meth:`apply` can
+        be used to continue a stream. Use :meth:`reset` to start anew.
+        """
+        if isinstance(x, np.ndarray):
+            chunks = (x[..., k:k+chunksize]
+                      for k in range(0, x.shape[-1], chunksize))
+        else:
+            chunks = x
+        return np.concatenate([self.update(c) for c in chunks], axis=-1)
+
+
+def halfband_fir(ntaps=31, fpass=0.125):
+    """
+    Designs an equiripple half-band FIR filter.
+
+    Half-band filters have every other tap (except the central one) equal
+    to zero and are thus particularly cheap for decimation by 2. The
+    design uses the Vaidyanathan-Nguyen trick of deriving the filter from
+    a one-band filter of half the length designed with the Remez exchange
+    algorithm.
+
+    Parameters
+    ----------
+    ntaps : int, optional
+        number of taps. Must be of the form 4*K-1 (defaults to 31)
+    fpass : real, optional
+        passband edge, normalized to the sample frequency. Must be in
+        (0, 0.25). The stopband edge is at ``0.5-fpass`` (defaults to
+        0.125)
+
+    Returns
+    -------
+    h : ndarray
+        impulse response of the filter
+    """
+    if ntaps < 3 or (ntaps+1) % 4 != 0:
+        raise ValueError('ntaps must be of the form 4*K-1')
+    if not 0 < fpass < 0.25:
+        raise ValueError('fpass must be in (0, 0.25)')
+    nk = (ntaps+1)//2
+    g = sp.signal.remez(nk, [0, 2*fpass, 0.5, 0.5], [1, 0])
+    h = np.zeros(ntaps)
+    h[0::2] = g/2
+    h[nk-1] = 0.5
+    return h
+
+
+def decimation_chain(ratio, n_halfbands=3, cic_order=5, ntaps=31,
+                     fpass=0.125):
+    """
+    Builds a CIC + half-band decimation chain.
+
+    The first stage is a normalized :class:`CICDecimator` decimating by
+    ``ratio/2**n_halfbands``, followed by `n_halfbands` half-band
+    :class:`FIRDecimator` stages decimating by 2 each.
+
+    Parameters
+    ----------
+    ratio : int
+        overall decimation ratio. Must be a multiple of ``2**n_halfbands``
+    n_halfbands : int, optional
+        number of half-band stages (defaults to 3)
+    cic_order : int, optional
+        order of the CIC stage. Should exceed the order of the modulator
+        for the CIC to suppress the shaped noise (defaults to 5)
+    ntaps : int, optional
+        taps in the half-band filters, of the form 4*K-1 (defaults to 31)
+    fpass : real, optional
+        passband edge of the half-band filters, normalized to their input
+        rate (defaults to 0.125)
+
+    Returns
+    -------
+    chain : DecimationChain
+        the decimator
+
+    Notes
+    -----
+    With the default `fpass`, the band from zero to 1/4 of the output
+    rate is protected from aliasing. To analyze the signal band of a
+    lowpass modulator with oversampling ratio `osr`, take `ratio` equal
+    to ``osr/2``.
+    """
+    nhb = 2**int(n_halfbands)
+    if ratio % nhb != 0:
+        raise ValueError('ratio must be a multiple of 2**n_halfbands')
+    stages = []
+    if ratio//nhb > 1:
+        stages.append(CICDecimator(ratio//nhb, cic_order, normalize=True))
+    h = halfband_fir(ntaps, fpass)
+    stages.extend([FIRDecimator(h, 2) for i in range(int(n_halfbands))])
+    return DecimationChain(stages)
@@ -61,9 +61,14 @@ Key functions
    :toctree: generated/
 
    synthesizeNTF
+   synthesizeNTF_many
    clans
    synthesizeChebyshevNTF
    simulateDSM
+   simulateDSM_many
+   simulateQDSM
+   simulateSNR
+   maxStableAmplitude
 
 Other selected functions
 ------------------------
@@ -75,7 +80,12 @@ Delta sigma utilities
    :toctree: generated/
 
    partitionABCD
+   mapQtoR
    rmsGain
+   calculateSNR
+   peakSNR
+   dynamicRange
+   compareSimulationPrecision
 
 General utilities
 .................
@@ -108,8 +118,10 @@ Plumbing
    :toctree: generated/
 
    ds_synNTFobj1
+   ds_synNTFobj1_grad
    ds_f1f2
    ds_optzeros
+   ds_qquantize
    dsclansNTF
    padl
    padr
@@ -122,22 +134,34 @@ Plumbing
 __delsig_version__ = "7.4"
 
 # The delsig module reflects the flat organization of the original DELSIG
-from ._axisLabels import *
 from ._decibel import *
 from ._ds import *
 from ._padding import *
 from ._tf import *
-from ._plot import *
 from ._synthesizeNTF import *
 from ._synthesizeChebyshevNTF import *
 from ._clans import *
 from ._dsclansNTF import *
 from ._simulateDSM import *
 from ._simulateDSM_scipy import *
+from ._simulateQDSM import *
+from ._simulateQDSM_scipy import *
+from ._simulateSNR import *
+from ._maxStableAmplitude import *
 from ._partitionABCD import *
+from ._mapQtoR import *
 from ._rmsGain import *
 from ._rms import *
 
-from numpy.testing import Tester
-test = Tester().test
-bench = Tester().bench
+# Graphing functions need matplotlib, that is only loaded on first access
+from .._lazy import lazy_attributes, lazy_tester
+
+_lazy = {'axisLabels': ('._axisLabels', 'axisLabels'),
+         'plotPZ': ('._plot', 'plotPZ')}
+
+__all__ = sorted([n for n in globals() if not n.startswith('_') and
+                  n not in ('lazy_attributes', 'lazy_tester')] + list(_lazy))
+
+__getattr__, __dir__ = lazy_attributes(__name__, _lazy, globals())
+
+test = lazy_tester(__path__[0])
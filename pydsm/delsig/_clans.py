@@ -58,7 +58,8 @@ Analog Integrated Circuits and Signal Processing Vol. 3 pp 259-272 (1993)
 """
 
 import numpy as np
-from scipy.optimize import minimize
+from .._lazy import lazy_module
+sp = lazy_module('scipy')
 from ._synthesizeNTF import synthesizeNTF
 from ..relab import cplxpair
 from ._tf import evalTF
@@ -109,7 +110,8 @@ def clans(order=4, osr=64, nq=5, rmax=0.95, opt=0, **options):
             (defaults to 1e-6)
         ``eps``
             Step size used for numerical approximation of the jacobian
-            (defaults to 1.4901161193847656e-08)
+            (defaults to 1.4901161193847656e-08). Currently unused, since
+            exact jacobians are passed to the optimizer.
 
         Do not use other options since they could break the minimizer in
         unexpected ways. Defaults can
@@ -141,7 +143,10 @@ def clans(order=4, osr=64, nq=5, rmax=0.95, opt=0, **options):
     The computation is based on a nonlinear, nonlinearly constrained
     optimization. Since the optimizer used here is different from the
     optimizer used in other toolboxes implementing this function,
-    the results may differ. The current optimizer is ``SLSQP``.
+    the results may differ. The current optimizer is ``SLSQP``. The
+    objective and constraint functions, together with their exact
+    jacobians, are computed directly from the NTF denominator
+    coefficients, without finding the NTF poles.
 
     The function internally calls ``synthesizeNTF``, and rises the same
     exceptions as ``synthesizeNTF``.
@@ -199,12 +204,13 @@ def clans(order=4, osr=64, nq=5, rmax=0.95, opt=0, **options):
         x[i+1] = np.sqrt(wn)
 
     # Run the optimizer
-    x = minimize(_dsclansObj6a, x, args=(order, osr, nq, rmax, Hz),
-                 method='SLSQP',
-                 constraints={'type': 'ineq',
-                              'fun': _dsclansObj6b,
-                              'args': (order, osr, nq, rmax, Hz)},
-                 options=slsqp_opts)['x']
+    prob = _ClansProblem(order, osr, nq, rmax, Hz)
+    x = sp.optimize.minimize(prob.obj, x, jac=prob.obj_jac,
+                             method='SLSQP',
+                             constraints={'type': 'ineq',
+                                          'fun': prob.cons,
+                                          'jac': prob.cons_jac},
+                             options=slsqp_opts)['x']
     return dsclansNTF(x, order, rmax, Hz)
 
 clans.default_options = {'show_progress': False,
@@ -229,3 +235,127 @@ def _dsclansObj6b(x, order, osr, nq, rmax, Hz):
     g = np.sum(np.abs(impulse_response(H, m=100)))-1-nq
     # With our optimizer, this needs to be inverted
     return -g
+
+
+class _ClansProblem(object):
+    """
+    Objective and constraint functions for clans, with exact jacobians.
+
+    Each couple of entries in x (and the first entry, if the order is odd)
+    defines a section of the NTF denominator. Since the bilinear transform
+    maps s**2+2*zeta*wn*s+wn**2 into a second order polynomial in z with
+    coefficients that are rational functions of zeta and wn, the
+    denominator coefficients and their derivatives with respect to x are
+    obtained without finding any root. The impulse response is then
+    obtained with a single call to lfilter and its derivatives with
+    another single, vectorized call to lfilter. Computations are cached,
+    so that the objective, the constraint and their jacobians evaluated at
+    the same x share the same work.
+    """
+    def __init__(self, order, osr, nq, rmax, Hz, m=100):
+        self.order = order
+        self.nq = nq
+        self.rmax = rmax
+        self.m = m
+        self.b = np.poly(Hz).real
+        self.zi = np.exp(-1j*np.pi/osr)**np.arange(3)
+        # Numerator gain at the band edge, in zpk form, since the
+        # expanded polynomial cancels badly with zeros close to z=1
+        self.bval = np.prod(np.abs(np.exp(1j*np.pi/osr)-np.asarray(Hz)))
+        self.ins = np.zeros(m)
+        self.ins[0] = 1.
+        self.x = None
+        self.grad = False
+
+    def _update(self, x, grad):
+        x = np.asarray(x, dtype=float)
+        if self.x is not None and np.array_equal(x, self.x):
+            if self.grad or not grad:
+                return
+        else:
+            self._values(x)
+        if grad:
+            self._gradients()
+
+    def _values(self, x):
+        self.x = x.copy()
+        self.grad = False
+        order = self.order
+        rmax = self.rmax
+        odd = order % 2
+        # Denominator sections (in 1/z) and their derivatives wrt to x
+        nsec = (order+1)//2
+        sec = np.zeros((nsec, 3))
+        dsec = np.zeros((order, 3))
+        sec[:, 0] = 1.
+        if odd:
+            x2 = x[0]**2
+            sec[0, 1] = -rmax*(1-x2)/(1+x2)
+            dsec[0, 1] = 4*rmax*x[0]/(1+x2)**2
+        zeta = x[odd::2]**2
+        wn = x[odd+1::2]**2
+        a0 = 1+2*zeta*wn+wn**2
+        a1 = 2*(wn**2-1)
+        a2 = 1-2*zeta*wn+wn**2
+        sec[odd:, 1] = rmax*a1/a0
+        sec[odd:, 2] = rmax**2*a2/a0
+        da0_dz = 2*wn
+        da0_dw = 2*zeta+2*wn
+        a02 = a0**2
+        dsec[odd::2, 1] = -rmax*a1*da0_dz/a02*2*x[odd::2]
+        dsec[odd::2, 2] = rmax**2*(-2*wn*a0-a2*da0_dz)/a02*2*x[odd::2]
+        dsec[odd+1::2, 1] = (rmax*(4*wn*a0-a1*da0_dw)/a02 *
+                             2*x[odd+1::2])
+        dsec[odd+1::2, 2] = (rmax**2*((2*wn-2*zeta)*a0-a2*da0_dw)/a02 *
+                             2*x[odd+1::2])
+        self.sec = sec
+        self.dsec = dsec
+        self.secidx = np.concatenate((np.zeros(odd, dtype=int),
+                                      np.repeat(np.arange(odd, nsec), 2)))
+        a = np.ones(1)
+        for s in sec:
+            a = np.convolve(a, s)
+        self.a = a[:order+1]
+        # Band edge gain
+        self.dval = np.dot(sec, self.zi)
+        self.f = self.bval/np.prod(np.abs(self.dval))
+        # Impulse response
+        self.h = sp.signal.lfilter(self.b, self.a, self.ins)
+        self.g = np.sum(np.abs(self.h))-1-self.nq
+
+    def _gradients(self):
+        self.grad = True
+        # d|H|/dx_i = -|H| Re(dD_j/D_j) at the band edge
+        ddval = np.dot(self.dsec, self.zi)
+        self.df = -self.f*np.real(ddval/self.dval[self.secidx])
+        # Derivative of A*h = B*delta: A*dh = -dA*h, with dA = dD_j*A/D_j,
+        # so that dh = -filter(dD_j, D_j, h). All sections together:
+        # dh = -filter(1, A, dA*h), with a single vectorized lfilter.
+        u = np.zeros((self.order, self.m))
+        for i in range(self.order):
+            j = self.secidx[i]
+            rest = np.ones(1)
+            for k, s in enumerate(self.sec):
+                if k != j:
+                    rest = np.convolve(rest, s)
+            da = np.convolve(self.dsec[i], rest)
+            u[i] = np.convolve(da, self.h)[:self.m]
+        dh = -sp.signal.lfilter([1.], self.a, u, axis=1)
+        self.dg = np.dot(dh, np.sign(self.h))
+
+    def obj(self, x):
+        self._update(x, False)
+        return self.f
+
+    def obj_jac(self, x):
+        self._update(x, True)
+        return self.df
+
+    def cons(self, x):
+        self._update(x, False)
+        # With our optimizer, this needs to be inverted
+        return -self.g
+
+    def cons_jac(self, x):
+        self._update(x, True)
+        return -self.dg
@@ -54,26 +54,82 @@ DELSIG helpers routines
 
 import numpy as np
 from math import ceil, sqrt
-from ._padding import padl, padr
-from ._rmsGain import rmsGain
-from ..relab import db
 
-__all__ = ["ds_synNTFobj1", "ds_f1f2", "ds_optzeros"]
+__all__ = ["ds_synNTFobj1", "ds_synNTFobj1_grad", "ds_f1f2",
+           "ds_optzeros"]
 
 
 def ds_synNTFobj1(x, p, osr, f0):
     """
     Objective function for synthesizeNTF.
     """
-    z = np.exp(2j*np.pi*(f0+0.5/osr*x))
-    if f0 > 0:
-        z = padl(z, len(p)/2, np.exp(2j*np.pi*f0))
-    z = np.concatenate((z, z.conj()))
-    if f0 == 0:
-        z = padr(z, len(p), 1)
-    f1, f2 = ds_f1f2(osr, f0)
+    return _ds_synNTFobj1(x, p, osr, f0, False)
+
+
+def ds_synNTFobj1_grad(x, p, osr, f0):
+    """
+    Objective function for synthesizeNTF, with its gradient.
+
+    Same as ``ds_synNTFobj1``, but also returns the analytic gradient of
+    the objective with respect to the normalized zero positions ``x``,
+    as expected by ``scipy.optimize.fmin_l_bfgs_b`` when ``approx_grad``
+    is not set.
+
+    Returns
+    -------
+    f : real
+        the in-band noise gain in dB
+    g : ndarray of reals
+        the gradient of ``f`` with respect to ``x``
+    """
+    return _ds_synNTFobj1(x, p, osr, f0, True)
+
 
-    return db(rmsGain((z, p, 1), f1, f2))
+def _ds_synNTFobj1(x, p, osr, f0, grad):
+    # The zeros are e^{+-j*theta_i}, theta_i = 2*pi*(f0+0.5/osr*x_i),
+    # padded with zeros at the band center. On the unit circle, each
+    # pair of zeros contributes the factor
+    # |e^{jw}-e^{j*theta}|^2 |e^{jw}-e^{-j*theta}|^2 =
+    # (2-2cos(w-theta))(2-2cos(w+theta)) to |H|^2, so that both the
+    # squared magnitude response and its derivatives are products of
+    # real factors, evaluated here on the whole band at once.
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    p = np.asarray(p)
+    f1, f2 = ds_f1f2(osr, f0)
+    N = 100
+    w = np.linspace(2*np.pi*f1, 2*np.pi*f2, N)
+    ejw = np.exp(1j*w)
+    theta = 2*np.pi*(f0+0.5/osr*x)
+    wm = w-theta[:, np.newaxis]
+    wp = w+theta[:, np.newaxis]
+    am = 2-2*np.cos(wm)
+    ap = 2-2*np.cos(wp)
+    fac = am*ap
+    # Fixed part: center zeros and poles
+    if f0 > 0:
+        n_c = len(p)//2-x.size
+        fixed = (np.abs(ejw-np.exp(2j*np.pi*f0)) *
+                 np.abs(ejw-np.exp(-2j*np.pi*f0)))**(2*n_c)
+    else:
+        n_c = len(p)-2*x.size
+        fixed = np.abs(ejw-1)**(2*n_c)
+    fixed /= np.prod(np.abs(ejw-p[:, np.newaxis])**2, axis=0)
+    h2 = fixed*np.prod(fac, axis=0)
+    s = np.sum(h2)
+    f = 10*np.log10(s/N)
+    if not grad:
+        return f
+    # Leave-one-out products of the zero factors, without divisions
+    # (some factors vanish when a zero falls on the frequency grid)
+    lo = np.ones_like(fac)
+    hi = np.ones_like(fac)
+    if x.size > 1:
+        lo[1:] = np.cumprod(fac[:-1], axis=0)
+        hi[:-1] = np.cumprod(fac[:0:-1], axis=0)[::-1]
+    dfac = -2*np.sin(wm)*ap+2*np.sin(wp)*am
+    dh2 = fixed*lo*hi*dfac
+    g = 10/np.log(10)*np.sum(dh2, axis=1)/s*(np.pi/osr)
+    return f, g
 
 
 def ds_f1f2(osr=64, f0=0, complex_flag=False):
@@ -144,9 +200,21 @@ def ds_optzeros(n, opt=1):
 
     .. [1] Richard Schreier, Gabor C. Temes, "Understanding Delta-Sigma Data
        Converters," IEEE Press and Wiley Interscience, 2005.
+
+    Results are cached per (n, opt), so that repeated calls (as in the
+    synthesis of many NTFs) are cheap.
     """
+    key = (int(n), int(opt))
+    if key not in _optzeros_cache:
+        _optzeros_cache[key] = _ds_optzeros(n, opt)
+    return _optzeros_cache[key].copy()
+
+_optzeros_cache = {}
+
+
+def _ds_optzeros(n, opt):
     if opt == 0:
-        optZeros = np.zeros(ceil(n/2.))
+        optZeros = np.zeros(int(ceil(n/2.)))
     else:
         if n == 1:
             optZeros = np.asarray([0.])
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+# This file includes code ported from the DELSIG Matlab toolbox
+# (see http://www.mathworks.com/matlabcentral/fileexchange/19)
+# covered by the following copyright and permission notice
+#
+# Copyright (c) 2009 Richard Schreier
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the distribution
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+
+__all__ = ['mapQtoR']
+
+
+def mapQtoR(ABCD):
+    """Map a quadrature matrix into its real-doubled equivalent
+
+    Each element z of the input matrix is replaced by the 2x2 block
+    [[real(z), -imag(z)], [imag(z), real(z)]].
+
+    Parameters
+    ----------
+    ABCD : matrix like 2D
+        complex matrix, typically the ABCD description of a quadrature
+        modulator
+
+    Returns
+    -------
+    r : ndarray
+        real matrix with twice as many rows and columns
+
+    Notes
+    -----
+    Applied to the ABCD matrix of a quadrature modulator, this gives
+    a real modulator with interleaved in-phase and quadrature states,
+    inputs and quantizers, that can be simulated with
+    :func:`simulateDSM`. Its inputs are the rows real(u[0]), imag(u[0]),
+    real(u[1]), etc. and its outputs are the rows real(v[0]), imag(v[0]),
+    etc. Simulating the quadrature modulator with :func:`simulateQDSM`
+    is normally faster.
+    """
+    ABCD = np.asarray(ABCD)
+    r = np.empty((2*ABCD.shape[0], 2*ABCD.shape[1]))
+    r[0::2, 0::2] = ABCD.real
+    r[0::2, 1::2] = -ABCD.imag
+    r[1::2, 0::2] = ABCD.imag
+    r[1::2, 1::2] = ABCD.real
+    return r
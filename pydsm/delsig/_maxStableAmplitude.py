@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Stability analysis of delta sigma modulators by simulation
+==========================================================
+"""
+
+import numpy as np
+from .._lazy import lazy_module
+from ..utilities import digested_options
+from ._simulateDSM import simulateDSM
+from ._simulateSNR import _single_loop_abcd, _block_diagonal_abcd
+multiprocessing = lazy_module('multiprocessing')
+
+import sys
+if sys.version_info < (3,):
+    range = xrange
+
+__all__ = ["maxStableAmplitude"]
+
+
+def _unstable(args):
+    # Simulate a batch of sine wave probes, as independent channels of a
+    # block diagonal modulator, and tell which ones overload the quantizer
+    ABCD, nlev, N, ylim, sim_opts, f, phi, amp = args
+    nb = len(f)
+    t = np.arange(N)
+    u = amp[:, np.newaxis]*np.sin(2*np.pi*f[:, np.newaxis]*t +
+                                  phi[:, np.newaxis])
+    # Soft start
+    ns = min(50, N)
+    u[:, :ns] *= 0.5*(1-np.cos(np.pi/ns*np.arange(ns)))
+    y = simulateDSM(u, _block_diagonal_abcd(ABCD, nb), [nlev]*nb,
+                    store_y=True, **sim_opts)[3]
+    with np.errstate(invalid='ignore'):
+        return ~(np.max(np.abs(y.reshape(nb, -1)), axis=1) <= ylim)
+
+
+def maxStableAmplitude(arg1, f, nlev=2, N=10000, tol=1E-3, retries=0,
+                       **options):
+    """
+    Maximum stable input amplitude of a ΔΣ modulator, by simulation.
+
+    For each input frequency, the largest amplitude of a sine wave input
+    that does not make the modulator unstable is found by bisection. At
+    each bisection step, the probes for all the frequencies are simulated
+    together.
+
+    Parameters
+    ----------
+    arg1 : tuple or array_like
+        modulator NTF as zpk tuple (in this case the STF is assumed to be
+        unitary) or modulator structure in ABCD matrix form, with a single
+        input and a single quantizer.
+    f : real or array_like
+        normalized frequencies of the input sine waves
+    nlev : int, optional
+        number of levels in the quantizer. Defaults to 2.
+    N : int, optional
+        number of samples simulated for each probe. Defaults to 10000.
+    tol : real, optional
+        tolerance on the amplitudes, relative to the quantizer full scale
+        (nlev-1). Defaults to 1E-3.
+    retries : int, optional
+        number of additional probes, with random initial phases of the
+        input sine wave, that must also be stable for an amplitude to be
+        taken as stable. Defaults to 0, i.e. a single probe with zero
+        initial phase.
+
+    Returns
+    -------
+    amax : real or ndarray
+        maximum stable amplitudes, one per frequency, in absolute units
+        (the quantizer full scale being nlev-1)
+
+    Other Parameters
+    ----------------
+    batch : int, optional
+        number of probes being simulated at once, as independent channels
+        of the same simulation. Defaults to 8.
+    workers : int, optional
+        number of worker processes among which the batches of probes are
+        distributed. Defaults to 1, i.e. no worker processes.
+    ylim : real, optional
+        the modulator is taken to be unstable when the magnitude of the
+        quantizer input exceeds ylim. Defaults to None, meaning nlev+5,
+        namely an overload of 3 quantizer steps.
+    seed : int, optional
+        seed for the generation of the random phases. Defaults to 0.
+    backend : string, optional
+        backend passed to :func:`simulateDSM`. Defaults to None, meaning
+        the :func:`simulateDSM` default.
+
+    Notes
+    -----
+    The state space realization of the modulator is computed only once.
+    The input sine waves start softly over the first 50 samples. The
+    returned amplitude is the largest one that has been verified to be
+    stable, so that it is accurate within `tol` times the full scale.
+
+    Being based on finite length simulations, the result is an upper
+    bound of the true maximum stable amplitude. Increasing `N` and
+    `retries` makes it more reliable. Furthermore, bisection assumes
+    that all the amplitudes below a stable one are also stable, which
+    may not hold exactly close to the stability threshold.
+
+    Default values for the options not directly documented in the function
+    call signature can be checked and updated by changing the function
+    ``default_options`` attribute.
+    """
+    opts = digested_options(options, maxStableAmplitude.default_options,
+                            ['batch', 'workers', 'ylim', 'seed', 'backend'])
+    sim_opts = {}
+    if opts['backend'] is not None:
+        sim_opts['backend'] = opts['backend']
+    ylim = opts['ylim'] if opts['ylim'] is not None else nlev+5.
+    batch = max(int(opts['batch']), 1)
+    workers = max(int(opts['workers']), 1)
+    ABCD = _single_loop_abcd(arg1)
+    f = np.asarray(f, dtype=float)
+    ff = f.ravel()
+    nf = ff.size
+    nr = int(retries)+1
+    rng = np.random.RandomState(opts['seed'])
+    phi = np.zeros((nf, nr))
+    phi[:, 1:] = rng.uniform(0, 2*np.pi, (nf, nr-1))
+    umax = float(nlev-1)
+    lo = np.zeros(nf)
+    hi = np.full(nf, umax)
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    _map = pool.map if pool is not None else map
+
+    def unstable(idx, amp):
+        # Probe amplitudes amp at frequencies ff[idx] with all the phases
+        fi = np.repeat(ff[idx], nr)
+        pi = phi[idx].ravel()
+        ai = np.repeat(amp, nr)
+        jobs = [(ABCD, nlev, N, ylim, sim_opts,
+                 fi[k:k+batch], pi[k:k+batch], ai[k:k+batch])
+                for k in range(0, fi.size, batch)]
+        res = np.concatenate(list(_map(_unstable, jobs)))
+        return np.any(res.reshape(-1, nr), axis=1)
+
+    try:
+        # Try the full scale first
+        idx = np.arange(nf)
+        ok = ~unstable(idx, hi)
+        lo[ok] = umax
+        while True:
+            idx = np.flatnonzero(hi-lo > tol*umax)
+            if idx.size == 0:
+                break
+            mid = 0.5*(lo[idx]+hi[idx])
+            bad = unstable(idx, mid)
+            hi[idx[bad]] = mid[bad]
+            lo[idx[~bad]] = mid[~bad]
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return lo.reshape(f.shape)[()]
+
+maxStableAmplitude.default_options = {'batch': 8, 'workers': 1,
+                                      'ylim': None, 'seed': 0,
+                                      'backend': None}
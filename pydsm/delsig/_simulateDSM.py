@@ -23,7 +23,9 @@ Entry point for DELSIG-like Delta-Sigma modulator simulator
 ===========================================================
 """
 
+import numpy as np
 from ._simulateDSM_scipy import simulateDSM as _simulateDSM_scipy
+from ._simulateDSM_scipy import _ntf_abcd
 try:
     from ._simulateDSM_cblas import simulateDSM as _simulateDSM_cblas
     HAS_CBLAS = True
@@ -31,13 +33,17 @@ except:
     HAS_CBLAS = False
 from ._simulateDSM_scipy_blas import simulateDSM as _simulateDSM_scipy_blas
 from ..utilities import digested_options
+from ..tf import TF
+from .._lazy import lazy_module
+futures = lazy_module('concurrent.futures')
+multiprocessing = lazy_module('multiprocessing')
 
-__all__ = ["simulateDSM"]
+__all__ = ["simulateDSM", "simulateDSM_many"]
 
 
 def simulateDSM(u, arg2, nlev=2, x0=0,
                 store_xn=False, store_xmax=False, store_y=False,
-                **options):
+                out_v=None, out_y=None, out_xn=None, **options):
     """
     Computes the output of a general delta-sigma modulator.
 
@@ -45,11 +51,14 @@ def simulateDSM(u, arg2, nlev=2, x0=0,
     ----------
     u : array_like or matrix_like
         modulator input. Multiple inputs are allowed. In this case,
-        u is a matrix with as many rows as the desired inputs
+        u is a matrix with as many rows as the desired inputs. Real
+        arrays of any dtype and strides, including memmaps, are used
+        without a full copy.
     arg2 : tuple
         modulator structure in ABDC matrix form or modulator NTF
-        as zpk tuple. In the latter case, the modulator STF is assumed
-        to be unitary.
+        as zpk tuple or :class:`pydsm.tf.TF`. In the latter cases, the
+        modulator STF is assumed to be unitary. The modulator realization
+        of a TF is computed once and cached with it.
     nlev : int or array of ints, optional
         number of levels in quantizer. Multiple quantizers can be
         specified by making nlev a vector. Defaults to 2.
@@ -65,6 +74,17 @@ def simulateDSM(u, arg2, nlev=2, x0=0,
     store_y : bool, optional
         switch controlling the storage of input quantizer values.
         See description of return values. Defaults to False.
+    out_v : ndarray, optional
+        array where the modulator output is stored, with shape
+        (nq, N), or (N,) with a single quantizer. It can have any dtype
+        and strides and it can be a memmap. If given, it is returned in
+        place of v. Defaults to None, allocating a new array.
+    out_y : ndarray, optional
+        as out_v, for the quantizer input. Implies store_y. Defaults to
+        None.
+    out_xn : ndarray, optional
+        as out_v, for the state evolution, with shape (order, N).
+        Implies store_xn. Defaults to None.
 
     Returns
     -------
@@ -98,6 +118,10 @@ def simulateDSM(u, arg2, nlev=2, x0=0,
         simulator; 'cblas' for simulator using platform cblas library;
         'scipy_blas' for simulator using scipy provided blas. Defaults can
         be set by changing the function ``default_options`` attribute.
+    dtype : dtype
+        simulation precision, either float64 or float32. The outputs
+        allocated by the simulator have this dtype. Defaults can be set by
+        changing the function ``default_options`` attribute.
 
     Raises
     ------
@@ -114,6 +138,12 @@ def simulateDSM(u, arg2, nlev=2, x0=0,
         'Incorrect initial condition specification' if the initial condition
         specification for the modulator filters is incorrect.
 
+        'Invalid argument: out_v must be a writeable array of shape ...',
+        and the like, if an output array is unsuitable.
+
+        'Invalid argument: dtype must be float32 or float64' if an
+        unsupported simulation precision is required.
+
     RuntimeError
         'Unsupported simulator backend xxx' if an unsupported backend is
         required
@@ -137,6 +167,20 @@ def simulateDSM(u, arg2, nlev=2, x0=0,
 
     Setting store_xn, store_xmax and store_y to False speeds up the operation.
 
+    When the input or the output arrays are not C ordered float64 arrays,
+    the fast simulators go through them in blocks of a few thousand
+    samples, so that no full size temporary copy is ever made. Thus, very
+    long runs can read the input from and write the bitstream to
+    memory mapped files (see ``numpy.memmap`` and ``numpy.load`` with
+    ``mmap_mode``), with a peak memory use independent of their length.
+
+    Single precision simulation halves the memory traffic and makes the
+    fast simulators use single precision BLAS. It is only safe for well
+    scaled modulators, since the rounding errors on the state can make
+    the bitstream diverge from the double precision one. Use
+    :func:`compareSimulationPrecision` to check a design before relying
+    on it.
+
     There are actually two simulators, sharing this function as a front end.
     One of them is coded in pure python and quite slow. The other one is
     coded in C (actually in Cython), and directly accesses low level cblas
@@ -145,7 +189,7 @@ def simulateDSM(u, arg2, nlev=2, x0=0,
     """
     # Manage options
     opts = digested_options(options, simulateDSM.default_options,
-                            ['backend'])
+                            ['backend', 'dtype'])
     backend = opts["backend"]
     if backend == 'auto':
         simulator = _simulateDSM_scipy_blas
@@ -157,6 +201,95 @@ def simulateDSM(u, arg2, nlev=2, x0=0,
         simulator = _simulateDSM_cblas
     else:
         raise RuntimeError('Unsupported simulator backend %s' % backend)
-    return simulator(u, arg2, nlev, x0, store_xn, store_xmax, store_y)
+    if isinstance(arg2, TF):
+        ntf = arg2
+        arg2 = ntf.cached('simulateDSM_abcd',
+                          lambda: _ntf_abcd(ntf[0], ntf[1]))
+    return simulator(u, arg2, nlev, x0, store_xn, store_xmax, store_y,
+                     out_v, out_y, out_xn, opts['dtype'])
+
+simulateDSM.default_options = {'backend': 'auto', 'dtype': np.float64}
+
+
+def simulateDSM_many(uu, arg2, nlev=2, x0=0,
+                     store_xn=False, store_xmax=False, store_y=False,
+                     **options):
+    """
+    Computes the outputs of a delta-sigma modulator for many inputs.
+
+    This is the batch version of :func:`simulateDSM`. The simulations are
+    independent and run concurrently on a pool of threads.
+
+    Parameters
+    ----------
+    uu : sequence of array_like
+        modulator inputs, one per simulation. Each of them is as the u
+        argument of :func:`simulateDSM`.
+    arg2 : tuple
+        modulator structure in ABDC matrix form or modulator NTF
+        as zpk tuple, shared by all the simulations.
+    nlev : int or array of ints, optional
+        number of levels in quantizer. Defaults to 2.
+    x0 : array_like of reals or 0
+        modulator initial state vector, shared by all the simulations.
+        Defaults to 0.
+    store_xn : bool, optional
+        switch controlling the storage of state evolution.
+        Defaults to False.
+    store_xmax : bool, optional
+        switch controlling the storage of maxima in state variables.
+        Defaults to False.
+    store_y : bool, optional
+        switch controlling the storage of input quantizer values.
+        Defaults to False.
+
+    Returns
+    -------
+    results : list of tuples
+        the (v, xn, xmax, y) tuples returned by :func:`simulateDSM`, one
+        per input, in the same order as uu.
+
+    Other Parameters
+    ----------------
+    backend : string
+        simulator backend, as in :func:`simulateDSM`. Defaults can be set
+        by changing the function ``default_options`` attribute.
+    dtype : dtype
+        simulation precision, as in :func:`simulateDSM`. Defaults can be
+        set by changing the function ``default_options`` attribute.
+    workers : int or None
+        number of threads. If None, the number of processors. Defaults can
+        be set by changing the function ``default_options`` attribute.
+
+    Notes
+    -----
+    The Cython backends release the GIL while running the modulator loop,
+    so that the simulations proceed in parallel on multiple cores, without
+    the pickling and start up costs of a process pool. The pure Python
+    backend holds the GIL and gets no speed up.
+
+    See Also
+    --------
+    simulateDSM : for the meaning of the arguments and of the results.
+    """
+    opts = digested_options(options, simulateDSM_many.default_options,
+                            ['backend', 'dtype', 'workers'])
+    backend = opts['backend']
+    dtype = opts['dtype']
+    workers = opts['workers']
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    uu = list(uu)
+    workers = max(1, min(workers, len(uu)))
+
+    def run(u):
+        return simulateDSM(u, arg2, nlev, x0, store_xn, store_xmax, store_y,
+                           backend=backend, dtype=dtype)
+
+    if workers == 1:
+        return [run(u) for u in uu]
+    with futures.ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(run, uu))
 
-simulateDSM.default_options = {'backend': 'auto'}
+simulateDSM_many.default_options = {'backend': 'auto', 'dtype': np.float64,
+                                    'workers': None}
@@ -18,28 +18,36 @@
 
 # Helper inline functions for cython simulateDSM code
 
-cdef inline double dbl_sat(double x, double a, double b):
+# Samples simulated at once when the input or the outputs need conversion
+cdef int SIM_BLOCK = 8192
+
+# Supported simulation precisions
+ctypedef fused real:
+    float
+    double
+
+cdef inline real real_sat(real x, real a, real b) noexcept nogil:
     return a if x <= a else b if x>=b else x
 
-cdef inline void ds_quantize(int N, double* y, int y_stride, \
-    int* n, int n_stride, \
-    double* v, int v_stride):
+cdef inline void ds_quantize(int N, real* y, int y_stride, \
+    const int* n, int n_stride, \
+    real* v, int v_stride) noexcept nogil:
     """Quantize a signal according to a given number of levels."""
     cdef int qi
-    cdef double L
+    cdef real L
     for qi in range(N):
         if n[qi*n_stride] % 2 == 0:
             v[qi*v_stride] = 2*floor(0.5*y[qi*y_stride])+1
         else:
             v[qi*v_stride] = 2*floor(0.5*(y[qi*y_stride]+1))
         L = n[qi*n_stride]-1
-        v[qi*v_stride]=dbl_sat(v[qi*v_stride],-L,L)
+        v[qi*v_stride]=real_sat(v[qi*v_stride],-L,L)
 
 cdef inline void track_vabsmax(int N,\
-    double* vabsmax, int vabsmax_stride,\
-    double* x, int x_stride):
+    real* vabsmax, int vabsmax_stride,\
+    real* x, int x_stride) noexcept nogil:
     cdef int i
-    cdef double absx
+    cdef real absx
     for i in range(N):
         absx=fabs(x[i*x_stride])
         if absx > vabsmax[i*vabsmax_stride]:
@@ -49,4 +57,9 @@ cdef inline double *dbldata(np.ndarray arr):
     return <double *>np.PyArray_DATA(arr)
 
 cdef inline int *intdata(np.ndarray arr):
-    return <int *>np.PyArray_DATA(arr)
\ No newline at end of file
+    return <int *>np.PyArray_DATA(arr)
+
+cdef inline bint is_carray(np.ndarray arr, int typenum):
+    return (np.PyArray_TYPE(arr) == typenum and
+            np.PyArray_ISNOTSWAPPED(arr) and
+            np.PyArray_IS_C_CONTIGUOUS(arr) and np.PyArray_ISALIGNED(arr))
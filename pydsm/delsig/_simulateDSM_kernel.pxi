@@ -0,0 +1,134 @@
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+# Modulator loop for the cython simulateDSM code, in single and double
+# precision. The including module provides the gemv and copy functions.
+
+cdef void dsm_loop(int N, int ld, int order, int nu, int nq,
+                   const real *A, const real *B1, const real *B2,
+                   const real *C, const real *D1, const int *nlev,
+                   const real *u, real *x0, real *x0_temp, real *y0,
+                   real *v, real *y, real *xn,
+                   real *xmax) noexcept nogil:
+    """Run the modulator for N samples, without the GIL.
+
+    Inputs and outputs are C ordered, with leading dimension ld >= N.
+    The state x0 is updated in place. y, xn and xmax are not stored if
+    NULL.
+    """
+    cdef int i
+    for i in range(N):
+        # Compute y0 = np.dot(C, x0) + np.dot(D1, u[:, i])
+        gemv(nq, order, C, x0, 1, 0, y0)
+        gemv(nq, nu, D1, u+i, ld, 1, y0)
+        if y != NULL:
+            #y[:, i] = y0[:]
+            copy(nq, y0, 1, y+i, ld)
+        ds_quantize(nq, y0, 1, nlev, 1, v+i, ld)
+        # Compute x0 = np.dot(A, x0) +
+        #   np.dot(B, np.vstack((u[:, i], v[:, i])))
+        gemv(order, order, A, x0, 1, 0, x0_temp)
+        gemv(order, nu, B1, u+i, ld, 1, x0_temp)
+        gemv(order, nq, B2, v+i, ld, 1, x0_temp)
+        # x0[:,1] = x0_temp[:,1]
+        copy(order, x0_temp, 1, x0, 1)
+        if xn != NULL:
+            # Save the next state
+            #xn[:, i] = x0
+            copy(order, x0, 1, xn+i, ld)
+        if xmax != NULL:
+            # Keep track of the state maxima
+            # xmax = np.max((np.abs(x0), xmax), 0)
+            track_vabsmax(order, xmax, 1, x0, 1)
+
+cdef run_dsm(const real[:, ::1] A, const real[:, ::1] B1,
+             const real[:, ::1] B2, const real[:, ::1] C,
+             const real[:, ::1] D1, const int[::1] nlev,
+             real[:, ::1] x0, np.ndarray u, np.ndarray v,
+             np.ndarray y, np.ndarray xn, real[:, ::1] xmax):
+    """Simulate the modulator over the arrays prepared by simulateDSM.
+
+    y, xn and xmax are not stored if None. The simulation runs in place
+    if u and the outputs are C ordered arrays of the simulation type,
+    otherwise it goes through block buffers.
+    """
+    cdef int order = A.shape[0]
+    cdef int nu = u.shape[0]
+    cdef int nq = v.shape[0]
+    cdef int N = u.shape[1]
+    dtype = np.float32 if real is float else np.float64
+    cdef int typenum = np.NPY_FLOAT if real is float else np.NPY_DOUBLE
+    cdef real[:, ::1] x0_temp = np.empty((order, 1), dtype=dtype)
+    cdef real[::1] y0 = np.empty(nq, dtype=dtype)
+    cdef const real[:, ::1] mv_u
+    cdef real[:, ::1] mv_v, mv_y, mv_xn
+    cdef real *p_y = NULL
+    cdef real *p_xn = NULL
+    cdef real *p_xmax = NULL
+    cdef int blk, k, n
+    if N == 0:
+        return
+    if xmax is not None:
+        p_xmax = &xmax[0, 0]
+    if (is_carray(u, typenum) and is_carray(v, typenum) and
+            (y is None or is_carray(y, typenum)) and
+            (xn is None or is_carray(xn, typenum))):
+        # Simulate in place
+        mv_u = u
+        mv_v = v
+        if y is not None:
+            mv_y = y
+            p_y = &mv_y[0, 0]
+        if xn is not None:
+            mv_xn = xn
+            p_xn = &mv_xn[0, 0]
+        with nogil:
+            dsm_loop(N, N, order, nu, nq,
+                     &A[0, 0], &B1[0, 0], &B2[0, 0], &C[0, 0], &D1[0, 0],
+                     &nlev[0], &mv_u[0, 0], &x0[0, 0], &x0_temp[0, 0],
+                     &y0[0], &mv_v[0, 0], p_y, p_xn, p_xmax)
+        return
+    # Input or outputs have other dtypes or strides (e.g. they are
+    # memmaps): go through block buffers, so that no full size copy
+    # is ever made
+    blk = min(N, SIM_BLOCK)
+    b_u = np.empty((nu, blk), dtype=dtype)
+    b_v = np.empty((nq, blk), dtype=dtype)
+    mv_u = b_u
+    mv_v = b_v
+    if y is not None:
+        b_y = np.empty((nq, blk), dtype=dtype)
+        mv_y = b_y
+        p_y = &mv_y[0, 0]
+    if xn is not None:
+        b_xn = np.empty((order, blk), dtype=dtype)
+        mv_xn = b_xn
+        p_xn = &mv_xn[0, 0]
+    for k in range(0, N, blk):
+        n = min(blk, N-k)
+        b_u[:, :n] = u[:, k:k+n]
+        with nogil:
+            dsm_loop(n, blk, order, nu, nq,
+                     &A[0, 0], &B1[0, 0], &B2[0, 0], &C[0, 0], &D1[0, 0],
+                     &nlev[0], &mv_u[0, 0], &x0[0, 0], &x0_temp[0, 0],
+                     &y0[0], &mv_v[0, 0], p_y, p_xn, p_xmax)
+        v[:, k:k+n] = b_v[:, :n]
+        if y is not None:
+            y[:, k:k+n] = b_y[:, :n]
+        if xn is not None:
+            xn[:, k:k+n] = b_xn[:, :n]
@@ -53,8 +53,8 @@ Slow simulator for a generic delta sigma modulator
 """
 
 import numpy as np
-from scipy.signal import zpk2ss
-from scipy import linalg
+from .._lazy import lazy_module
+sp = lazy_module('scipy')
 from warnings import warn
 from ..exceptions import PyDsmSlowPathWarning
 
@@ -66,14 +66,69 @@ if sys.version_info < (3,):
 __all__ = ["ds_quantize"]
 
 
+def _out_buffer(out, rows, N, name):
+    """
+    Checks a caller supplied output array and returns a 2D view of it.
+
+    The array can have any dtype and strides, but it must be writeable
+    and have shape (rows, N), or (N,) when rows is 1. None is passed
+    through.
+    """
+    if out is None:
+        return None
+    if (not isinstance(out, np.ndarray) or not out.flags.writeable or
+            (out.shape != (rows, N) and
+             not (rows == 1 and out.shape == (N,)))):
+        raise ValueError('Invalid argument: %s must be a writeable array '
+                         'of shape (%d, %d)' % (name, rows, N))
+    return out.reshape(rows, N)
+
+
+def _ntf_abcd(ntf_z, ntf_p):
+    """
+    ABCD matrix of a single quantizer modulator with given NTF zeros/poles.
+
+    The loop filter is a realization of -1/H, transformed so that
+    C = [1 0 0 ...], and the STF is unitary.
+    """
+    order = len(ntf_z)
+    # Seek a realization of -1/H
+    A, B2, C, D2 = sp.signal.zpk2ss(ntf_p, ntf_z, -1)
+    C = C.real
+    # Transform the realization so that C = [1 0 0 ...]
+    Sinv = (sp.linalg.orth(np.hstack((np.transpose(C), np.eye(order)))) /
+            np.linalg.norm(C))
+    S = sp.linalg.inv(Sinv)
+    C = np.dot(C, Sinv)
+    if C[0, 0] < 0:
+        S = -S
+        Sinv = -Sinv
+    A = np.asarray(S.dot(A).dot(Sinv), dtype=np.float64)
+    B2 = np.asarray(np.dot(S, B2), dtype=np.float64)
+    C = np.hstack(([[1.]], np.zeros((1, order-1))))
+    # C=C*Sinv;
+    # D2 = 0;
+    # !!!! Assume stf=1
+    B1 = -B2
+    return np.vstack((np.hstack((A, B1, B2)),
+                      np.hstack((C, [[1., 0.]]))))
+
+
 def simulateDSM(u, arg2, nlev=2, x0=0,
-                store_xn=False, store_xmax=False, store_y=False):
+                store_xn=False, store_xmax=False, store_y=False,
+                out_v=None, out_y=None, out_xn=None, dtype=np.float64):
 
     warn('Running the slow version of simulateDSM.',
          PyDsmSlowPathWarning)
 
+    # Simulation precision
+    dt = np.dtype(dtype)
+    if dt != np.float32 and dt != np.float64:
+        raise ValueError(
+            "Invalid argument: dtype must be float32 or float64")
+
     # Make sure that nlev is an array
-    nlev = np.asarray(nlev).reshape(1)
+    nlev = np.asarray(nlev).reshape(-1)
 
     # Make sure that input is a matrix
     u = np.asarray(u)
@@ -83,85 +138,74 @@ def simulateDSM(u, arg2, nlev=2, x0=0,
     nu = u.shape[0]
     nq = np.size(nlev)
 
-    if type(arg2) == tuple and len(arg2) == 3:
+    if isinstance(arg2, tuple) and len(arg2) == 3:
         # Assume ntf in zpk form
-        (ntf_z, ntf_p, ntf_k) = arg2
-        form = 2
-        order = len(ntf_z)
+        ABCD = _ntf_abcd(arg2[0], arg2[1])
     else:
         # Assume ABCD form
         ABCD = np.asarray(arg2)
-        if ABCD.shape[1] == nu+ABCD.shape[0]:
-            # ABCD dimensions OK
-            form = 1
-            order = ABCD.shape[0]-nq
-        else:
-            raise ValueError('Incorrect modulator specification')
+    if ABCD.shape[1] == nu+ABCD.shape[0]:
+        # ABCD dimensions OK
+        order = ABCD.shape[0]-nq
+    else:
+        raise ValueError('Incorrect modulator specification')
 
     # Assure that the state is a column vector
     if np.isscalar(x0) and x0 == 0:
-        x0 = np.zeros((order, 1))
+        x0 = np.zeros((order, 1), dtype=dt)
     else:
-        x0 = np.array(x0, dtype=float).reshape(-1, 1)
+        x0 = np.array(x0, dtype=dt).reshape(-1, 1)
 
-    if form == 1:
-        A = ABCD[0:order, 0:order]
-        B = ABCD[0:order, order:order+nu+nq]
-        C = ABCD[order:order+nq, 0:order]
-        D1 = ABCD[order:order+nq, order:order+nu]
-    else:
-        # Seek a realization of -1/H
-        A, B2, C, D2 = zpk2ss(ntf_p, ntf_z, -1)
-        # Transform the realization so that C = [1 0 0 ...]
-        Sinv = (linalg.orth(np.hstack((np.transpose(C), np.eye(order)))) /
-                np.linalg.norm(C))
-        S = linalg.inv(Sinv)
-        C = np.dot(C, Sinv)
-        if C[0, 0] < 0:
-            S = -S
-            Sinv = -Sinv
-        A = np.dot(np.dot(S, A), Sinv)
-        B2 = np.dot(S, B2)
-        C = np.hstack(([[1]], np.zeros((1, order-1))))
-        # C=C*Sinv;
-        # D2 = 0;
-        # !!!! Assume stf=1
-        B1 = -B2
-        D1 = 1
-        B = np.hstack((B1, B2))
+    A = ABCD[0:order, 0:order]
+    B = ABCD[0:order, order:order+nu+nq]
+    C = ABCD[order:order+nq, 0:order]
+    D1 = ABCD[order:order+nq, order:order+nu]
+    A, B, C, D1 = [np.asarray(M, dtype=dt) for M in (A, B, C, D1)]
 
     N = u.shape[1]
-    v = np.empty((nq, N))
+    store_y = store_y or out_y is not None
+    store_xn = store_xn or out_xn is not None
+    v = _out_buffer(out_v, nq, N, 'out_v')
+    if v is None:
+        v = np.empty((nq, N), dtype=dt)
     if store_y:
         # Need to store the quantizer input
-        y = np.empty((nq, N))
+        y = _out_buffer(out_y, nq, N, 'out_y')
+        if y is None:
+            y = np.empty((nq, N), dtype=dt)
     else:
-        y = np.empty((0, 0))
+        y = np.empty((0, 0), dtype=dt)
     if store_xn:
         # Need to store the state information
-        xn = np.empty((order, N))
+        xn = _out_buffer(out_xn, order, N, 'out_xn')
+        if xn is None:
+            xn = np.empty((order, N), dtype=dt)
     if store_xmax:
         # Need to keep track of the state maxima
         xmax = np.abs(x0)
     else:
-        xmax = np.empty(0)
+        xmax = np.empty(0, dtype=dt)
 
     for i in range(N):
+        ui = u[:, i].astype(dt)
         # I guess the coefficients in A, B, C, D should be real...
-        y0 = np.real(np.dot(C, x0) + np.dot(D1, u[:, i]))
+        y0 = np.real(np.dot(C, x0) + np.dot(D1, ui))
         if store_y:
             y[:, i] = y0
         v[:, i] = ds_quantize(y0, nlev)
-        x0 = np.dot(A, x0) + np.dot(B, np.vstack((u[:, i], v[:, i])))
+        x0 = np.dot(A, x0) + np.dot(B, np.vstack((ui, v[:, i])))
         if store_xn:
             # Save the next state
-            xn[:, i] = x0
+            xn[:, i] = x0[:, 0]
         if store_xmax:
             # Keep track of the state maxima
             xmax = np.max((np.abs(x0), xmax), 0)
     if not store_xn:
         xn = x0
-    return v.squeeze(), xn.squeeze(), xmax, y.squeeze()
+    return (v.squeeze() if out_v is None else out_v,
+            xn.squeeze() if out_xn is None else out_xn,
+            xmax,
+            y.squeeze() if out_y is None else out_y)
 
 
 def ds_quantize(y, n):
@@ -26,39 +26,77 @@ Fast simulator for a generic delta sigma modulator using scipy blas
 import numpy as np
 cimport numpy as np
 np.import_array()
-import scipy as sp
-__import__('scipy.signal')
-__import__('scipy.linalg')
+from .._lazy import lazy_module
+sp = lazy_module('scipy')
+from ._simulateDSM_scipy import _out_buffer, _ntf_abcd
 from libc.math cimport floor, fabs
 
 cdef extern from "23compat.h":
     void *Capsule_AsVoidPtr(object ptr)
 
 ctypedef void (*dgemv_ptr) (char *trans, int *m, int *n,\
-    double *alpha, double *a, int *lda, double *x, int *incx,\
-    double *beta,  double *y, int *incy)
-ctypedef void (*dcopy_ptr) (int *N, double *x, int *incx,\
-    double *y, int*incy)
+    double *alpha, const double *a, int *lda, const double *x, int *incx,\
+    double *beta,  double *y, int *incy) noexcept nogil
+ctypedef void (*dcopy_ptr) (int *N, const double *x, int *incx,\
+    double *y, int*incy) noexcept nogil
+ctypedef void (*sgemv_ptr) (char *trans, int *m, int *n,\
+    float *alpha, const float *a, int *lda, const float *x, int *incx,\
+    float *beta,  float *y, int *incy) noexcept nogil
+ctypedef void (*scopy_ptr) (int *N, const float *x, int *incx,\
+    float *y, int*incy) noexcept nogil
 cdef dgemv_ptr dgemv=<dgemv_ptr>Capsule_AsVoidPtr(
     sp.linalg.blas.dgemv._cpointer)
 cdef dcopy_ptr dcopy=<dcopy_ptr>Capsule_AsVoidPtr(
     sp.linalg.blas.dcopy._cpointer)
+cdef sgemv_ptr sgemv=<sgemv_ptr>Capsule_AsVoidPtr(
+    sp.linalg.blas.sgemv._cpointer)
+cdef scopy_ptr scopy=<scopy_ptr>Capsule_AsVoidPtr(
+    sp.linalg.blas.scopy._cpointer)
 
 #cdef dgemv_ptr dgemv=<dgemv_ptr>NULL
 #cdef dcopy_ptr dcopy=<dcopy_ptr>NULL
 
 include '_simulateDSM_helper.pxi'
 
-def simulateDSM(np.ndarray u, arg2, nlev=2, x0=0,
-                int store_xn=False, int store_xmax=False, int store_y=False):
+cdef inline void gemv(int rows, int cols, const real *a,
+                      const real *x, int incx,
+                      real beta, real *y) noexcept nogil:
+    """y = a x + beta y, with a C ordered rows x cols matrix a."""
+    cdef int one = 1
+    cdef real alpha = 1
+    if real is double:
+        dgemv('T', &cols, &rows, &alpha, a, &cols, x, &incx,
+              &beta, y, &one)
+    else:
+        sgemv('T', &cols, &rows, &alpha, a, &cols, x, &incx,
+              &beta, y, &one)
+
+cdef inline void copy(int n, const real *x, int incx,
+                      real *y, int incy) noexcept nogil:
+    if real is double:
+        dcopy(&n, x, &incx, y, &incy)
+    else:
+        scopy(&n, x, &incx, y, &incy)
+
+include '_simulateDSM_kernel.pxi'
+
+def simulateDSM(u, arg2, nlev=2, x0=0,
+                int store_xn=False, int store_xmax=False, int store_y=False,
+                out_v=None, out_y=None, out_xn=None, dtype=np.float64):
+
+    # Simulation precision
+    dt = np.dtype(dtype)
+    if dt != np.float32 and dt != np.float64:
+        raise ValueError(\
+            "Invalid argument: dtype must be float32 or float64")
 
     # Make sure that nlev is a 1D int array
     cdef np.ndarray c_nlev
     try:
-        c_nlev = np.asarray(nlev, dtype=np.int)
+        c_nlev = np.asarray(nlev, dtype=np.intc)
         if c_nlev.ndim > 1:
             raise TypeError()
-        c_nlev=c_nlev.reshape(1)
+        c_nlev=c_nlev.reshape(-1)
     except (ValueError, TypeError):
          raise ValueError(\
             "Invalid argument: nlev must be convertible into a 1D int array")
@@ -66,7 +104,11 @@ def simulateDSM(np.ndarray u, arg2, nlev=2, x0=0,
     # Make sure that input is a matrix
     cdef np.ndarray c_u
     try:
-        c_u = np.asarray(u, dtype=np.float64, order='C')
+        # Keep real input as it is, possibly a memmap, and convert it
+        # block by block while simulating
+        c_u = np.asarray(u)
+        if c_u.dtype.kind not in 'biuf':
+            c_u = np.asarray(u, dtype=np.float64, order='C')
         if c_u.ndim > 2:
             raise TypeError()
         if c_u.ndim == 1:
@@ -81,34 +123,32 @@ def simulateDSM(np.ndarray u, arg2, nlev=2, x0=0,
     cdef int order
 
     try:
-        if type(arg2)==tuple and len(arg2)==3:
+        if isinstance(arg2, tuple) and len(arg2)==3:
             # Assume ntf in zpk form
             ntf_z=np.asarray(arg2[0], dtype=np.complex128)
             ntf_p=np.asarray(arg2[1], dtype=np.complex128)
             ntf_k=float(arg2[2])
             if ntf_z.ndim !=1 or ntf_p.ndim != 1:
                 raise TypeError()
-            form = 2
-            order = ntf_z.shape[0]
+            ABCD = _ntf_abcd(ntf_z, ntf_p)
         else:
             # Assume ABCD form
             ABCD = np.asarray(arg2, dtype=np.float64)
-            if ABCD.ndim!=2:
-                raise TypeError()
-            if ABCD.shape[1] != nu+ABCD.shape[0]:
-                raise TypeError()
-            form = 1
-            order = ABCD.shape[0]-nq
+        if ABCD.ndim!=2:
+            raise TypeError()
+        if ABCD.shape[1] != nu+ABCD.shape[0]:
+            raise TypeError()
+        order = ABCD.shape[0]-nq
     except (ValueError, TypeError):
         raise ValueError('Incorrect modulator specification')
 
-    cdef np.ndarray c_x0, c_x0_temp
+    cdef np.ndarray c_x0
     # Assure that the state is a column vector
     try:
         if np.isscalar(x0) and x0 == 0:
-            c_x0 = np.zeros((order, 1), dtype=np.float64)
+            c_x0 = np.zeros((order, 1), dtype=dt)
         else:
-            c_x0 = np.array(x0, dtype=np.float64, order='C')
+            c_x0 = np.array(x0, dtype=dt, order='C')
             if c_x0.ndim < 1 or c_x0.ndim > 2:
                 raise TypeError()
             c_x0=c_x0.reshape(-1, 1)
@@ -116,112 +156,57 @@ def simulateDSM(np.ndarray u, arg2, nlev=2, x0=0,
                 raise TypeError()
     except (ValueError, TypeError):
         raise ValueError('Incorrect initial condition specification')
-    c_x0_temp = np.empty_like(c_x0)
 
     cdef np.ndarray A, B1, B2, C, D1
     # Build ISO Model
     # note that B=hstack((B1, B2))
-    if form == 1:
-        A = np.asarray(ABCD[0:order, 0:order], dtype=np.float64, order='C')
-        B1 = np.asarray(ABCD[0:order, order:order+nu],\
-            dtype=np.float64, order='C')
-        B2 = np.asarray(ABCD[0:order, order+nu:order+nu+nq],\
-            dtype=np.float64, order='C')
-        C = np.asarray(ABCD[order:order+nq, 0:order],\
-            dtype=np.float64, order='C')
-        D1 = np.asarray(ABCD[order:order+nq, order:order+nu], \
-            dtype=np.float64, order='C')
-    else:
-        # Seek a realization of -1/H
-        A, B2, C, D2 = sp.signal.zpk2ss(ntf_p, ntf_z, -1)
-        C=C.real
-        # Transform the realization so that C = [1 0 0 ...]
-        Sinv = sp.linalg.orth(np.hstack((np.transpose(C), np.eye(order))))/ \
-            np.linalg.norm(C)
-        S = sp.linalg.inv(Sinv)
-        C = np.dot(C, Sinv)
-        if C[0, 0] < 0:
-            S = -S
-            Sinv = -Sinv
-        A = np.asarray(S.dot(A).dot(Sinv), dtype=np.float64, order='C')
-        B2 = np.asarray(np.dot(S, B2), dtype=np.float64, order='C')
-        C = np.asarray(np.hstack(([[1.]], np.zeros((1,order-1)))),\
-            dtype=np.float64, order='C')
-        # C=C*Sinv;
-        # D2 = 0;
-        # !!!! Assume stf=1
-        B1 = -B2
-        D1 = np.asarray(1., dtype=np.float64)
-        #B = np.hstack((B1, B2))
+    A = np.asarray(ABCD[0:order, 0:order], dtype=dt, order='C')
+    B1 = np.asarray(ABCD[0:order, order:order+nu],\
+        dtype=dt, order='C')
+    B2 = np.asarray(ABCD[0:order, order+nu:order+nu+nq],\
+        dtype=dt, order='C')
+    C = np.asarray(ABCD[order:order+nq, 0:order],\
+        dtype=dt, order='C')
+    D1 = np.asarray(ABCD[order:order+nq, order:order+nu], \
+        dtype=dt, order='C')
 
     # N is number of input samples to deal with
     cdef int N = c_u.shape[1]
-    # v is output vector
-    cdef np.ndarray v = np.empty((nq, N), dtype=np.float64)
-    cdef np.ndarray y = np.empty(0, dtype=np.float64)
+    store_y = store_y or out_y is not None
+    store_xn = store_xn or out_xn is not None
+    # v is output vector, y and xn are stored if required
+    cdef np.ndarray v = _out_buffer(out_v, nq, N, 'out_v')
+    if v is None:
+        v = np.empty((nq, N), dtype=dt)
+    cdef np.ndarray y = None
     if store_y:
         # Need to store the quantizer input
-        y = np.empty((nq, N), dtype=np.float64)
-    cdef np.ndarray xn = np.empty(0, dtype=np.float64)
+        y = _out_buffer(out_y, nq, N, 'out_y')
+        if y is None:
+            y = np.empty((nq, N), dtype=dt)
+    cdef np.ndarray xn = None
     if store_xn:
         # Need to store the state information
-        xn = np.empty((order, N), dtype=np.float64)
-    cdef np.ndarray xmax = np.empty(0, dtype=np.float64)
+        xn = _out_buffer(out_xn, order, N, 'out_xn')
+        if xn is None:
+            xn = np.empty((order, N), dtype=dt)
+    cdef np.ndarray xmax = None
     if store_xmax:
         # Need to keep track of the state maxima
         xmax = np.abs(c_x0)
 
-    # y0 is output before the quantizer
-    cdef np.ndarray y0 = np.empty(nq, dtype=np.float64)
-
-    cdef int i
-    cdef int one=1
-    cdef double onedot = 1.0
-    cdef double zerodot = 0.0
-    for i in xrange(N):
-        # Compute y0 = np.dot(C, c_x0) + np.dot(D1, u[:, i])
-        dgemv('T', &order, &nq,\
-            &onedot, dbldata(C), &order, \
-            dbldata(c_x0), &one, \
-            &zerodot, dbldata(y0), &one)
-        dgemv('T', &nu, &nq,\
-            &onedot, dbldata(D1), &nu, \
-            dbldata(c_u)+i, &N, \
-            &onedot, dbldata(y0), &one)
-        if store_y:
-            #y[:, i] = y0[:]
-            dcopy(&nq, dbldata(y0), &one,\
-            dbldata(y)+i, &N)
-        ds_quantize(nq, dbldata(y0), 1, \
-            intdata(c_nlev), 1, \
-            dbldata(v)+i, N)
-        # Compute c_x0 = np.dot(A, c_x0) +
-        #   np.dot(B, np.vstack((u[:, i], v[:, i])))
-        dgemv('T', &order, &order,\
-            &onedot, dbldata(A), &order, \
-            dbldata(c_x0), &one,\
-            &zerodot, dbldata(c_x0_temp), &one)
-        dgemv('T', &nu, &order,\
-            &onedot, dbldata(B1), &nu, \
-            dbldata(c_u)+i, &N, \
-            &onedot, dbldata(c_x0_temp), &one)
-        dgemv('T', &nq, &order,\
-            &onedot, dbldata(B2), &nq, \
-            dbldata(v)+i, &N, \
-            &onedot, dbldata(c_x0_temp), &one)
-        # c_x0[:,1] = c_x0_temp[:,1]
-        dcopy(&order, dbldata(c_x0_temp), &one,\
-            dbldata(c_x0), &one)
-        if store_xn:
-            # Save the next state
-            #xn[:, i] = c_x0
-            dcopy(&order, dbldata(c_x0), &one,\
-            dbldata(xn)+i, &N)
-        if store_xmax:
-            # Keep track of the state maxima
-            # xmax = np.max((np.abs(x0), xmax), 0)
-            track_vabsmax(order, dbldata(xmax), 1,\
-                dbldata(c_x0), 1)
+    c_nlev = np.ascontiguousarray(c_nlev)
+    if dt == np.float32:
+        run_dsm[float](A, B1, B2, C, D1, c_nlev, c_x0, c_u, v, y, xn, xmax)
+    else:
+        run_dsm[double](A, B1, B2, C, D1, c_nlev, c_x0, c_u, v, y, xn, xmax)
     if not store_xn:
         xn = c_x0
-    return v.squeeze(), xn.squeeze(), xmax, y.squeeze()
\ No newline at end of file
+    if not store_y:
+        y = np.empty(0, dtype=dt)
+    if not store_xmax:
+        xmax = np.empty(0, dtype=dt)
+    return (v.squeeze() if out_v is None else out_v,
+            xn.squeeze() if out_xn is None else out_xn,
+            xmax,
+            y.squeeze() if out_y is None else out_y)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Entry point for DELSIG-like quadrature Delta-Sigma modulator simulator
+======================================================================
+"""
+
+import numpy as np
+from ._simulateQDSM_scipy import simulateQDSM as _simulateQDSM_scipy
+from ._simulateQDSM_scipy_blas import simulateQDSM as \
+    _simulateQDSM_scipy_blas
+from ..utilities import digested_options
+
+__all__ = ["simulateQDSM"]
+
+
+def simulateQDSM(u, arg2, nlev=2, x0=0,
+                 store_xn=False, store_xmax=False, store_y=False,
+                 **options):
+    """
+    Computes the output of a quadrature delta-sigma modulator.
+
+    The modulator is simulated directly with complex arithmetic: states,
+    inputs and outputs are complex and each quantizer is a pair of
+    in-phase and quadrature quantizers.
+
+    Parameters
+    ----------
+    u : array_like or matrix_like
+        modulator input (complex). Multiple inputs are allowed. In this
+        case, u is a matrix with as many rows as the desired inputs
+    arg2 : tuple
+        modulator structure in (complex) ABDC matrix form or modulator NTF
+        as zpk tuple, whose zeros and poles need not come in conjugate
+        pairs. In the latter case, the modulator STF is assumed to be
+        unitary.
+    nlev : int or array of ints, optional
+        number of levels in each of the in-phase and quadrature quantizers.
+        Multiple quantizers can be specified by making nlev a vector.
+        Defaults to 2.
+    x0 : array_like of complex or 0
+        modulator intitial state vector. Assigning it to 0 is a shorthand
+        for an appropriate length zero vector. Defaults to 0.
+    store_xn : bool, optional
+        switch controlling the storage of state evolution.
+        See description of return values. Defaults to False.
+    store_xmax : bool, optional
+        switch controlling the storage of maxima in state variables.
+        See description of return values. Defaults to False.
+    store_y : bool, optional
+        switch controlling the storage of input quantizer values.
+        See description of return values. Defaults to False.
+
+    Returns
+    -------
+    v : ndarray
+        complex samples at the output of the modulator, one per input
+        sample. If there are multiple quantizers, then v is a matrix, with
+        as many columns as the number of samples and as many rows as the
+        number of quantizers.
+    xn : ndarray
+        internal state of the modulator. If store_xn is set to True, then
+        it includes a state snapshot per input sample. In this case, xn
+        is a matrix, with as many columns as the number of samples and as
+        many rows as the number of state variables. If store_xn is False,
+        then xn is a vector containing a snapshot of the last state.
+    xmax : ndarray
+        maximum modulus reached by the state variables.
+        If store_xmax is set to True, then xmax is a vector with as many
+        entries as the number of state variables. Otherwise it is null.
+    y : ndarray
+        samples at the quantizer input(s), one per input sample.
+        If store_y is set to True, then y records the quantizer(s)
+        input(s). If there are multiple quantizers, then y is a matrix,
+        with as many columns as the number of samples and as many rows as
+        the number of quantizers. If store_y is False, then y is null.
+
+    Other Parameters
+    ----------------
+    backend : string
+        Use: 'auto' for automatic selection; 'scipy' for pure python
+        simulator; 'scipy_blas' for simulator using scipy provided blas.
+        Defaults can be set by changing the function ``default_options``
+        attribute.
+
+    Raises
+    ------
+    ValueError
+        'Incorrect modulator specification', if the modulator specification
+        is inconsistent.
+
+        'Invalid argument: nlev must be convertible into a 1D int array',
+        if the quantizer specification is incorrect.
+
+        'Invalid argument: u must be convertible into a 2D complex array',
+        if the input specification is incorrect.
+
+        'Incorrect initial condition specification' if the initial condition
+        specification for the modulator filters is incorrect.
+
+    RuntimeError
+        'Unsupported simulator backend xxx' if an unsupported backend is
+        required
+
+    Warns
+    -----
+    PyDsmSlowPathWarning
+        'Running the slow version of simulateQDSM', if the simulator being
+        used is the slow one, coded in pure Python.
+
+    See Also
+    --------
+    simulateDSM : simulator for real modulators
+    ds_qquantize : the quantizer
+    mapQtoR : real-doubled equivalent of a quadrature modulator
+
+    Notes
+    -----
+    The real and imaginary parts of the quantizer inputs are quantized as
+    in :func:`simulateDSM`.
+
+    When the modulator is specified through its NTF, it is realized as a
+    complex state space system with as many states as the NTF order,
+    rather than as a real system with twice as many states. The
+    realization is transformed so that its output matrix is C = [1 0 0 ...].
+
+    Setting store_xn, store_xmax and store_y to False speeds up the operation.
+    """
+    # Manage options
+    opts = digested_options(options, simulateQDSM.default_options,
+                            ['backend'])
+    backend = opts["backend"]
+    if backend == 'auto' or backend == 'scipy_blas':
+        simulator = _simulateQDSM_scipy_blas
+    elif backend == 'scipy':
+        simulator = _simulateQDSM_scipy
+    else:
+        raise RuntimeError('Unsupported simulator backend %s' % backend)
+    return simulator(np.asarray(u), arg2, nlev, x0,
+                     store_xn, store_xmax, store_y)
+
+simulateQDSM.default_options = {'backend': 'auto'}
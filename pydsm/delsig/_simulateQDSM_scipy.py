@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+# This file includes code ported from the DELSIG Matlab toolbox
+# (see http://www.mathworks.com/matlabcentral/fileexchange/19)
+# covered by the following copyright and permission notice
+#
+# Copyright (c) 2009 Richard Schreier
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the distribution
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Slow simulator for a generic quadrature delta sigma modulator
+=============================================================
+"""
+
+import numpy as np
+from .._lazy import lazy_module
+sp = lazy_module('scipy')
+from warnings import warn
+from ..exceptions import PyDsmSlowPathWarning
+from ._simulateDSM_scipy import ds_quantize
+
+import sys
+if sys.version_info < (3,):
+    range = xrange
+
+
+__all__ = ["ds_qquantize"]
+
+
+def _qntf_realization(ntf_z, ntf_p):
+    """
+    Complex state space realization of a modulator from its NTF.
+
+    Returns A, B1, B2, C, D1 with C = [1 0 0 ...] and unitary STF.
+    """
+    order = len(ntf_z)
+    # Seek a realization of -1/H
+    A, B2, C, D2 = sp.signal.zpk2ss(ntf_p, ntf_z, -1)
+    A = np.asarray(A, dtype=np.complex128)
+    B2 = np.asarray(B2, dtype=np.complex128)
+    C = np.asarray(C, dtype=np.complex128)
+    # Transform the realization so that C = [1 0 0 ...]. The first
+    # column of Q is parallel to C^H and the others are orthogonal to it.
+    Q = sp.linalg.qr(np.hstack((C.conj().T, np.eye(order))))[0][:, :order]
+    Sinv = Q/np.dot(C, Q[:, 0])
+    S = sp.linalg.inv(Sinv)
+    A = S.dot(A).dot(Sinv)
+    B2 = np.dot(S, B2)
+    C = np.hstack(([[1.]], np.zeros((1, order-1)))).astype(np.complex128)
+    # !!!! Assume stf=1
+    B1 = -B2
+    D1 = np.ones((1, 1), dtype=np.complex128)
+    return A, B1, B2, C, D1
+
+
+def simulateQDSM(u, arg2, nlev=2, x0=0,
+                 store_xn=False, store_xmax=False, store_y=False):
+
+    warn('Running the slow version of simulateQDSM.',
+         PyDsmSlowPathWarning)
+
+    # Make sure that nlev is an array
+    nlev = np.asarray(nlev).reshape(-1)
+
+    # Make sure that input is a matrix
+    u = np.asarray(u, dtype=np.complex128)
+    if u.ndim == 1:
+        u = u.reshape(1, -1)
+
+    nu = u.shape[0]
+    nq = np.size(nlev)
+
+    if isinstance(arg2, tuple) and len(arg2) == 3:
+        # Assume ntf in zpk form
+        (ntf_z, ntf_p, ntf_k) = arg2
+        order = len(ntf_z)
+        A, B1, B2, C, D1 = _qntf_realization(ntf_z, ntf_p)
+    else:
+        # Assume ABCD form
+        ABCD = np.asarray(arg2, dtype=np.complex128)
+        if ABCD.shape[1] == nu+ABCD.shape[0]:
+            # ABCD dimensions OK
+            order = ABCD.shape[0]-nq
+        else:
+            raise ValueError('Incorrect modulator specification')
+        A = ABCD[0:order, 0:order]
+        B1 = ABCD[0:order, order:order+nu]
+        B2 = ABCD[0:order, order+nu:order+nu+nq]
+        C = ABCD[order:order+nq, 0:order]
+        D1 = ABCD[order:order+nq, order:order+nu]
+
+    # Assure that the state is a column vector
+    if np.isscalar(x0) and x0 == 0:
+        x0 = np.zeros((order, 1), dtype=np.complex128)
+    else:
+        x0 = np.array(x0, dtype=np.complex128).reshape(-1, 1)
+
+    N = u.shape[1]
+    v = np.empty((nq, N), dtype=np.complex128)
+    if store_y:
+        # Need to store the quantizer input
+        y = np.empty((nq, N), dtype=np.complex128)
+    else:
+        y = np.empty((0, 0), dtype=np.complex128)
+    if store_xn:
+        # Need to store the state information
+        xn = np.empty((order, N), dtype=np.complex128)
+    if store_xmax:
+        # Need to keep track of the state maxima
+        xmax = np.abs(x0)
+    else:
+        xmax = np.empty(0)
+
+    for i in range(N):
+        y0 = np.dot(C, x0) + np.dot(D1, u[:, i:i+1])
+        if store_y:
+            y[:, i] = y0[:, 0]
+        v[:, i] = ds_qquantize(y0[:, 0], nlev)
+        x0 = np.dot(A, x0) + np.dot(B1, u[:, i:i+1]) + \
+            np.dot(B2, v[:, i:i+1])
+        if store_xn:
+            # Save the next state
+            xn[:, i] = x0[:, 0]
+        if store_xmax:
+            # Keep track of the state maxima
+            xmax = np.max((np.abs(x0), xmax), 0)
+    if not store_xn:
+        xn = x0
+    return v.squeeze(), xn.squeeze(), xmax, y.squeeze()
+
+
+def ds_qquantize(y, n):
+    """Quantize a complex signal according to a given number of levels.
+
+    The real and imaginary parts of the signal are quantized separately,
+    as in :func:`ds_quantize`.
+
+    Parameters
+    ----------
+    y : complex or array of complex
+        signal to be quantized (1 sample!). A vector with more than
+        1 entry if there are multiple quantizers.
+    n : int or vector of ints
+        number of quantization levels of each of the in-phase and
+        quadrature quantizers. Can be a vector to specify multiple
+        quantizers, in this case, y must have as many entries as n
+
+    Returns
+    -------
+    z : complex or ndarray
+        quantized signal (1 sample!).
+
+    See Also
+    --------
+    ds_quantize : quantizer for real signals
+    """
+    y = np.atleast_1d(y)
+    n = np.asarray(n).reshape(-1)
+    vi = ds_quantize(y.real.reshape(-1, 1).copy(), n)
+    vq = ds_quantize(y.imag.reshape(-1, 1).copy(), n)
+    return (vi+1j*vq).reshape(y.shape)
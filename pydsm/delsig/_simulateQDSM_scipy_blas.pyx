@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Fast simulator for a generic quadrature delta sigma modulator using scipy blas
+==============================================================================
+"""
+
+import numpy as np
+cimport numpy as np
+np.import_array()
+from .._lazy import lazy_module
+sp = lazy_module('scipy')
+from libc.math cimport floor, fabs, sqrt
+from ._simulateQDSM_scipy import _qntf_realization
+
+cdef extern from "23compat.h":
+    void *Capsule_AsVoidPtr(object ptr)
+
+ctypedef void (*zgemv_ptr) (char *trans, int *m, int *n,\
+    double complex *alpha, double complex *a, int *lda,\
+    double complex *x, int *incx,\
+    double complex *beta,  double complex *y, int *incy)
+ctypedef void (*zcopy_ptr) (int *N, double complex *x, int *incx,\
+    double complex *y, int*incy)
+cdef zgemv_ptr zgemv=<zgemv_ptr>Capsule_AsVoidPtr(
+    sp.linalg.blas.zgemv._cpointer)
+cdef zcopy_ptr zcopy=<zcopy_ptr>Capsule_AsVoidPtr(
+    sp.linalg.blas.zcopy._cpointer)
+
+include '_simulateDSM_helper.pxi'
+
+cdef inline double complex *cpxdata(np.ndarray arr):
+    return <double complex *>np.PyArray_DATA(arr)
+
+cdef inline void track_cabsmax(int N,\
+    double* vabsmax, int vabsmax_stride,\
+    double complex* x, int x_stride):
+    cdef int i
+    cdef double absx
+    for i in range(N):
+        absx=sqrt(x[i*x_stride].real*x[i*x_stride].real+\
+            x[i*x_stride].imag*x[i*x_stride].imag)
+        if absx > vabsmax[i*vabsmax_stride]:
+            vabsmax[i*vabsmax_stride]=absx
+
+def simulateQDSM(np.ndarray u, arg2, nlev=2, x0=0,
+                 int store_xn=False, int store_xmax=False, int store_y=False):
+
+    # Make sure that nlev is a 1D int array
+    cdef np.ndarray c_nlev
+    try:
+        c_nlev = np.asarray(nlev, dtype=np.intc)
+        if c_nlev.ndim > 1:
+            raise TypeError()
+        c_nlev=c_nlev.reshape(-1)
+    except (ValueError, TypeError):
+         raise ValueError(\
+            "Invalid argument: nlev must be convertible into a 1D int array")
+
+    # Make sure that input is a matrix
+    cdef np.ndarray c_u
+    try:
+        c_u = np.asarray(u, dtype=np.complex128, order='C')
+        if c_u.ndim > 2:
+            raise TypeError()
+        if c_u.ndim == 1:
+            c_u = c_u.reshape(1, -1)
+    except (ValueError, TypeError):
+        raise ValueError(\
+            "Invalid argument: u must be convertible into a 2D complex array")
+
+    cdef int nu = c_u.shape[0]
+    cdef int nq = c_nlev.shape[0]
+
+    cdef int order
+
+    try:
+        if isinstance(arg2, tuple) and len(arg2)==3:
+            # Assume ntf in zpk form
+            ntf_z=np.asarray(arg2[0], dtype=np.complex128)
+            ntf_p=np.asarray(arg2[1], dtype=np.complex128)
+            if ntf_z.ndim !=1 or ntf_p.ndim != 1:
+                raise TypeError()
+            form = 2
+            order = ntf_z.shape[0]
+        else:
+            # Assume ABCD form
+            ABCD = np.asarray(arg2, dtype=np.complex128)
+            if ABCD.ndim!=2:
+                raise TypeError()
+            if ABCD.shape[1] != nu+ABCD.shape[0]:
+                raise TypeError()
+            form = 1
+            order = ABCD.shape[0]-nq
+    except (ValueError, TypeError):
+        raise ValueError('Incorrect modulator specification')
+
+    cdef np.ndarray c_x0, c_x0_temp
+    # Assure that the state is a column vector
+    try:
+        if np.isscalar(x0) and x0 == 0:
+            c_x0 = np.zeros((order, 1), dtype=np.complex128)
+        else:
+            c_x0 = np.array(x0, dtype=np.complex128, order='C')
+            if c_x0.ndim < 1 or c_x0.ndim > 2:
+                raise TypeError()
+            c_x0=c_x0.reshape(-1, 1)
+            if c_x0.shape[0]!=order:
+                raise TypeError()
+    except (ValueError, TypeError):
+        raise ValueError('Incorrect initial condition specification')
+    c_x0_temp = np.empty_like(c_x0)
+
+    cdef np.ndarray A, B1, B2, C, D1
+    # Build ISO Model
+    # note that B=hstack((B1, B2))
+    if form == 1:
+        A = ABCD[0:order, 0:order]
+        B1 = ABCD[0:order, order:order+nu]
+        B2 = ABCD[0:order, order+nu:order+nu+nq]
+        C = ABCD[order:order+nq, 0:order]
+        D1 = ABCD[order:order+nq, order:order+nu]
+    else:
+        A, B1, B2, C, D1 = _qntf_realization(ntf_z, ntf_p)
+    A = np.ascontiguousarray(A, dtype=np.complex128)
+    B1 = np.ascontiguousarray(B1, dtype=np.complex128)
+    B2 = np.ascontiguousarray(B2, dtype=np.complex128)
+    C = np.ascontiguousarray(C, dtype=np.complex128)
+    D1 = np.ascontiguousarray(D1, dtype=np.complex128)
+
+    # N is number of input samples to deal with
+    cdef int N = c_u.shape[1]
+    # v is output vector
+    cdef np.ndarray v = np.empty((nq, N), dtype=np.complex128)
+    cdef np.ndarray y = np.empty(0, dtype=np.complex128)
+    if store_y:
+        # Need to store the quantizer input
+        y = np.empty((nq, N), dtype=np.complex128)
+    cdef np.ndarray xn = np.empty(0, dtype=np.complex128)
+    if store_xn:
+        # Need to store the state information
+        xn = np.empty((order, N), dtype=np.complex128)
+    cdef np.ndarray xmax = np.empty(0, dtype=np.float64)
+    if store_xmax:
+        # Need to keep track of the state maxima
+        xmax = np.abs(c_x0)
+
+    # y0 is output before the quantizer
+    cdef np.ndarray y0 = np.empty(nq, dtype=np.complex128)
+
+    cdef int i
+    cdef int one=1
+    cdef double complex onedot = 1.0
+    cdef double complex zerodot = 0.0
+    for i in xrange(N):
+        # Compute y0 = np.dot(C, c_x0) + np.dot(D1, u[:, i])
+        zgemv('T', &order, &nq,\
+            &onedot, cpxdata(C), &order, \
+            cpxdata(c_x0), &one, \
+            &zerodot, cpxdata(y0), &one)
+        zgemv('T', &nu, &nq,\
+            &onedot, cpxdata(D1), &nu, \
+            cpxdata(c_u)+i, &N, \
+            &onedot, cpxdata(y0), &one)
+        if store_y:
+            #y[:, i] = y0[:]
+            zcopy(&nq, cpxdata(y0), &one,\
+            cpxdata(y)+i, &N)
+        # Quantize in-phase and quadrature components separately, seeing
+        # the complex vectors as interleaved double vectors
+        ds_quantize(nq, dbldata(y0), 2, \
+            intdata(c_nlev), 1, \
+            dbldata(v)+2*i, 2*N)
+        ds_quantize(nq, dbldata(y0)+1, 2, \
+            intdata(c_nlev), 1, \
+            dbldata(v)+2*i+1, 2*N)
+        # Compute c_x0 = np.dot(A, c_x0) +
+        #   np.dot(B, np.vstack((u[:, i], v[:, i])))
+        zgemv('T', &order, &order,\
+            &onedot, cpxdata(A), &order, \
+            cpxdata(c_x0), &one,\
+            &zerodot, cpxdata(c_x0_temp), &one)
+        zgemv('T', &nu, &order,\
+            &onedot, cpxdata(B1), &nu, \
+            cpxdata(c_u)+i, &N, \
+            &onedot, cpxdata(c_x0_temp), &one)
+        zgemv('T', &nq, &order,\
+            &onedot, cpxdata(B2), &nq, \
+            cpxdata(v)+i, &N, \
+            &onedot, cpxdata(c_x0_temp), &one)
+        # c_x0[:,1] = c_x0_temp[:,1]
+        zcopy(&order, cpxdata(c_x0_temp), &one,\
+            cpxdata(c_x0), &one)
+        if store_xn:
+            # Save the next state
+            #xn[:, i] = c_x0
+            zcopy(&order, cpxdata(c_x0), &one,\
+            cpxdata(xn)+i, &N)
+        if store_xmax:
+            # Keep track of the state maxima
+            # xmax = np.max((np.abs(x0), xmax), 0)
+            track_cabsmax(order, dbldata(xmax), 1,\
+                cpxdata(c_x0), 1)
+    if not store_xn:
+        xn = c_x0
+    return v.squeeze(), xn.squeeze(), xmax, y.squeeze()
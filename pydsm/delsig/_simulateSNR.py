@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2015, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+# This file includes code ported from the DELSIG Matlab toolbox
+# (see http://www.mathworks.com/matlabcentral/fileexchange/19)
+# covered by the following copyright and permission notice
+#
+# Copyright (c) 2009 Richard Schreier
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in
+#     the documentation and/or other materials provided with the distribution
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+SNR evaluation of delta sigma modulators
+========================================
+"""
+
+import numpy as np
+from .._lazy import lazy_module
+sp = lazy_module('scipy')
+from warnings import warn
+from ..exceptions import PyDsmApproximationWarning
+from ..utilities import digested_options
+from ._decibel import dbv, undbv
+from ._simulateDSM import simulateDSM
+from ..tf import TF
+
+import sys
+if sys.version_info < (3,):
+    range = xrange
+
+__all__ = ["calculateSNR", "simulateSNR", "peakSNR", "dynamicRange",
+           "compareSimulationPrecision"]
+
+# Initial samples of the SNR simulations discarded as transient
+_N_TRANSIENT = 100
+
+
+def _single_loop_abcd(arg1):
+    # ABCD matrix of a single input, single quantizer modulator given as
+    # zpk NTF (with unitary STF) or as ABCD matrix
+    if isinstance(arg1, TF):
+        return arg1.cached('single_loop_abcd',
+                           lambda: _single_loop_abcd(arg1.zpk))
+    if isinstance(arg1, tuple) and len(arg1) == 3:
+        A, B2, C, D2 = sp.signal.zpk2ss(arg1[1], arg1[0], -1)
+        ABCD = np.vstack((np.hstack((A, -B2, B2)),
+                          np.hstack((C, [[1., 0.]]))))
+    else:
+        ABCD = np.asarray(arg1, dtype=float)
+    order = ABCD.shape[0]-1
+    if ABCD.ndim != 2 or ABCD.shape[1] != order+2:
+        raise ValueError('Incorrect modulator specification')
+    return ABCD
+
+
+def _block_diagonal_abcd(ABCD, nb):
+    # ABCD matrix of nb independent copies of a single input, single
+    # quantizer modulator, to be simulated at once as separate channels
+    order = ABCD.shape[0]-1
+    blk = [ABCD[:order, :order], ABCD[:order, order:order+1],
+           ABCD[:order, order+1:], ABCD[order:, :order],
+           ABCD[order:, order:order+1], ABCD[order:, order+1:]]
+    blk = [sp.linalg.block_diag(*([b]*nb)) for b in blk]
+    return np.vstack((np.hstack(blk[0:3]), np.hstack(blk[3:6])))
+
+
+def calculateSNR(hwfft, f, nsig=1):
+    """
+    Estimate the signal-to-noise ratio from a spectrum.
+
+    Parameters
+    ----------
+    hwfft : array_like
+        the FFT of a windowed signal, restricted to the band of interest.
+        If hwfft is a matrix, each row is taken as a separate spectrum.
+    f : int
+        the bin index of the signal in hwfft
+    nsig : int, optional
+        the extra number of bins taken by the signal on each side of f.
+        Defaults to 1, which is appropriate for the Hann window.
+
+    Returns
+    -------
+    snr : real or ndarray
+        the signal-to-noise ratio in dB, one per spectrum. If there is no
+        noise in the band, the SNR is infinite.
+
+    Notes
+    -----
+    The signal is assumed to be a sine wave occupying the bins from
+    f-nsig to f+nsig. All the other bins of hwfft are assumed to be noise.
+    """
+    hwfft = np.asarray(hwfft)
+    n = hwfft.shape[-1]
+    sig = np.zeros(n, dtype=bool)
+    sig[max(f-nsig, 0):max(f+nsig+1, 0)] = True
+    p = np.abs(hwfft)**2
+    s = np.sqrt(np.sum(p[..., sig], axis=-1))
+    n = np.sqrt(np.sum(p[..., ~sig], axis=-1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        snr = np.where(n == 0, np.inf, dbv(s/n))
+    return snr[()]
+
+
+def simulateSNR(arg1, osr, amp=None, f0=0, nlev=2, f=None, k=13,
+                **options):
+    """
+    Determine the SNR of a ΔΣ modulator by simulation.
+
+    For each input amplitude, a sine wave is fed to the modulator and the
+    SNR is computed on the Hann-windowed spectrum of the modulator
+    output.
+
+    Parameters
+    ----------
+    arg1 : tuple or array_like
+        modulator NTF as zpk tuple (in this case the STF is assumed to be
+        unitary) or modulator structure in ABCD matrix form, with a single
+        input and a single quantizer.
+    osr : real
+        the oversampling ratio
+    amp : array_like, optional
+        the input amplitudes in dB, relative to the quantizer full scale
+        (nlev-1). Defaults to [-120, -110, ..., -20, -15, -10, -9, ..., 0].
+    f0 : real, optional
+        center frequency for BP modulators, or 0 for LP modulators.
+        Defaults to 0.
+    nlev : int, optional
+        number of levels in the quantizer. Defaults to 2.
+    f : real, optional
+        normalized frequency of the test sine wave. It is rounded to
+        the closest FFT bin. Defaults to the middle of the signal band for
+        LP modulators and to f0 for BP modulators.
+    k : int, optional
+        base 2 logarithm of the number of samples used in the FFT.
+        Defaults to 13.
+
+    Returns
+    -------
+    snr : ndarray
+        SNR values in dB, one per input amplitude
+    amp : ndarray
+        input amplitudes in dB
+
+    Other Parameters
+    ----------------
+    batch : int, optional
+        number of amplitudes being simulated at once, as independent
+        channels of the same simulation. Defaults to 8.
+    backend : string, optional
+        backend passed to :func:`simulateDSM`. Defaults to None, meaning
+        the :func:`simulateDSM` default.
+    dtype : dtype, optional
+        simulation precision passed to :func:`simulateDSM`. Defaults to
+        None, meaning the :func:`simulateDSM` default.
+
+    Warns
+    -----
+    PyDsmApproximationWarning
+        'Increasing k to accommodate a large oversampling ratio' if there
+        would be less than 8 in-band bins.
+
+        'Increasing input frequency' if f is too close to DC.
+
+    Notes
+    -----
+    The modulator is simulated for 2**k samples, plus 100 initial
+    samples of transient (the first 50 of them with a soft start of the
+    input) that are discarded. The spectra of all the simulations are
+    computed at once with a single real FFT. For LP modulators, the DC bin
+    and the one next to it are excluded from the noise.
+
+    Default values for the options not directly documented in the function
+    call signature can be checked and updated by changing the function
+    ``default_options`` attribute.
+    """
+    opts = digested_options(options, simulateSNR.default_options,
+                            ['batch', 'backend', 'dtype'])
+    sim_opts = dict((key, opts[key]) for key in ('backend', 'dtype')
+                    if opts[key] is not None)
+    amp = _default_amp(amp)
+    N, F, band, tone, window = _tone_test(osr, f0, nlev, f, k)
+    v = _tone_bitstreams(arg1, amp, tone, nlev, opts['batch'], sim_opts)
+    snr = _bitstreams_snr(v, F, band, window)
+    return snr.reshape(amp.shape), amp
+
+simulateSNR.default_options = {'batch': 8, 'backend': None, 'dtype': None}
+
+
+def _default_amp(amp):
+    if amp is None:
+        amp = np.concatenate((np.arange(-120, -10, 10), [-15],
+                              np.arange(-10, 1)))
+    return np.asarray(amp, dtype=float)
+
+
+def _tone_test(osr, f0, nlev, f, k):
+    # Test tone (with its transient), window, and in-band bins for the
+    # SNR simulations
+    if f is None:
+        f = f0 if f0 != 0 else 0.25/osr
+    N = 2**k
+    if N < 8*2*osr:
+        warn('Increasing k to accommodate a large oversampling ratio',
+             PyDsmApproximationWarning)
+        k = int(np.ceil(np.log2(8*2*osr)))
+        N = 2**k
+    F = int(round(f*N))
+    if abs(F) <= 1:
+        warn('Increasing input frequency', PyDsmApproximationWarning)
+        F = 2
+    if f0 == 0:
+        # Exclude DC and its adjacent bin to avoid window-related effects
+        band = np.arange(2, int(round(N/(2.*osr))))
+    else:
+        band = np.arange(int(round(N*(f0-0.25/osr))),
+                         int(round(N*(f0+0.25/osr)))+1)
+    tone = (nlev-1)*np.sin(2*np.pi*F/N*np.arange(N+_N_TRANSIENT))
+    tone[:_N_TRANSIENT//2] *= 0.5*(1-np.cos(2*np.pi/_N_TRANSIENT *
+                                           np.arange(_N_TRANSIENT//2)))
+    window = 0.5*(1-np.cos(2*np.pi*np.arange(N)/N))
+    return N, F, band, tone, window
+
+
+def _tone_bitstreams(arg1, amp, tone, nlev, batch, sim_opts):
+    # Modulator outputs for the test tone at the amplitudes amp, including
+    # the transient. Amplitudes are simulated in batches, with a block
+    # diagonal structure.
+    ABCD = _single_loop_abcd(arg1)
+    v = np.empty((amp.size, tone.size))
+    batch = max(int(batch), 1)
+    for start in range(0, amp.size, batch):
+        a = amp.ravel()[start:start+batch]
+        nb = a.size
+        u = undbv(a)[:, np.newaxis]*tone
+        vv = simulateDSM(u, _block_diagonal_abcd(ABCD, nb), [nlev]*nb,
+                         **sim_opts)[0]
+        v[start:start+nb] = vv.reshape(nb, -1)
+    return v
+
+
+def _bitstreams_snr(v, F, band, window):
+    hwfft = np.fft.rfft(window*v[:, _N_TRANSIENT:], axis=1)[:, band]
+    return calculateSNR(hwfft, F-band[0])
+
+
+def compareSimulationPrecision(arg1, osr, amp=None, f0=0, nlev=2, f=None,
+                               k=13, **options):
+    """
+    Compare single and double precision simulations of a ΔΣ modulator.
+
+    The test of :func:`simulateSNR` is run with both simulation
+    precisions, to tell whether the faster single precision mode of
+    :func:`simulateDSM` can be trusted for a given design.
+
+    Parameters
+    ----------
+    arg1 : tuple or array_like
+        modulator NTF as zpk tuple (in this case the STF is assumed to be
+        unitary) or modulator structure in ABCD matrix form, with a single
+        input and a single quantizer.
+    osr : real
+        the oversampling ratio
+    amp : array_like, optional
+        the input amplitudes in dB, relative to the quantizer full scale
+        (nlev-1). Defaults as in :func:`simulateSNR`.
+    f0 : real, optional
+        center frequency for BP modulators, or 0 for LP modulators.
+        Defaults to 0.
+    nlev : int, optional
+        number of levels in the quantizer. Defaults to 2.
+    f : real, optional
+        normalized frequency of the test sine wave. Defaults as in
+        :func:`simulateSNR`.
+    k : int, optional
+        base 2 logarithm of the number of samples used in the FFT.
+        Defaults to 13.
+
+    Returns
+    -------
+    first : ndarray of ints
+        index of the first sample where the single precision bitstream
+        differs from the double precision one, one per input amplitude,
+        or -1 if the bitstreams are identical. Indexes count from the
+        start of the simulation, including the 100 transient samples.
+    dsnr : ndarray
+        SNR in single precision minus SNR in double precision, in dB,
+        one per input amplitude. It is NaN if the single precision
+        simulation overflows.
+    amp : ndarray
+        input amplitudes in dB
+
+    Other Parameters
+    ----------------
+    batch : int, optional
+        number of amplitudes being simulated at once. Defaults to 8.
+    backend : string, optional
+        backend passed to :func:`simulateDSM`. Defaults to None, meaning
+        the :func:`simulateDSM` default.
+
+    Notes
+    -----
+    Bitstreams from the two precisions normally part after some time,
+    since a ΔΣ modulator is a chaotic system. What matters is that this
+    does not happen too early and that the SNR is unaffected. Designs with
+    badly scaled states are those at risk.
+
+    Default values for the options not directly documented in the function
+    call signature can be checked and updated by changing the function
+    ``default_options`` attribute.
+
+    See Also
+    --------
+    simulateSNR : for the details of the test
+    """
+    opts = digested_options(options,
+                            compareSimulationPrecision.default_options,
+                            ['batch', 'backend'])
+    sim_opts = {}
+    if opts['backend'] is not None:
+        sim_opts['backend'] = opts['backend']
+    amp = _default_amp(amp)
+    N, F, band, tone, window = _tone_test(osr, f0, nlev, f, k)
+    v64 = _tone_bitstreams(arg1, amp, tone, nlev, opts['batch'],
+                           dict(sim_opts, dtype=np.float64))
+    v32 = _tone_bitstreams(arg1, amp, tone, nlev, opts['batch'],
+                           dict(sim_opts, dtype=np.float32))
+    diff = v64 != v32
+    first = np.where(np.any(diff, axis=1), np.argmax(diff, axis=1), -1)
+    dsnr = (_bitstreams_snr(v32, F, band, window) -
+            _bitstreams_snr(v64, F, band, window))
+    return first.reshape(amp.shape), dsnr.reshape(amp.shape), amp
+
+compareSimulationPrecision.default_options = {'batch': 8, 'backend': None}
+
+
+def _snr_line(snr, amp):
+    # Fit a line with unit slope through the low amplitude part of the SNR
+    # curve, returning its intercept.
+    snr = np.asarray(snr, dtype=float).ravel()
+    amp = np.asarray(amp, dtype=float).ravel()
+    ok = np.isfinite(snr) & (snr >= 3)
+    snr = snr[ok]
+    amp = amp[ok]
+    if snr.size == 0:
+        raise ValueError('No valid SNR data')
+    i = np.argmax(snr)
+    sel = amp < amp[i]-10
+    if not np.any(sel):
+        sel = amp <= amp[i]
+    d = snr[sel]-amp[sel]
+    c = np.median(d)
+    # Drop the points off the line and refine
+    on = np.abs(d-c) < 3
+    if np.any(on):
+        c = np.mean(d[on])
+    return c, snr[i], amp[i]
+
+
+def peakSNR(snr, amp):
+    """
+    Peak SNR and the amplitude where it is achieved.
+
+    Parameters
+    ----------
+    snr : array_like
+        SNR values in dB, as returned by :func:`simulateSNR`
+    amp : array_like
+        input amplitudes in dB
+
+    Returns
+    -------
+    peak_snr : real
+        the maximum SNR
+    peak_amp : real
+        the input amplitude corresponding to the maximum SNR
+
+    Notes
+    -----
+    Infinite, NaN and lower than 3 dB SNR values are ignored.
+    """
+    c, peak_snr, peak_amp = _snr_line(snr, amp)
+    return peak_snr, peak_amp
+
+
+def dynamicRange(snr, amp):
+    """
+    Dynamic range of a modulator from its SNR curve.
+
+    Parameters
+    ----------
+    snr : array_like
+        SNR values in dB, as returned by :func:`simulateSNR`
+    amp : array_like
+        input amplitudes in dB
+
+    Returns
+    -------
+    dr : real
+        the dynamic range in dB
+
+    Notes
+    -----
+    The dynamic range is taken as the ratio between the input amplitude
+    giving the peak SNR and the input amplitude giving a 0 dB SNR. The
+    latter is obtained by extrapolating a unit slope line fitted to the
+    SNR values at least 10 dB below the peak amplitude.
+    Infinite, NaN and lower than 3 dB SNR values are ignored.
+    """
+    c, peak_snr, peak_amp = _snr_line(snr, amp)
+    return peak_amp+c
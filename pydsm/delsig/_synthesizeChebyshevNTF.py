@@ -53,7 +53,8 @@ DELSIG-like synthesizeChebyshevNTF
 """
 
 import numpy as np
-from scipy.signal import cheby2
+from .._lazy import lazy_module
+sp = lazy_module('scipy')
 from ._ds import ds_f1f2
 from ..relab import cplxpair
 
@@ -142,9 +143,9 @@ def synthesizeChebyshevNTF(order=3, osr=64, opt=0, H_inf=1.5, f0=0.0):
 
     for itn in range(itn_limit):
         if f0 == 0:
-            z, p, k = cheby2(order, x, 1./osr, 'high', output='zpk')
+            z, p, k = sp.signal.cheby2(order, x, 1./osr, 'high', output='zpk')
         else:
-            z, p, k = cheby2(order/2, x, 2*f1f2, 'stop',
+            z, p, k = sp.signal.cheby2(order/2, x, 2*f1f2, 'stop',
                              output='zpk')
         f = 1./k - H_inf
         # print (x, f)
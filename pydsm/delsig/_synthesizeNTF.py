@@ -57,9 +57,11 @@ from warnings import warn
 from ..exceptions import PyDsmApproximationWarning
 from ._synthesizeNTF0 import synthesizeNTF0
 from ._synthesizeNTF1 import synthesizeNTF1
+from ._ds import ds_optzeros
+from ..relab import cplxpair
 from ..utilities import digested_options
 
-__all__ = ["synthesizeNTF"]
+__all__ = ["synthesizeNTF", "synthesizeNTF_many"]
 
 
 def synthesizeNTF(order=3, osr=64, opt=0, H_inf=1.5, f0=0.0,
@@ -164,3 +166,192 @@ def synthesizeNTF(order=3, osr=64, opt=0, H_inf=1.5, f0=0.0,
     return ntf
 
 synthesizeNTF.default_options = {'use_optimizer': True}
+
+
+def synthesizeNTF_many(order=3, osr=64, opt=0, H_inf=1.5, f0=0.0,
+                       **options):
+    """
+    Synthesizes many NTFs for DS modulators by Schreier's approach.
+
+    This is the batch version of :func:`synthesizeNTF`. The arguments are
+    broadcast against each other, and an NTF is designed for each
+    resulting (order, osr, opt, H_inf, f0) specification. The iterative
+    search for the NTF poles meeting the H_inf constraint is run on all
+    the specifications at once, using array operations.
+
+    Parameters
+    ----------
+    order : int or array_like of ints, optional
+        the order of the modulators, defaults to 3
+    osr : float or array_like of floats, optional
+        the oversamping ratios (based on the actual signal bandwidth)
+    opt : int or array_like of ints, optional
+        flags for optimized zeros, defaults to 0. See
+        :func:`synthesizeNTF`. Explicit zero locations are not accepted.
+    H_inf : real or array_like of reals, optional
+        max allowed peak values of the NTFs. Defaults to 1.5
+    f0 : real or array_like of reals, optional
+        center frequencies for BP modulators, or 0 for LP modulators.
+        Defaults to 0.
+
+    Returns
+    -------
+    ntfs : list of tuples
+        noise transfer functions in zpk form, one for each specification,
+        in the (C) order of the broadcast arguments.
+
+    Other Parameters
+    ----------------
+    use_optimizer : bool
+        Use: True for for optimizing the zeros with a fast optimization code,
+        False otherwise. Only relevant for the specifications where opt is
+        3 or 4. Defaults can be set by changing the function
+        ``default_options`` attribute.
+
+    Raises
+    ------
+    ValueError
+        'Frequency f0 must be less than 0.5' if an f0 is out of range
+
+        'Order must be even for a bandpass modulator' if an order is
+        incompatible with the modulator type.
+
+        'opt must be an integer flag' if zeros are passed explicitly.
+
+    Warns
+    -----
+    PyDsmApproximationWarning
+        The same warnings as :func:`synthesizeNTF`, reporting the index of
+        the specification they refer to.
+
+    Notes
+    -----
+    Specifications with opt equal to 3 or 4 require a per-design
+    optimization of the zeros and are delegated to :func:`synthesizeNTF`.
+
+    The NTF poles are the same as those computed by :func:`synthesizeNTF`,
+    modulo the round-off in the H_inf iteration.
+    """
+    # Manage options
+    opts = digested_options(options, synthesizeNTF_many.default_options,
+                            ['use_optimizer'])
+    # Broadcast the specifications
+    order, osr, opt, H_inf, f0 = [a.ravel() for a in np.broadcast_arrays(
+        np.asarray(order), np.asarray(osr, dtype=float), np.asarray(opt),
+        np.asarray(H_inf, dtype=float), np.asarray(f0, dtype=float))]
+    f0 = f0.copy()
+    if np.any(opt != np.round(opt)):
+        raise ValueError('opt must be an integer flag')
+    opt = opt.astype(int)
+    order = order.astype(int)
+    if np.any(f0 > 0.5):
+        raise ValueError('Frequency f0 must be less than 0.5')
+    low = (f0 != 0) & (f0 < 0.25/osr)
+    for i in np.flatnonzero(low):
+        warn('Creating a lowpass ntf (spec. %d).' % i,
+             PyDsmApproximationWarning)
+    f0[low] = 0
+    bp = f0 != 0
+    if np.any(bp & (order % 2 != 0)):
+        raise ValueError('Order must be even for a bandpass modulator')
+    ntfs = [None]*order.size
+    # Optimized zeros, per design
+    for i in np.flatnonzero(opt >= 3):
+        ntfs[i] = synthesizeNTF(order[i].item(), osr[i].item(),
+                                opt[i].item(), H_inf[i].item(),
+                                f0[i].item(), **opts)
+    idx = np.flatnonzero(opt < 3)
+    if idx.size == 0:
+        return ntfs
+    order, osr, opt, H_inf, f0, bp = \
+        order[idx], osr[idx], opt[idx], H_inf[idx], f0[idx], bp[idx]
+    nb = idx.size
+    nmax = np.max(order)
+    # Zeros, as angles, with NaN padding
+    zw = np.full((nb, nmax), np.nan)
+    for i in range(nb):
+        n = order[i]//2 if bp[i] else order[i]
+        if opt[i] == 0:
+            z = np.zeros(n)
+        else:
+            z = ds_optzeros(n, opt[i])
+        if bp[i]:
+            z = np.pi/(2*osr[i])*z + 2*np.pi*f0[i]
+            z = np.vstack((z, -z)).transpose().flatten()
+        else:
+            z = np.pi/osr[i]*z
+        zw[i, :order[i]] = z
+    valid = ~np.isnan(zw)
+    z_inf = np.where(f0 > 0.25, 1., -1.)
+    num = np.prod(np.where(valid, z_inf[:, np.newaxis] -
+                           np.exp(1j*np.nan_to_num(zw)), 1.), axis=1)
+    # Pole placement: poles are the roots of a polynomial in x (one of
+    # them per specification) that is adjusted by a secant iteration
+    # until the NTF gain at z_inf matches H_inf
+    kk = np.arange(nmax)
+    w = np.where(bp[:, np.newaxis], 2*kk+1, 2*kk+3)*np.pi/order[:, np.newaxis]
+    ejw = np.exp(1j*w)
+    center = np.where(bp, np.cos(2*np.pi*f0), 1.)
+    sgn = np.where(bp, 0.5, -0.5)
+
+    def poles(x, sel):
+        mb2 = (center[sel, np.newaxis] +
+               sgn[sel, np.newaxis]*(x[:, np.newaxis] **
+                                     (2./order[sel, np.newaxis])) *
+               ejw[sel])
+        p = mb2 - np.sqrt(mb2**2-1)
+        # Reflect poles to be inside the unit circle
+        out = np.abs(p) > 1
+        p[out] = 1/p[out]
+        return p
+
+    p = np.zeros((nb, nmax), dtype=complex)
+    zero_p = np.zeros(nb, dtype=bool)
+    active = np.ones(nb, dtype=bool)
+    # Lowpass designs whose H_inf cannot be achieved
+    over = ~bp & (H_inf >= 2.**order)
+    for i in np.flatnonzero(over):
+        warn('Unable to achieve specified H_inf (spec. %d), '
+             'setting all NTF poles to zero' % idx[i],
+             PyDsmApproximationWarning)
+    zero_p[over] = True
+    active[over] = False
+    x = np.where(bp, 0.3**(order//2-1), 0.3**(order-1))
+    delta_x = np.zeros(nb)
+    fprev = np.zeros(nb)
+    itn_limit = 100
+    for itn in range(1, itn_limit+1):
+        sel = np.flatnonzero(active)
+        if sel.size == 0:
+            break
+        pp = poles(x[sel], sel)
+        p[sel] = pp
+        den = np.prod(np.where(valid[sel], z_inf[sel, np.newaxis]-pp, 1.),
+                      axis=1)
+        f = np.real(num[sel]/den)-H_inf[sel]
+        if itn == 1:
+            dx = -f/100
+        else:
+            dx = -f*delta_x[sel]/(f-fprev[sel])
+        xplus = x[sel]+dx
+        x[sel] = np.where(xplus > 0, xplus, x[sel]*0.1)
+        delta_x[sel] = dx
+        fprev[sel] = f
+        done = (np.abs(f) < 1e-10) | (np.abs(dx) < 1e-10)
+        diverged = ~done & (x[sel] > 1e6)
+        for i in sel[diverged]:
+            warn('Unable to achieve specified Hinf (spec. %d), '
+                 'setting all NTF poles to zero' % idx[i],
+                 PyDsmApproximationWarning)
+        zero_p[sel[diverged]] = True
+        active[sel[done | diverged]] = False
+    for i in np.flatnonzero(active):
+        warn('Iteration limit exceeded (spec. %d)' % idx[i],
+             PyDsmApproximationWarning)
+    for i in range(nb):
+        n = order[i]
+        pi = np.zeros(n) if zero_p[i] else cplxpair(p[i, :n])
+        ntfs[idx[i]] = (cplxpair(np.exp(1j*zw[i, :n])), pi, 1)
+    return ntfs
+
+synthesizeNTF_many.default_options = synthesizeNTF.default_options.copy()
@@ -50,13 +50,14 @@
 
 
 import numpy as np
-from scipy.optimize import fmin_l_bfgs_b
+from .._lazy import lazy_module
+sp = lazy_module('scipy')
 from warnings import warn
 from ..exceptions import PyDsmApproximationWarning
 from ._tf import evalTF
 from ..utilities import is_negligible
 from ..relab import cplxpair
-from ._ds import ds_optzeros, ds_synNTFobj1
+from ._ds import ds_optzeros, ds_synNTFobj1_grad
 from ._padding import padl
 
 import sys
@@ -211,14 +212,14 @@ def synthesizeNTF1(order, osr, opt, H_inf, f0):
             # options = optimset(options,'LargeScale','off');
             # options = optimset(options,'Display','off');
             # %options = optimset(options,'Display','iter');
-            opt_result = fmin_l_bfgs_b(ds_synNTFobj1, x0, args=(p, osr, f0),
-                                       approx_grad=True,
-                                       bounds=list(zip(lb, ub)))
+            opt_result = sp.optimize.fmin_l_bfgs_b(ds_synNTFobj1_grad, x0,
+                                                   args=(p, osr, f0),
+                                                   bounds=list(zip(lb, ub)))
             x = opt_result[0]
             x0 = x
             z = np.exp(2j*np.pi*(f0+0.5/osr*x))
             if f0 > 0:
-                z = padl(z, len(p)/2, np.exp(2j*np.pi*f0))
+                z = padl(z, len(p)//2, np.exp(2j*np.pi*f0))
             z = np.concatenate((z, z.conj()))
             if f0 == 0:
                 z = padl(z, len(p), 1)
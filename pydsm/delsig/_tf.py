@@ -53,9 +53,14 @@ Transfer function management a la DELSIG.
 """
 
 import numpy as np
+from ..tf import TF
 
 __all__ = ["evalTF", "evalRPoly"]
 
+# Transfer functions in zpk form with more finite zeros or poles than this
+# are evaluated with rescaling of the partial products
+_SCALED_EVAL_ORDER = 8
+
 
 def evalTF(tf, x):
     """
@@ -88,11 +93,18 @@ def evalTF(tf, x):
     coefficients are sorted from the higher power of 's' or 'z' to the lower,
     so that the last coefficient is in fact the constant term in the
     numerator/denominator polynomial.
+
+    Transfer functions in zpk form with many zeros or poles are evaluated as
+    a cascade of zero/pole ratios, rescaling the partial products by powers
+    of two and keeping track of the exponents apart. This avoids the
+    overflows that otherwise affect high order filters, such as
+    :data:`pydsm.audio_weightings.f_zpk`, where the numerator and the
+    denominator can be huge even when their ratio is not.
+
+    When tf is a :class:`pydsm.tf.TF`, the evaluation strategy is prepared
+    once and cached with it.
     """
-    if len(tf) == 3:
-        retval = np.asarray(evalRPoly(tf[0], x, tf[2]))/evalRPoly(tf[1], x, 1)
-    elif len(tf) == 2:
-        retval = np.asarray(np.polyval(tf[0], x))/np.polyval(tf[1], x)
+    retval = np.asarray(_tf_evaluator(tf)(x))
     if retval.size == 1:
         return retval.item()
     return retval
@@ -125,3 +137,91 @@ def evalRPoly(roots, x, k=1):
     for i in range(roots.size):
         y = y*(x-roots[i])
     return y
+
+
+def _tf_evaluator(tf, power=False):
+    """
+    Prepare the evaluation of a transfer function.
+
+    Parameters
+    ----------
+    tf : tuple
+        transfer function in zpk or ba form
+    power : bool, optional
+        whether the returned function should compute the squared magnitude
+        of the transfer function rather than its value. Defaults to False.
+
+    Returns
+    -------
+    h : callable
+        function of a complex value or array of complex values returning
+        the transfer function (or its squared magnitude) at those values.
+
+    Notes
+    -----
+    The removal of the roots at infinity and the choice of the evaluation
+    strategy are done once, so that the returned function is cheap to call
+    repeatedly, e.g. from an integrator.
+
+    Transfer functions in zpk form with more than ``_SCALED_EVAL_ORDER``
+    finite zeros or poles are evaluated as a cascade of zero/pole ratios.
+    Every ``_SCALED_EVAL_ORDER`` stages, the partial product is rescaled by
+    a power of two whose exponent is accumulated apart (as in a log domain
+    evaluation), so that the result can neither overflow nor underflow
+    unless it is itself out of range.
+    """
+    if isinstance(tf, TF):
+        return tf.cached(('_tf_evaluator', bool(power)),
+                         lambda: _tf_evaluator(tf.zpk, power))
+    if len(tf) == 2:
+        b, a = tf
+        if power:
+            return lambda x: np.abs(np.asarray(np.polyval(b, x)) /
+                                    np.polyval(a, x))**2
+        return lambda x: np.asarray(np.polyval(b, x))/np.polyval(a, x)
+    z, p, k = tf
+    z = np.asarray(z)
+    z = z[np.logical_not(np.isinf(z))]
+    p = np.asarray(p)
+    p = p[np.logical_not(np.isinf(p))]
+    if max(z.size, p.size) <= _SCALED_EVAL_ORDER:
+        if power:
+            return lambda x: np.abs(np.asarray(evalRPoly(z, x, k)) /
+                                    evalRPoly(p, x, 1))**2
+        return lambda x: np.asarray(evalRPoly(z, x, k))/evalRPoly(p, x, 1)
+    ek = np.frexp(np.abs(k))[1]
+    mk = k*2.**-ek
+
+    def scaled(x):
+        # Returns y, e such that the tf value is y*2**e
+        x = np.asarray(x)
+        # Real filters at real points give real values, as in evalRPoly
+        y = np.full(x.shape, mk, dtype=np.result_type(x, z, p, mk, float))
+        e = np.full(x.shape, ek)
+        for i in range(max(z.size, p.size)):
+            if i < z.size:
+                y *= x-z[i]
+            if i < p.size:
+                y /= x-p[i]
+            if i % _SCALED_EVAL_ORDER == _SCALED_EVAL_ORDER-1:
+                ei = np.frexp(np.abs(y))[1]
+                y = _ldexp(y, -ei)
+                e += ei
+        return y, e
+
+    if power:
+        def h(x):
+            y, e = scaled(x)
+            return np.ldexp(y.real**2+y.imag**2, 2*e)
+    else:
+        def h(x):
+            y, e = scaled(x)
+            return _ldexp(y, e)
+    return h
+
+
+def _ldexp(y, e):
+    # np.ldexp for real or complex y
+    if np.iscomplexobj(y):
+        return np.ldexp(y.real, e)+1j*np.ldexp(y.imag, e)
+    return np.ldexp(y, e)
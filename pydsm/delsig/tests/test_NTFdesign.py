@@ -23,11 +23,16 @@
 from numpy.testing import TestCase, run_module_suite
 import numpy as np
 
+from scipy.optimize import approx_fprime
 from pydsm.delsig import synthesizeNTF, synthesizeChebyshevNTF, clans
+from pydsm.delsig import synthesizeNTF_many
+from pydsm.delsig import ds_synNTFobj1, ds_synNTFobj1_grad
+from pydsm.delsig._clans import _ClansProblem, _dsclansObj6a, _dsclansObj6b
 from pydsm.relab import cplxpair
 
-__all__ = ["TestSynthesizeNTF", "TestSynthesizeChebyshevNTF",
-           "TestClans"]
+__all__ = ["TestSynthesizeNTF", "TestSynthesizeNTFMany",
+           "TestSynthesizeNTFObjective",
+           "TestSynthesizeChebyshevNTF", "TestClans"]
 
 
 class TestSynthesizeNTF(TestCase):
@@ -79,6 +84,13 @@ class TestSynthesizeNTF(TestCase):
         np.testing.assert_almost_equal(z, e_z, 4)
         np.testing.assert_almost_equal(p, e_p, 4)
 
+    def test_BP8_opt3(self):
+        z, p, k = synthesizeNTF(order=8, osr=32, opt=3, f0=0.2)
+        np.testing.assert_almost_equal(np.abs(z), np.ones(8), 10)
+        np.testing.assert_array_less(np.abs(p), 1.)
+        f = np.angle(z[np.imag(z) > 0])/(2*np.pi)
+        np.testing.assert_array_less(np.abs(f-0.2), 0.25/32)
+
     def test_given_zeroz(self):
         g_z = [1.0000, 0.9993 - 0.0380j, 0.9993 + 0.0380j]
         z, p, k = synthesizeNTF(opt=g_z)
@@ -92,6 +104,58 @@ class TestSynthesizeNTF(TestCase):
         np.testing.assert_almost_equal(p, e_p, 4)
 
 
+class TestSynthesizeNTFMany(TestCase):
+    def setUp(self):
+        pass
+
+    def test_grid(self):
+        order = np.asarray([2, 4, 5, 6, 8])[:, np.newaxis]
+        osr = np.asarray([16, 64])
+        ntfs = synthesizeNTF_many(order, osr, 1, 1.5, 0.)
+        self.assertEqual(len(ntfs), 10)
+        for ntf, (n, r) in zip(ntfs, np.broadcast(order, osr)):
+            e_z, e_p, e_k = synthesizeNTF(n, r, 1, 1.5, 0.)
+            np.testing.assert_almost_equal(ntf[2], e_k, 10)
+            np.testing.assert_almost_equal(ntf[0], e_z, 10)
+            np.testing.assert_almost_equal(ntf[1], e_p, 8)
+
+    def test_mixed(self):
+        specs = [(3, 64, 0, 1.5, 0.), (6, 32, 2, 2., 0.3),
+                 (4, 32, 1, 1.3, 0.1), (5, 64, 3, 1.5, 0.)]
+        ntfs = synthesizeNTF_many(*zip(*specs))
+        for ntf, spec in zip(ntfs, specs):
+            e_z, e_p, e_k = synthesizeNTF(*spec)
+            np.testing.assert_almost_equal(ntf[0], e_z, 10)
+            np.testing.assert_almost_equal(ntf[1], e_p, 8)
+
+    def test_explicit_zeros(self):
+        self.assertRaises(ValueError, synthesizeNTF_many, 3, 64, 0.5)
+
+
+class TestSynthesizeNTFObjective(TestCase):
+    def setUp(self):
+        pass
+
+    def check_grad(self, order, osr, f0, x):
+        p = synthesizeNTF(order, osr, 1, 1.5, f0)[1]
+        f, g = ds_synNTFobj1_grad(x, p, osr, f0)
+        e_g = approx_fprime(x, ds_synNTFobj1, 1e-7, p, osr, f0)
+        np.testing.assert_almost_equal(f, ds_synNTFobj1(x, p, osr, f0), 10)
+        np.testing.assert_allclose(g, e_g, rtol=1e-4, atol=1e-4)
+
+    def test_grad_LP5(self):
+        self.check_grad(5, 32, 0., np.asarray([0.3, 0.8]))
+
+    def test_grad_LP8(self):
+        self.check_grad(8, 64, 0., np.asarray([0.1, 0.4, 0.6, 0.9]))
+
+    def test_grad_BP8(self):
+        self.check_grad(8, 32, 0.2, np.asarray([-0.4, -0.1, 0.2, 0.45]))
+
+    def test_grad_BP8_center(self):
+        self.check_grad(8, 32, 0.2, np.asarray([-0.4, 0.2, 0.45]))
+
+
 class TestSynthesizeChebyshevNTF(TestCase):
 
     def setUp(self):
@@ -151,5 +215,34 @@ class TestClans(TestCase):
         np.testing.assert_almost_equal(z, e_z, 4)
         np.testing.assert_almost_equal(p, e_p, 4)
 
+    def check_problem(self, order, x):
+        args = (order, 32, 5, 0.95, synthesizeNTF(order, 32, 1, 6)[0])
+        prob = _ClansProblem(*args)
+        np.testing.assert_almost_equal(prob.obj(x), _dsclansObj6a(x, *args),
+                                       12)
+        np.testing.assert_almost_equal(prob.cons(x), _dsclansObj6b(x, *args),
+                                       10)
+        e_df = approx_fprime(x, _dsclansObj6a, 1e-7, *args)
+        e_dg = approx_fprime(x, _dsclansObj6b, 1e-7, *args)
+        np.testing.assert_allclose(prob.obj_jac(x), e_df, rtol=1e-4,
+                                   atol=1e-8)
+        np.testing.assert_allclose(prob.cons_jac(x), e_dg, rtol=1e-4,
+                                   atol=1e-5)
+
+    def test_problem_4(self):
+        self.check_problem(4, np.asarray([0.8, 0.6, 0.9, 0.7]))
+
+    def test_problem_5(self):
+        self.check_problem(5, np.asarray([0.5, 0.8, 0.6, 0.9, 0.7]))
+
+    def test_problem_high_order_gain(self):
+        # Band edge gain with zeros clustered at z=1
+        for order in [8, 10]:
+            args = (order, 64, 5, 0.95, synthesizeNTF(order, 64, 0)[0])
+            x = np.linspace(0.5, 0.9, order)
+            prob = _ClansProblem(*args)
+            np.testing.assert_allclose(prob.obj(x), _dsclansObj6a(x, *args),
+                                       rtol=1e-9)
+
 if __name__ == '__main__':
     run_module_suite()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2015, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from numpy.testing import TestCase, run_module_suite
+import numpy as np
+from pydsm.delsig import simulateDSM, synthesizeNTF, maxStableAmplitude
+
+__all__ = ["TestMaxStableAmplitude"]
+
+
+class TestMaxStableAmplitude(TestCase):
+
+    def setUp(self):
+        self.ntf = synthesizeNTF(5, 32, 1)
+        self.f = np.array([0.002, 0.01])
+
+    def ymax(self, amp, f, N=10000):
+        u = amp*np.sin(2*np.pi*f*np.arange(N))
+        u[:50] *= 0.5*(1-np.cos(np.pi/50*np.arange(50)))
+        return np.max(np.abs(simulateDSM(u, self.ntf, store_y=True)[3]))
+
+    def test_bisection(self):
+        amax = maxStableAmplitude(self.ntf, self.f, tol=1E-2)
+        self.assertEqual(amax.shape, (2,))
+        for a, f in zip(amax, self.f):
+            self.assertTrue(0.3 < a < 1)
+            self.assertTrue(self.ymax(a, f) <= 7)
+            self.assertTrue(self.ymax(a+0.1, f) > 7)
+
+    def test_batching(self):
+        a1 = maxStableAmplitude(self.ntf, self.f, tol=1E-2, batch=1)
+        a2 = maxStableAmplitude(self.ntf, self.f, tol=1E-2, batch=5,
+                                workers=2)
+        np.testing.assert_equal(a1, a2)
+
+    def test_retries(self):
+        a0 = maxStableAmplitude(self.ntf, self.f, tol=1E-2)
+        a3 = maxStableAmplitude(self.ntf, self.f, tol=1E-2, retries=3)
+        self.assertTrue(np.all(a3 <= a0))
+
+    def test_stable_full_scale(self):
+        ntf = synthesizeNTF(1, 32, 1)
+        self.assertEqual(maxStableAmplitude(ntf, 0.01), 1.)
+
+if __name__ == '__main__':
+    run_module_suite()
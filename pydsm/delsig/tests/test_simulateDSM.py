@@ -22,10 +22,15 @@
 
 from numpy.testing import TestCase, run_module_suite
 import numpy as np
+import os
+import tempfile
+import warnings
 from pkg_resources import resource_stream
-from pydsm.delsig import simulateDSM
+from pydsm.delsig import simulateDSM, simulateDSM_many, synthesizeNTF
+from pydsm.exceptions import PyDsmSlowPathWarning
 
-__all__ = ["TestSimulateDSM"]
+__all__ = ["TestSimulateDSM", "TestSimulateDSMMany", "TestSimulateDSMOut",
+           "TestSimulateDSMFloat32"]
 
 
 class TestSimulateDSM(TestCase):
@@ -52,5 +57,139 @@ class TestSimulateDSM(TestCase):
         v, d1, d2, d3 = simulateDSM(u, H)
         np.testing.assert_equal(v, d)
 
+
+class TestSimulateDSMMany(TestCase):
+
+    def setUp(self):
+        self.H = synthesizeNTF(5, 32, 1)
+        N = 4096
+        self.uu = [a*np.sin(2.*np.pi*85/N*np.arange(N))
+                   for a in (0.1, 0.3, 0.5, 0.7)]
+
+    def test_match_sequential(self):
+        res = simulateDSM_many(self.uu, self.H, store_xn=True,
+                               store_xmax=True, store_y=True, workers=3)
+        self.assertEqual(len(res), len(self.uu))
+        for u, r in zip(self.uu, res):
+            ref = simulateDSM(u, self.H, store_xn=True, store_xmax=True,
+                              store_y=True)
+            for a, b in zip(r, ref):
+                np.testing.assert_equal(a, b)
+
+    def test_single_worker(self):
+        res = simulateDSM_many(self.uu, self.H, workers=1)
+        for u, r in zip(self.uu, res):
+            np.testing.assert_equal(r[0], simulateDSM(u, self.H)[0])
+
+    def test_empty(self):
+        self.assertEqual(simulateDSM_many([], self.H), [])
+
+
+class TestSimulateDSMOut(TestCase):
+
+    def setUp(self):
+        self.H = synthesizeNTF(5, 32, 1)
+        # Longer than a simulation block
+        self.N = N = 20000
+        u = 0.5*np.sin(2.*np.pi*85/N*np.arange(N))
+        # Strided, single precision input
+        self.buf = np.zeros(2*N, dtype=np.float32)
+        self.buf[::2] = u
+        self.u = self.buf[::2]
+
+    def check_backend(self, backend):
+        v = np.empty(self.N, dtype=np.int8)
+        y = np.empty((1, self.N))
+        xn = np.empty((self.N, 5)).T
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', PyDsmSlowPathWarning)
+            self.ref = simulateDSM(self.u.astype(np.float64), self.H,
+                                   store_xn=True, store_xmax=True,
+                                   store_y=True, backend=backend)
+            res = simulateDSM(self.u, self.H, store_xmax=True,
+                              out_v=v, out_y=y, out_xn=xn, backend=backend)
+        self.assertIs(res[0], v)
+        self.assertIs(res[1], xn)
+        self.assertIs(res[3], y)
+        np.testing.assert_equal(v, self.ref[0])
+        np.testing.assert_allclose(xn, self.ref[1], rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(res[2], self.ref[2], rtol=1e-12)
+        np.testing.assert_allclose(y[0], self.ref[3], rtol=1e-12, atol=1e-12)
+
+    def test_scipy_blas(self):
+        self.check_backend('scipy_blas')
+
+    def test_scipy(self):
+        self.check_backend('scipy')
+
+    def test_memmap(self):
+        d = tempfile.mkdtemp()
+        try:
+            fu = os.path.join(d, 'u.npy')
+            fv = os.path.join(d, 'v.npy')
+            np.save(fu, self.u.astype(np.float64))
+            u = np.load(fu, mmap_mode='r')
+            v = np.lib.format.open_memmap(fv, mode='w+', dtype=np.int8,
+                                          shape=(self.N,))
+            simulateDSM(u, self.H, out_v=v)
+            del u, v
+            ref = simulateDSM(self.u.astype(np.float64), self.H)[0]
+            np.testing.assert_equal(np.load(fv), ref)
+        finally:
+            for f in os.listdir(d):
+                os.remove(os.path.join(d, f))
+            os.rmdir(d)
+
+    def test_bad_out(self):
+        self.assertRaises(ValueError, simulateDSM, self.u, self.H,
+                          out_v=np.empty(self.N-1))
+        ro = np.empty(self.N)
+        ro.setflags(write=False)
+        self.assertRaises(ValueError, simulateDSM, self.u, self.H,
+                          out_v=ro)
+
+
+class TestSimulateDSMFloat32(TestCase):
+
+    def setUp(self):
+        self.H = synthesizeNTF(2, 32, 1)
+        N = 4096
+        self.u = 0.5*np.sin(2.*np.pi*85/N*np.arange(N))
+
+    def check_backend(self, backend):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', PyDsmSlowPathWarning)
+            v, xn, xmax, y = simulateDSM(self.u, self.H, store_xn=True,
+                                         store_xmax=True, store_y=True,
+                                         backend=backend, dtype=np.float32)
+            ref = simulateDSM(self.u, self.H, store_xn=True,
+                              store_xmax=True, store_y=True, backend=backend)
+        for a in (v, xn, xmax, y):
+            self.assertEqual(a.dtype, np.float32)
+        # Compare up to the first bitstream divergence
+        d = np.flatnonzero(v != ref[0])
+        n = d[0] if d.size else v.size
+        self.assertTrue(n > 100)
+        np.testing.assert_allclose(xn[:, :n], ref[1][:, :n], atol=1e-4)
+        np.testing.assert_allclose(y[:n], ref[3][:n], atol=1e-4)
+
+    def test_scipy_blas(self):
+        self.check_backend('scipy_blas')
+
+    def test_scipy(self):
+        self.check_backend('scipy')
+
+    def test_blocks(self):
+        # Strided input goes through the block buffers
+        u = np.repeat(self.u, 2)[::2]
+        v = np.empty(self.u.size, dtype=np.int8)
+        simulateDSM(u, self.H, out_v=v, dtype=np.float32)
+        np.testing.assert_equal(v, simulateDSM(self.u, self.H,
+                                               dtype=np.float32)[0])
+
+    def test_bad_dtype(self):
+        self.assertRaises(ValueError, simulateDSM, self.u, self.H,
+                          dtype=np.int32)
+
 if __name__ == '__main__':
     run_module_suite()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2015, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from numpy.testing import TestCase, run_module_suite
+import numpy as np
+import warnings
+from pydsm.delsig import (simulateDSM, simulateQDSM, synthesizeNTF,
+                          mapQtoR, ds_qquantize)
+from pydsm.delsig._simulateQDSM_scipy import _qntf_realization
+from pydsm.exceptions import PyDsmSlowPathWarning
+
+__all__ = ["TestSimulateQDSM"]
+
+
+class TestSimulateQDSM(TestCase):
+
+    def setUp(self):
+        z, p, k = synthesizeNTF(4, 32, 1)
+        self.ntf_r = (z, p, k)
+        rot = np.exp(2j*np.pi*0.1)
+        self.ntf = (z*rot, p*rot, 1)
+        n = np.arange(2000)
+        self.u = 0.5*np.exp(2j*np.pi*(0.1+3./1000)*n)
+
+    def test_qquantize(self):
+        np.testing.assert_equal(ds_qquantize([0.3-2.2j, -5+0.1j], [2, 4]),
+                                [1.-1.j, -3.+1.j])
+
+    def test_real_ntf(self):
+        # With a real NTF the I and Q paths are two independent modulators
+        v = simulateQDSM(self.u, self.ntf_r)[0]
+        vi = simulateDSM(self.u.real, self.ntf_r)[0]
+        vq = simulateDSM(self.u.imag, self.ntf_r)[0]
+        np.testing.assert_equal(v, vi+1j*vq)
+
+    def test_backends(self):
+        r1 = simulateQDSM(self.u[:200], self.ntf, store_xn=True,
+                          store_xmax=True, store_y=True)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', PyDsmSlowPathWarning)
+            r2 = simulateQDSM(self.u[:200], self.ntf, store_xn=True,
+                              store_xmax=True, store_y=True,
+                              backend='scipy')
+        np.testing.assert_equal(r1[0], r2[0])
+        for a, b in zip(r1[1:], r2[1:]):
+            np.testing.assert_allclose(a, b, rtol=1E-9, atol=1E-9)
+
+    def test_real_doubled(self):
+        A, B1, B2, C, D1 = _qntf_realization(self.ntf[0], self.ntf[1])
+        ABCD = np.vstack((np.hstack((A, B1, B2)),
+                          np.hstack((C, D1, np.zeros((1, 1))))))
+        v = simulateQDSM(self.u, self.ntf)[0]
+        np.testing.assert_equal(simulateQDSM(self.u, ABCD)[0], v)
+        vr = simulateDSM(np.vstack((self.u.real, self.u.imag)),
+                         mapQtoR(ABCD), nlev=[2, 2])[0]
+        np.testing.assert_equal(vr[0]+1j*vr[1], v)
+
+    def test_noise_shaping(self):
+        v = simulateQDSM(self.u, self.ntf)[0]
+        e = (v-self.u)[500:]*np.hanning(1500)
+        ee = np.abs(np.fft.fft(e))**2
+        ff = np.fft.fftfreq(1500)
+        inband = np.mean(ee[np.abs(ff-0.1) < 1./64])
+        image = np.mean(ee[np.abs(ff+0.3) < 1./64])
+        self.assertTrue(inband < 1E-5*image)
+
+if __name__ == '__main__':
+    run_module_suite()
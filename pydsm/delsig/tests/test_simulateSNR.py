@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2015, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+from numpy.testing import TestCase, run_module_suite
+import numpy as np
+from pydsm.delsig import (simulateDSM, simulateSNR, calculateSNR,
+                          synthesizeNTF, peakSNR, dynamicRange, dbv,
+                          compareSimulationPrecision)
+
+__all__ = ["TestCalculateSNR", "TestSimulateSNR",
+           "TestCompareSimulationPrecision"]
+
+
+class TestCalculateSNR(TestCase):
+
+    def setUp(self):
+        pass
+
+    def test_bins(self):
+        hwfft = np.ones(20)
+        hwfft[5:8] = 10.
+        np.testing.assert_almost_equal(calculateSNR(hwfft, 6),
+                                       dbv(np.sqrt(300./17)))
+
+    def test_rows(self):
+        hwfft = np.ones((3, 20))
+        hwfft[:, 5:8] = [[10.], [100.], [0.]]
+        snr = calculateSNR(hwfft, 6)
+        np.testing.assert_almost_equal(snr, dbv(np.sqrt(
+            np.asarray([300., 30000., 0.])/17)))
+
+    def test_no_noise(self):
+        hwfft = np.zeros(20)
+        hwfft[5:8] = 1.
+        self.assertEqual(calculateSNR(hwfft, 6), np.inf)
+
+
+class TestSimulateSNR(TestCase):
+
+    def setUp(self):
+        self.ntf = synthesizeNTF(5, 32, 1)
+
+    def test_batch(self):
+        amp = np.asarray([-60., -30., -10., -3.])
+        snr1, amp1 = simulateSNR(self.ntf, 32, amp, batch=1)
+        snr3, amp3 = simulateSNR(self.ntf, 32, amp, batch=3)
+        np.testing.assert_equal(amp1, amp)
+        np.testing.assert_almost_equal(snr1, snr3, 8)
+
+    def test_single(self):
+        # Compare with a direct, step by step, computation
+        amp = -20.
+        N = 2**13
+        F = int(round(0.25/32*N))
+        t = np.arange(N+100)
+        u = 10**(amp/20.)*np.sin(2*np.pi*F/N*t)
+        u[:50] *= 0.5*(1-np.cos(2*np.pi/100*np.arange(50)))
+        v = simulateDSM(u, self.ntf)[0][100:]
+        w = 0.5*(1-np.cos(2*np.pi*np.arange(N)/N))
+        spec = np.abs(np.fft.fft(w*v))[2:N//64]
+        sig = np.zeros(spec.size, dtype=bool)
+        sig[F-3:F] = True
+        e_snr = dbv(np.linalg.norm(spec[sig])/np.linalg.norm(spec[~sig]))
+        snr, a = simulateSNR(self.ntf, 32, [amp])
+        np.testing.assert_almost_equal(snr[0], e_snr, 8)
+
+    def test_peak(self):
+        snr, amp = simulateSNR(self.ntf, 32)
+        peak_snr, peak_amp = peakSNR(snr, amp)
+        self.assertEqual(peak_snr, np.max(snr))
+        self.assertTrue(80 < peak_snr < 90)
+        self.assertTrue(-10 <= peak_amp <= 0)
+        dr = dynamicRange(snr, amp)
+        self.assertTrue(peak_snr < dr < peak_snr+10)
+
+
+class TestCompareSimulationPrecision(TestCase):
+
+    def setUp(self):
+        self.ntf = synthesizeNTF(2, 32, 1)
+        self.amp = np.asarray([-20., -6.])
+
+    def test_snr(self):
+        first, dsnr, amp = compareSimulationPrecision(self.ntf, 32, self.amp)
+        np.testing.assert_equal(amp, self.amp)
+        self.assertEqual(first.shape, amp.shape)
+        self.assertTrue(np.all(np.abs(dsnr) < 1.))
+        snr64 = simulateSNR(self.ntf, 32, self.amp)[0]
+        snr32 = simulateSNR(self.ntf, 32, self.amp, dtype=np.float32)[0]
+        np.testing.assert_almost_equal(dsnr, snr32-snr64, 8)
+
+    def test_first(self):
+        first = compareSimulationPrecision(self.ntf, 32, self.amp)[0]
+        N = 2**13
+        F = int(round(0.25/32*N))
+        t = np.arange(N+100)
+        for a, i in zip(self.amp, first):
+            u = 10**(a/20.)*np.sin(2*np.pi*F/N*t)
+            u[:50] *= 0.5*(1-np.cos(2*np.pi/100*np.arange(50)))
+            v64 = simulateDSM(u, self.ntf)[0]
+            v32 = simulateDSM(u, self.ntf, dtype=np.float32)[0]
+            d = np.flatnonzero(v64 != v32)
+            self.assertEqual(i, d[0] if d.size else -1)
+
+if __name__ == '__main__':
+    run_module_suite()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+import numpy as np
+from numpy.testing import TestCase, run_module_suite
+from scipy import signal
+from pydsm.delsig import evalTF, synthesizeNTF
+from pydsm.audio_weightings import f_zpk, f_weighting, f_weighting_gain
+from pydsm.NTFdesign import quantization_noise_gain
+
+__all__ = ["TestEvalTF"]
+
+
+class TestEvalTF(TestCase):
+
+    def setUp(self):
+        pass
+
+    def test_f_zpk_no_overflow(self):
+        f = np.logspace(1, 7, 200)
+        with np.errstate(all='raise'):
+            h = evalTF(f_zpk, 2j*np.pi*f)
+        self.assertTrue(np.all(np.isfinite(h)))
+        np.testing.assert_allclose(np.abs(h)**2*f_weighting_gain,
+                                   f_weighting(f), rtol=1E-3)
+
+    def test_f_zpk_scalar(self):
+        h = evalTF(f_zpk, 2j*np.pi*1000.)
+        self.assertTrue(np.isscalar(h))
+        np.testing.assert_allclose(np.abs(h)**2*f_weighting_gain, 1.,
+                                   rtol=1E-3)
+
+    def test_log_domain_matches_direct(self):
+        z, p, k = signal.cheby2(12, 80, 0.2, output='zpk')
+        zz = np.exp(2j*np.pi*np.linspace(0, 0.5, 101))
+        ba = signal.zpk2tf(z, p, k)
+        np.testing.assert_allclose(evalTF((z, p, k), zz),
+                                   evalTF(ba, zz), rtol=1E-6, atol=1E-12)
+
+    def test_real_roots_real_value(self):
+        # The result type does not depend on the filter order
+        for n in [4, 10]:
+            z = np.linspace(-0.9, 0.9, n)
+            p = np.linspace(-0.5, 0.5, n)
+            h = evalTF((z, p, 1.), 2.0)
+            self.assertIsInstance(h, float)
+            np.testing.assert_allclose(h, np.prod((2.-z)/(2.-p)))
+
+    def test_noise_gain_high_order_weighting(self):
+        ntf = synthesizeNTF(5, 64)
+        hz = signal.cheby2(12, 80, 0.01, output='zpk')
+        f = np.linspace(0, 0.5, 200001)
+        _, h = signal.freqz_zpk(hz[0], hz[1], hz[2], 2*np.pi*f)
+        _, n = signal.freqz_zpk(ntf[0], ntf[1], ntf[2], 2*np.pi*f)
+        g = 2*np.trapz(np.abs(h*n)**2, f)
+        np.testing.assert_allclose(quantization_noise_gain(ntf, hz), g,
+                                   rtol=1E-6)
+
+if __name__ == '__main__':
+    run_module_suite()
@@ -37,18 +37,28 @@ Functions
     dtft_hermitian  -- DTFT specialized to hermitian vectors
     idtft -- inverse discrete time Fourier transform
     idtft_hermitian -- IDTFT specialized to hermitian vectors
+    extract_tones -- amplitude and phase of tones at given frequencies
+
+Classes
+-------
+
+.. autosummary::
+   :toctree: generated/
+
+    WelchPSD -- streaming power spectral density estimator (Welch method)
+    ToneExtractor -- streaming extraction of tones at given frequencies
 """
 
 
 
 import numpy as np
-import scipy as sp
-__import__("scipy.fftpack")
-__import__("scipy.integrate")
+from ._lazy import lazy_module
+sp = lazy_module('scipy')
 from .utilities import digested_options
 
 __all__ = ["fft_centered", "dtft", "dtft_hermitian", "idtft",
-           "idtft_hermitian"]
+           "idtft_hermitian", "extract_tones", "WelchPSD",
+           "ToneExtractor"]
 
 
 def fft_centered(x, fs=1):
@@ -248,3 +258,465 @@ def idtft_hermitian(Ff, tt, fs=1, **options):
                            for t in tt])
 
 idtft_hermitian.default_options = idtft.default_options.copy()
+
+
+class WelchPSD(object):
+    """
+    Streaming power spectral density estimator based on the Welch method.
+
+    Accumulates averaged, windowed periodograms of a signal that is
+    delivered one block at a time, so that the spectrum of arbitrarily
+    long sequences can be estimated in constant memory. Blocks can have
+    any length: segments straddling two blocks are handled by keeping the
+    (at most `nperseg` samples long) tail of the previous block. Feeding
+    the same sequence in one go or split in chunks gives the same result,
+    which matches :func:`scipy.signal.welch` on the whole sequence.
+
+    Parameters
+    ----------
+    nperseg : int, optional
+        length of each segment (defaults to 4096)
+    fs : real, optional
+        sample frequency of the signal (defaults to 1)
+    window : str or tuple or array_like, optional
+        window applied to each segment. Either a spec accepted by
+        :func:`scipy.signal.get_window` or a 1-D array of length
+        `nperseg` (defaults to 'hann')
+    noverlap : int, optional
+        number of samples shared by consecutive segments (defaults to
+        ``nperseg//2``)
+    detrend : str or False, optional
+        detrending applied to each segment, either 'constant', 'linear' or
+        False (defaults to 'constant')
+    scaling : str, optional
+        either 'density' for a PSD in units**2/Hz or 'spectrum' for a
+        power spectrum in units**2 (defaults to 'density')
+    return_onesided : bool, optional
+        if True return a one-sided spectrum for real signals (defaults
+        to True). Must be False for complex signals.
+
+    Other Parameters
+    ----------------
+    batch : int, optional
+        maximum number of segments transformed in a single FFT call. Bounds
+        the temporary memory used by :meth:`update` (defaults to 64).
+
+    Attributes
+    ----------
+    nsegments : int
+        number of segments accumulated so far
+    nsamples : int
+        number of samples fed so far
+
+    Notes
+    -----
+    The signal may have multiple channels. In this case, blocks are 2-D
+    arrays with one channel per row and the spectra of all the channels
+    are returned as rows of a 2-D array.
+
+    Examples
+    --------
+    Spectrum of a long modulator output, simulated in chunks and never
+    stored in full:
+
+    >>> import numpy as np
+    >>> from pydsm.delsig import synthesizeNTF, simulateDSM
+    >>> from pydsm.ft import WelchPSD
+    >>> ntf = synthesizeNTF(5, 64, 1)
+    >>> est = WelchPSD(nperseg=8192)
+    >>> xn = 0
+    >>> for k in range(16):
+    ...     t = np.arange(k*65536, (k+1)*65536)
+    ...     u = 0.5*np.sin(2*np.pi*t*17./8192)
+    ...     v, xn, _, _ = simulateDSM(u, ntf, x0=xn)
+    ...     _ = est.update(v)
+    >>> f, Pvv = est.psd()
+    """
+    def __init__(self, nperseg=4096, fs=1, window='hann', noverlap=None,
+                 detrend='constant', scaling='density', return_onesided=True,
+                 **options):
+        opts = digested_options(options, WelchPSD.default_options,
+                                ['batch'])
+        self.nperseg = int(nperseg)
+        if self.nperseg < 1:
+            raise ValueError('nperseg must be a positive integer')
+        self.fs = float(fs)
+        if noverlap is None:
+            noverlap = self.nperseg//2
+        self.noverlap = int(noverlap)
+        if self.noverlap < 0 or self.noverlap >= self.nperseg:
+            raise ValueError('noverlap must be in [0, nperseg)')
+        if isinstance(window, str) or isinstance(window, tuple):
+            win = sp.signal.get_window(window, self.nperseg)
+        else:
+            win = np.asarray(window, dtype=np.float64)
+            if win.shape != (self.nperseg,):
+                raise ValueError('window must be a 1-D array of length '
+                                 'nperseg')
+        self.window = win
+        if detrend not in ('constant', 'linear', False, None):
+            raise ValueError("detrend must be 'constant', 'linear' or False")
+        self.detrend = detrend
+        if scaling == 'density':
+            self._scale = 1./(self.fs*np.sum(win**2))
+        elif scaling == 'spectrum':
+            self._scale = 1./np.sum(win)**2
+        else:
+            raise ValueError("scaling must be 'density' or 'spectrum'")
+        self.scaling = scaling
+        self.return_onesided = bool(return_onesided)
+        self.batch = max(int(opts['batch']), 1)
+        self.reset()
+
+    def reset(self):
+        """
+        Discards all the accumulated data.
+        """
+        self.nsegments = 0
+        self.nsamples = 0
+        self._tail = None
+        self._acc = None
+        self._squeeze = None
+
+    def update(self, x):
+        """
+        Feeds a block of samples to the estimator.
+
+        Parameters
+        ----------
+        x : array_like
+            next block of the signal. Either 1-D or 2-D with one channel
+            per row. All the blocks must have the same number of channels.
+
+        Returns
+        -------
+        self : WelchPSD
+            the estimator itself, to allow chaining
+        """
+        x = np.asarray(x)
+        squeeze = (x.ndim == 1)
+        x = np.atleast_2d(x)
+        if x.ndim != 2:
+            raise ValueError('blocks must be 1-D or 2-D arrays')
+        if np.iscomplexobj(x):
+            if self.return_onesided:
+                raise ValueError('cannot return a one-sided spectrum '
+                                 'for a complex signal')
+            dtype = np.complex128
+        else:
+            dtype = np.float64
+        if self._tail is None:
+            self._squeeze = squeeze
+            self._tail = np.zeros((x.shape[0], 0), dtype=dtype)
+            nfreq = (self.nperseg//2+1 if self.return_onesided
+                     else self.nperseg)
+            self._acc = np.zeros((x.shape[0], nfreq))
+        elif x.shape[0] != self._tail.shape[0]:
+            raise ValueError('number of channels changed between blocks')
+        buf = np.concatenate((self._tail, x.astype(dtype)), axis=1)
+        self.nsamples += x.shape[1]
+        step = self.nperseg-self.noverlap
+        if buf.shape[1] < self.nperseg:
+            self._tail = buf
+            return self
+        nseg = (buf.shape[1]-self.nperseg)//step+1
+        segs = np.lib.stride_tricks.as_strided(
+            buf, shape=(buf.shape[0], nseg, self.nperseg),
+            strides=(buf.strides[0], step*buf.strides[1], buf.strides[1]),
+            writeable=False)
+        for k in range(0, nseg, self.batch):
+            self._acc += self._power(segs[:, k:k+self.batch, :])
+        self.nsegments += nseg
+        self._tail = buf[:, nseg*step:].copy()
+        return self
+
+    def _power(self, segs):
+        if self.detrend == 'constant':
+            segs = segs-np.mean(segs, axis=-1, keepdims=True)
+        elif self.detrend == 'linear':
+            segs = sp.signal.detrend(segs, axis=-1, type='linear')
+        segs = segs*self.window
+        if self.return_onesided:
+            X = np.fft.rfft(segs, axis=-1)
+        else:
+            X = np.fft.fft(segs, axis=-1)
+        return np.sum(X.real**2+X.imag**2, axis=1)
+
+    def psd(self):
+        """
+        Returns the current estimate of the power spectral density.
+
+        Returns
+        -------
+        f : ndarray
+            frequencies of the spectral samples
+        Pxx : ndarray
+            power spectral density (or power spectrum, depending on
+            `scaling`) averaged over all the segments fed so far. 2-D,
+            with one row per channel, if the blocks were 2-D.
+
+        Raises
+        ------
+        ValueError
+            if not enough samples to fill a segment have been fed yet
+        """
+        if self.nsegments == 0:
+            raise ValueError('not enough samples to fill a segment')
+        Pxx = self._acc*(self._scale/self.nsegments)
+        if self.return_onesided:
+            f = np.fft.rfftfreq(self.nperseg, 1./self.fs)
+            if self.nperseg % 2 == 0:
+                Pxx[:, 1:-1] *= 2
+            else:
+                Pxx[:, 1:] *= 2
+        else:
+            f = np.fft.fftfreq(self.nperseg, 1./self.fs)
+        if self._squeeze:
+            Pxx = Pxx[0]
+        return f, Pxx
+
+WelchPSD.default_options = {"batch": 64}
+
+
+# Coefficients of the cosine-sum windows supported by ToneExtractor,
+# w[n] = sum_k (-1)**k a[k] cos(2 pi k n/N), as in scipy.signal.get_window
+_cosine_windows = {
+    'boxcar': (1.,),
+    'hann': (0.5, 0.5),
+    'hanning': (0.5, 0.5),
+    'hamming': (0.54, 0.46),
+    'blackman': (0.42, 0.5, 0.08),
+    'nuttall': (0.3635819, 0.4891775, 0.1365995, 0.0106411),
+    'blackmanharris': (0.35875, 0.48829, 0.14128, 0.01168),
+    'flattop': (0.21557895, 0.41663158, 0.277263158, 0.083578947,
+                0.006947368)}
+
+
+class ToneExtractor(object):
+    """
+    Streaming extraction of tones at given frequencies.
+
+    Computes the amplitude and phase of the components of a signal at a
+    set of frequencies, for many signals at once, evaluating the DFT only
+    at the requested frequencies. The signal is delivered one block at a
+    time, and memory use does not depend on its length.
+
+    Parameters
+    ----------
+    f : real or array_like
+        frequencies of the tones. Need not be on the DFT grid.
+    fs : real, optional
+        sample frequency of the signal (defaults to 1)
+    window : str or None, optional
+        a cosine-sum window ('hann', 'hamming', 'blackman', 'nuttall',
+        'blackmanharris', 'flattop') or None for no window (defaults to
+        'hann')
+    nsamples : int, optional
+        overall length of the signal. Required if a window is used, since
+        the window spans the whole signal (defaults to None)
+    t0 : int, optional
+        time index of the first sample, used as phase reference (defaults
+        to 0)
+
+    Other Parameters
+    ----------------
+    block : int, optional
+        maximum number of samples processed at once. Bounds the memory
+        used by the DFT kernel (defaults to 4096)
+
+    Notes
+    -----
+    The result for a tone at frequency f is the phasor X such that the
+    signal component is ``abs(X)*cos(2*pi*f/fs*n+angle(X))``, with n the
+    time index. The estimate is the windowed DFT at f, normalized by the
+    window sum and doubled, except at DC and at the Nyquist frequency.
+    Since cosine-sum windows are sums of complex exponentials, the windowed
+    DFT is obtained exactly from un-windowed ones at the frequencies
+    ``f+k*fs/nsamples``, which is what makes streaming possible.
+
+    Signals can be 1-D or N-D arrays, with time along the last axis, in
+    which case the leading dimensions are preserved in the output.
+
+    See Also
+    --------
+    extract_tones : one-shot interface, for signals held in memory.
+    """
+    def __init__(self, f, fs=1, window='hann', nsamples=None, t0=0,
+                 **options):
+        opts = digested_options(options, ToneExtractor.default_options,
+                                ['block'])
+        self.block = max(int(opts['block']), 1)
+        self._fshape = np.shape(f)
+        self._nu = np.atleast_1d(np.asarray(f, dtype=np.float64))/fs
+        if window is None:
+            window = 'boxcar'
+        if window not in _cosine_windows:
+            raise ValueError('unsupported window, use one of ' +
+                             ', '.join(sorted(_cosine_windows)))
+        a = np.asarray(_cosine_windows[window])
+        kk = np.arange(1-len(a), len(a))
+        self._coeffs = (-1.)**np.abs(kk)*a[np.abs(kk)]/2
+        self._coeffs[len(a)-1] = a[0]
+        self._wsum = a[0]
+        if len(a) > 1:
+            if nsamples is None:
+                raise ValueError('nsamples is required with a window')
+            self._nu_all = (self._nu[:, np.newaxis] +
+                            kk[np.newaxis, :]/float(nsamples)).ravel()
+        else:
+            self._nu_all = self._nu.copy()
+        self.nsamples = nsamples
+        self.t0 = t0
+        self.reset()
+
+    def reset(self):
+        """
+        Discards all the accumulated data.
+        """
+        self.n = 0
+        self._acc = None
+        self._lshape = None
+        self._kernel = None
+
+    def _get_kernel(self, m):
+        if self._kernel is not None and self._kernel[0] == m:
+            return self._kernel[1]
+        ph = 2*np.pi*np.outer(np.arange(m), self._nu_all)
+        kernel = (np.cos(ph), -np.sin(ph))
+        if m == self.block:
+            self._kernel = (m, kernel)
+        return kernel
+
+    def update(self, x):
+        """
+        Feeds a block of samples to the extractor.
+
+        Parameters
+        ----------
+        x : array_like
+            next block of the signal, with time along the last axis. All
+            blocks must have the same leading dimensions.
+
+        Returns
+        -------
+        self : ToneExtractor
+            the extractor itself, to allow chaining
+        """
+        x = np.asarray(x)
+        if self._acc is None:
+            self._lshape = x.shape[:-1]
+            self._acc = np.zeros((int(np.prod(self._lshape)),
+                                  len(self._nu_all)), dtype=np.complex128)
+        elif x.shape[:-1] != self._lshape:
+            raise ValueError('block shape changed between updates')
+        x = x.reshape(-1, x.shape[-1])
+        if self.nsamples is not None and \
+                self.n+x.shape[1] > self.nsamples:
+            raise ValueError('more than nsamples samples fed')
+        for k in range(0, x.shape[1], self.block):
+            xb = x[:, k:k+self.block]
+            kc, ks = self._get_kernel(xb.shape[1])
+            rot = np.exp(-2j*np.pi*np.mod(self._nu_all*self.n, 1.))
+            self._acc += (np.dot(xb, kc)+1j*np.dot(xb, ks))*rot
+            self.n += xb.shape[1]
+        return self
+
+    def tones(self):
+        """
+        Returns the phasors of the tones.
+
+        Returns
+        -------
+        X : complex or ndarray
+            phasors of the tones, with shape given by the leading
+            dimensions of the signal followed by the shape of `f`
+
+        Raises
+        ------
+        ValueError
+            if no data has been fed or, when a window is used, if
+            fewer than nsamples samples have been fed
+        """
+        if self.n == 0:
+            raise ValueError('no data fed yet')
+        if self.nsamples is not None and len(self._coeffs) > 1 and \
+                self.n != self.nsamples:
+            raise ValueError('the windowed signal is incomplete')
+        acc = self._acc.reshape(self._acc.shape[0], len(self._nu), -1)
+        X = np.dot(acc, self._coeffs)/(self._wsum*self.n)
+        X *= np.exp(-2j*np.pi*np.mod(self._nu*self.t0, 1.))
+        # Tones at DC and at Nyquist are not split in two
+        X *= np.where(np.mod(2*self._nu, 1.) == 0, 1., 2.)
+        return X.reshape(self._lshape+self._fshape)[()]
+
+ToneExtractor.default_options = {"block": 4096}
+
+
+def extract_tones(x, f, fs=1, window='hann', t0=0, **options):
+    """
+    Extracts the amplitude and phase of tones at given frequencies.
+
+    Evaluates the windowed DFT of the signal (or of many signals at once)
+    only at the requested frequencies, which need not lie on the DFT grid.
+    With few frequencies, this is much cheaper than a full FFT.
+
+    Parameters
+    ----------
+    x : array_like
+        the signal, with time along the last axis. Leading axes index
+        different signals.
+    f : real or array_like
+        frequencies of the tones
+    fs : real, optional
+        sample frequency of the signal (defaults to 1)
+    window : str or tuple or array_like or None, optional
+        window applied to the signal. Either None, a spec accepted by
+        :func:`scipy.signal.get_window` or an array as long as the signal
+        (defaults to 'hann')
+    t0 : int, optional
+        time index of the first sample of x, used as phase reference
+        (defaults to 0)
+
+    Returns
+    -------
+    X : complex or ndarray
+        phasors of the tones, with shape given by the leading dimensions
+        of x followed by the shape of f. The component of x at frequency
+        f is ``abs(X)*cos(2*pi*f/fs*n+angle(X))``, n being the time index.
+
+    Other Parameters
+    ----------------
+    block : int, optional
+        maximum number of samples processed at once (defaults to 4096)
+
+    See Also
+    --------
+    ToneExtractor : streaming version, for signals delivered in blocks.
+
+    Examples
+    --------
+    Harmonics of a distorted tone, in many signals at once:
+
+    >>> import numpy as np
+    >>> from pydsm.ft import extract_tones
+    >>> n = np.arange(10000)
+    >>> g = np.array([[1.], [0.5]])
+    >>> x = np.cos(2*np.pi*0.01*n+g)+0.01*np.cos(2*np.pi*0.03*n)
+    >>> np.abs(extract_tones(x, [0.01, 0.02, 0.03])).round(4)
+    array([[1.  , 0.  , 0.01],
+           [1.  , 0.  , 0.01]])
+    >>> np.angle(extract_tones(x, 0.01)).round(4)
+    array([1. , 0.5])
+    """
+    x = np.asarray(x)
+    nsamples = x.shape[-1]
+    if window is None or (isinstance(window, str) and
+                          window in _cosine_windows):
+        ext = ToneExtractor(f, fs, window, nsamples, t0, **options)
+        return ext.update(x).tones()
+    if isinstance(window, str) or isinstance(window, tuple):
+        win = sp.signal.get_window(window, nsamples)
+    else:
+        win = np.asarray(window, dtype=np.float64)
+    ext = ToneExtractor(f, fs, None, None, t0, **options)
+    return ext.update(x*win).tones()*(nsamples/np.sum(win))
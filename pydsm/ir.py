@@ -23,8 +23,9 @@ Computation of the impulse response of a DT filter (:mod:`pydsm.ir`)
 ====================================================================
 
 Compute (approximating by truncation) the impulse response
-of a discrete time filter, trying to (roughly) guess the appropriate
-truncation.
+of a discrete time filter. The truncation point is found from the energy
+still to come in the response, which is known exactly for stable filters
+from their observability Gramian.
 
 .. currentmodule:: pydsm.ir
 
@@ -36,15 +37,130 @@ Functions
 
     guess_ir_length  -- Guess appropriate truncation length
     impulse_response  -- Compute impulse response of DT filter
+    impulse_responses  -- Compute impulse responses of many DT filters
+    iter_impulse_response  -- Compute impulse response in chunks
 """
 
 
 
+import warnings
 import numpy as np
-import scipy as sp
-__import__("scipy.signal")
+from ._lazy import lazy_module
+sp = lazy_module('scipy')
+from .tf import TF
 
-__all__ = ["impulse_response", "guess_ir_length"]
+__all__ = ["impulse_response", "impulse_responses", "iter_impulse_response",
+           "guess_ir_length"]
+
+
+# Largest block computed at once when looking for the end of a response
+_IR_BLOCK = 1 << 16
+
+
+def _ir_sos(h):
+    # Second order sections of h. The impulse response is computed on the
+    # cascade, which is far better conditioned than the direct form for
+    # high order filters with clustered poles
+    if isinstance(h, TF):
+        return h.cached('ir_sos', lambda: _ir_sos(tuple(h)))
+    if len(h) == 3:
+        try:
+            return sp.signal.zpk2sos(*h)
+        except ValueError:
+            # Poles or zeros not in conjugate pairs
+            (b, a) = sp.signal.zpk2tf(*h)
+            return sp.signal.tf2sos(b.real, a.real)
+    return sp.signal.tf2sos(*h)
+
+
+def _ir_zpk(sos):
+    # Zeros and poles of the cascade, section by section
+    z = np.concatenate([np.roots(s[:3]) for s in sos])
+    p = np.concatenate([np.roots(s[3:]) for s in sos])
+    return z, p, np.prod(sos[:, 0])
+
+
+def _ir_gramian(h, sos):
+    # Observability Gramian of the zero input dynamics of the cascade run
+    # by sosfilt. If z is its (flattened) state, z^T W z is the energy of
+    # all the output samples still to come. None if the filter is not
+    # asymptotically stable.
+    if isinstance(h, TF):
+        return h.cached('ir_gramian', lambda: _ir_gramian(None, sos))
+    p = _ir_zpk(sos)[1]
+    if len(p) > 0 and np.max(np.abs(p)) >= 1:
+        return None
+    n = 2*len(sos)
+    # Next state and output from each unit state, in a single run
+    zi = np.zeros((len(sos), n, 2))
+    j = np.arange(n)
+    zi[j//2, j, j % 2] = 1.
+    y, zf = sp.signal.sosfilt(sos, np.zeros((n, 1)), zi=zi)
+    A = zf.transpose(1, 0, 2).reshape(n, n).T
+    C = y[:, 0]
+    with warnings.catch_warnings():
+        # The Gramian is often ill-conditioned, but the energies computed
+        # from it are accurate
+        warnings.simplefilter('ignore', sp.linalg.LinAlgWarning)
+        W = sp.linalg.solve_discrete_lyapunov(A.T, np.outer(C, C))
+    if not np.all(np.isfinite(W)):
+        return None
+    return W
+
+
+def _ir_tail(W, z):
+    # Energy still to come from the state z of the cascade
+    z = z.reshape(-1)
+    return np.dot(z, np.dot(W, z))
+
+
+def _ir_blocks(h, m, db, step):
+    # Generator of consecutive blocks of the impulse response of h. The
+    # first block is the sample at time 0, the following ones are step
+    # samples long, or doubling in length from an initial guess if step
+    # is None.
+    sos = _ir_sos(h)
+    if m is None:
+        W = _ir_gramian(h, sos)
+        if W is None:
+            raise ValueError('Invalid argument: the filter is not stable, '
+                             'the response length m must be given')
+    elif m <= 0:
+        return
+    y, z = sp.signal.sosfilt(sos, [1.], zi=np.zeros((len(sos), 2)))
+    yield y
+    length = 1
+    if m is None:
+        tail = _ir_tail(W, z)
+        target = (y[0]**2+tail)*10**(-db/10.)
+        if tail <= target:
+            return
+    if step is None:
+        nxt = (min(max(guess_ir_length(_ir_zpk(sos), db), 16), _IR_BLOCK)
+               if m is None else m)
+    else:
+        nxt = step
+    while m is None or length < m:
+        ll = nxt if m is None else min(nxt, m-length)
+        y, zn = sp.signal.sosfilt(sos, np.zeros(ll), zi=z)
+        if m is None:
+            # Energy left after each sample of the block
+            left = tail-np.cumsum(y**2)
+            stop = np.flatnonzero(left <= target)
+            if len(stop) > 0 and stop[0]+1 < ll:
+                # Estimated by difference, this is inaccurate when the
+                # tail is small. Move to the candidate end and check there
+                ll = stop[0]+1
+                y = y[:ll]
+                zn = sp.signal.sosfilt(sos, np.zeros(ll), zi=z)[1]
+            tail = _ir_tail(W, zn)
+        z = zn
+        yield y
+        length += ll
+        if m is None and tail <= target:
+            return
+        if step is None:
+            nxt = min(2*nxt, _IR_BLOCK)
 
 
 def impulse_response(h, m=None, db=80):
@@ -54,39 +170,146 @@ def impulse_response(h, m=None, db=80):
     Parameters
     ----------
     h : tuple_like
-        the filter definition either in zpk or in nd form.
+        the filter definition either in zpk or in nd form, or a
+        :class:`pydsm.tf.TF`.
 
     Returns
     -------
     ir : ndarray
-        the truncated impulse response
+        the truncated impulse response. If h is a TF, this is a read only
+        array, cached with h.
 
     Other Parameters
     ----------------
     m : int, optional
         the number of samples after which the impulse response should be
-        truncated. Defaults to None, which means *try to guess*
+        truncated. Defaults to None, which means *truncate when the
+        response is exhausted up to db*
     db : real, optional
-        a hint about how to guess the length where the impuls response
-        should be truncated (defaults to 80)
+        when m is None, the response is truncated as soon as the energy
+        of the discarded tail is at least db decibels below the energy of
+        the whole response (defaults to 80)
+
+    Raises
+    ------
+    ValueError
+        if m is None and the filter is not asymptotically stable.
 
     Notes
     -----
-    The guess about the lenght where the impulse response can be truncated
-    is extremely rough. See :func:`guess_ir_length` in this module for
-    further info.
+    The energy of the tail is obtained exactly from the filter state
+    and the observability Gramian of the filter, so that filters with
+    repeated or clustered poles are dealt with correctly. The response is
+    computed by blocks, the first one as long as the rough guess made by
+    :func:`guess_ir_length`, and stops at the first sample that meets the
+    db target.
+
+    See also
+    --------
+    impulse_responses : impulse responses of many filters
+    iter_impulse_response : impulse response computed in chunks
     """
-    if len(h) == 3:
-        (b, a) = sp.signal.zpk2tf(*h)
-        b = b.real
-        a = a.real
-    else:
-        (b, a) = h
-    if m is None:
-        m = guess_ir_length(h, db)
-    ins = np.zeros(m)
-    ins[0] = 1
-    return sp.signal.lfilter(b, a, ins)
+    if isinstance(h, TF):
+        return h.impulse_response(m, db)
+    return np.concatenate([np.zeros(0)]+list(_ir_blocks(h, m, db, None)))
+
+
+def impulse_responses(hh, m=None, db=80):
+    """
+    Computes the impulse responses of many filters at once
+
+    Parameters
+    ----------
+    hh : sequence of tuple_like
+        the filter definitions, each either in zpk or in nd form, or a
+        :class:`pydsm.tf.TF`.
+
+    Returns
+    -------
+    irs : list of ndarray
+        the truncated impulse responses, in the same order as hh. When m
+        is None, each one has its own length.
+
+    Other Parameters
+    ----------------
+    m : int, optional
+        the number of samples after which the impulse responses should be
+        truncated. Defaults to None, which means *truncate each response
+        when it is exhausted up to db*
+    db : real, optional
+        target for the energy of the discarded tails, as in
+        :func:`impulse_response` (defaults to 80)
+
+    Raises
+    ------
+    ValueError
+        if m is None and any of the filters is not asymptotically stable.
+
+    Notes
+    -----
+    This is meant for optimization loops evaluating the responses of
+    whole families of candidate filters. TFs among the filters get their
+    response cached as in :func:`impulse_response`.
+    """
+    return [impulse_response(h, m, db) for h in hh]
+
+
+def iter_impulse_response(h, m=None, db=80, chunk=4096):
+    """
+    Computes the filter impulse response, chunk by chunk
+
+    Parameters
+    ----------
+    h : tuple_like
+        the filter definition either in zpk or in nd form, or a
+        :class:`pydsm.tf.TF`.
+
+    Yields
+    ------
+    ir_chunk : ndarray
+        consecutive pieces of the truncated impulse response, all chunk
+        samples long but the last one.
+
+    Other Parameters
+    ----------------
+    m : int, optional
+        the number of samples after which the impulse response should be
+        truncated. Defaults to None, which means *truncate when the
+        response is exhausted up to db*
+    db : real, optional
+        target for the energy of the discarded tail, as in
+        :func:`impulse_response` (defaults to 80)
+    chunk : int, optional
+        the number of samples in each chunk. Defaults to 4096.
+
+    Raises
+    ------
+    ValueError
+        if m is None and the filter is not asymptotically stable.
+
+    Notes
+    -----
+    Only one chunk is kept in memory at a time, so that very long (or
+    very slowly decaying) responses can be processed on the fly.
+    Concatenating the chunks gives the same result as
+    :func:`impulse_response`.
+    """
+    chunk = int(chunk)
+    if chunk < 1:
+        raise ValueError('Invalid argument: chunk must be positive')
+    blocks = _ir_blocks(h, m, db, chunk)
+    first = next(blocks, None)
+    if first is None:
+        return
+    # The first sample is computed alone, join it to the next block
+    buf = first
+    for y in blocks:
+        buf = np.concatenate((buf, y))
+        if len(buf) >= chunk:
+            yield buf[:chunk]
+            buf = buf[chunk:]
+    if len(buf) > 0:
+        yield buf
 
 
 def guess_ir_length(h, db=80):
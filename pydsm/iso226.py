@@ -90,11 +90,12 @@ where the behavior found at 20 Hz is replicated.
 
 
 import numpy as np
-from scipy.interpolate import InterpolatedUnivariateSpline
+from scipy.interpolate import (InterpolatedUnivariateSpline,
+                               RectBivariateSpline)
 
 __all__ = ["tabled_f", "tabled_alpha_f", "tabled_L_U", "tabled_T_f",
            "tabled_L_p", "tabled_L_N",
-           "iso226_spl_contour", "iso226_spl_itpl"]
+           "iso226_spl_contour", "iso226_spl_itpl", "ISO226Surface"]
 
 # Tabled ISO 226 parameters
 tbl_f = np.asarray(
@@ -115,6 +116,11 @@ tbl_T_f = np.asarray(
      -1.5, 6.0, 12.6, 13.9, 12.3])
 
 
+def _hfe_append(tbl):
+    # Replicate the 20 Hz entry at 20 kHz, along the last axis
+    return np.concatenate((tbl, tbl[..., :1]), axis=-1)
+
+
 def tabled_f(hfe=False):
     """Table of frequencies in ISO 226.
 
@@ -188,13 +194,12 @@ def tabled_T_f(hfe=False):
     return np.append(tbl_T_f, tbl_T_f[0]) if hfe else tbl_T_f
 
 
-# Check that it works fine when L_N is array
 def tabled_A_f(L_N, hfe=False):
     """Table of A_f values for given loundess in ISO 226.
 
     Parameters
     ----------
-    L_N : float
+    L_N : float or array of floats
         percieved loudness level in phons
     hfe : bool
         whether the table should be augmented with a data point
@@ -203,7 +208,8 @@ def tabled_A_f(L_N, hfe=False):
     Returns
     -------
     A_f : array of floats
-        the A_f table.
+        the A_f table. If L_N is an array, the table is extended along a
+        new last axis.
 
     Notes
     -----
@@ -211,12 +217,12 @@ def tabled_A_f(L_N, hfe=False):
     are measured in dBs by referring to a reference pressure level P0 (close
     to the hearing threshold at 1 kHz and set to 20 uPa RMS).
     """
+    L_N = np.asarray(L_N)[..., np.newaxis]
     A_f = (4.47E-3*(10.0**(0.025*L_N)-1.15) +
            (0.4*10.0**((tbl_T_f+tbl_L_U)/10.0-9.0))**tbl_alpha_f)
-    return np.append(A_f, A_f[0]) if hfe else A_f
+    return _hfe_append(A_f) if hfe else A_f
 
 
-# Check that it works fine when L_N is array
 def tabled_L_p(L_N, hfe=False):
     """Table of sound pressure levels for given loudness in ISO 226.
 
@@ -224,7 +230,7 @@ def tabled_L_p(L_N, hfe=False):
 
     Parameters
     ----------
-    L_N : float
+    L_N : float or array of floats
         percieved loudness level in phons
     hfe : bool
         whether the table should be augmented with a data point
@@ -234,7 +240,8 @@ def tabled_L_p(L_N, hfe=False):
     -------
     L_p : array of floats
         the sound pressure level table. Sound pressure levels are returned
-        in DB_SPL
+        in DB_SPL. If L_N is an array, the table is extended along a new
+        last axis, so that ``L_p[i]`` is the table for ``L_N[i]``.
 
     Notes
     -----
@@ -243,7 +250,7 @@ def tabled_L_p(L_N, hfe=False):
     to the hearing threshold at 1 kHz and set to 20 uPa RMS).
     """
     L_p = (10.0/tbl_alpha_f)*np.log10(tabled_A_f(L_N))-tbl_L_U + 94.0
-    return np.append(L_p, L_p[0]) if hfe else L_p
+    return _hfe_append(L_p) if hfe else L_p
 
 
 # Check that it works fine when L_P is array
@@ -375,3 +382,141 @@ def iso226_spl_itpl(L_N=40, hfe=False, k=3):
     """
     ff, yy = iso226_spl_contour(L_N, hfe)
     return InterpolatedUnivariateSpline(ff, yy, k=k)
+
+
+class ISO226Surface(object):
+    """Precomputed surface of equal loudness contours.
+
+    The sound pressure levels of ISO 226 sect 4.1 are tabled once over a
+    fine grid of loudness levels and interpolated by a tensor product
+    spline, so that the equivalent sound pressure level can be evaluated
+    at arrays of (frequency, loudness) pairs at once.
+
+    Parameters
+    ----------
+    hfe : bool
+        whether the table should be augmented with a data point
+        at 20 kHz (High-Frequency-Enhanced table)
+    k : int
+        interpolation order along the frequency axis
+    L_N_step : float, optional
+        spacing of the loudness level grid in phons. Defaults to 0.5.
+
+    Attributes
+    ----------
+    f : ndarray
+        tabled frequencies
+    L_N : ndarray
+        loudness levels grid
+    spl : ndarray
+        sound pressure levels, with ``spl[i, j]`` at ``L_N[i]`` and ``f[j]``
+
+    Notes
+    -----
+    Along the frequency axis, the surface interpolates the tabled data as
+    :func:`iso226_spl_itpl` does. Along the loudness axis, where the ISO 226
+    formulas are smooth, a cubic spline on the fine grid is used. With the
+    default grid, the discrepancy from the contours interpolated at the
+    exact loudness level is below 1E-3 dB. Frequencies outside the tabled
+    range are clipped to it, rather than extrapolated.
+
+    Use the :meth:`table` method to evaluate whole families of contours on
+    a common frequency grid. Use the :meth:`itpl` method when the contour
+    interpolation object itself is needed: it is built once per loudness
+    level and cached.
+
+    Examples
+    --------
+    >>> surface = ISO226Surface()
+    >>> spl = surface([100., 1000., 4000.], [20., 40., 60.])
+    >>> spl.shape
+    (3,)
+    >>> abs(spl[1] - 40.) < 0.1
+    True
+    """
+
+    def __init__(self, hfe=False, k=3, L_N_step=0.5):
+        self.hfe = hfe
+        self.k = k
+        self.f = tabled_f(hfe)
+        self.L_N = np.linspace(0., 90., int(np.ceil(90./L_N_step))+1)
+        self.spl = tabled_L_p(self.L_N, hfe)
+        self._surface = RectBivariateSpline(self.L_N, self.f, self.spl,
+                                            kx=3, ky=k)
+        self._itpl = {}
+
+    def __call__(self, f, L_N=40):
+        """Equivalent sound pressure level.
+
+        Parameters
+        ----------
+        f : float or array of floats
+            frequencies in Hz
+        L_N : float or array of floats, optional
+            perceived loudness levels in phons. Broadcast against f.
+
+        Returns
+        -------
+        spl : float or ndarray
+            equivalent sound pressure levels in dB_SPL
+        """
+        f, L_N = np.broadcast_arrays(np.asarray(f, dtype=float),
+                                     np.asarray(L_N, dtype=float))
+        if np.any(L_N < 0) or np.any(L_N > 90):
+            raise ValueError('Parameter L_N out of bounds [0-90].')
+        return self._surface.ev(L_N, f)[()]
+
+    def table(self, f, L_N):
+        """Table of equivalent sound pressure levels.
+
+        Evaluates the surface on the grid formed by f and L_N, which is
+        much faster than evaluating it at the corresponding pairs.
+
+        Parameters
+        ----------
+        f : array of floats
+            frequencies in Hz
+        L_N : array of floats
+            perceived loudness levels in phons
+
+        Returns
+        -------
+        spl : ndarray
+            equivalent sound pressure levels in dB_SPL, with ``spl[i, j]``
+            at loudness ``L_N[i]`` and frequency ``f[j]``
+        """
+        f = np.asarray(f, dtype=float).ravel()
+        L_N = np.asarray(L_N, dtype=float).ravel()
+        if np.any(L_N < 0) or np.any(L_N > 90):
+            raise ValueError('Parameter L_N out of bounds [0-90].')
+        # Grid evaluation needs sorted coordinates
+        fi = np.argsort(f)
+        li = np.argsort(L_N)
+        spl = np.empty((L_N.size, f.size))
+        spl[np.ix_(li, fi)] = self._surface(L_N[li], f[fi])
+        return spl
+
+    def itpl(self, L_N=40):
+        """Interpolation of an equal loudness contour.
+
+        Same as :func:`iso226_spl_itpl`, with the interpolation objects
+        cached by loudness level.
+
+        Parameters
+        ----------
+        L_N : float, optional
+            perceived loudness level in phons.
+
+        Returns
+        -------
+        itpl : univariate interpolation object
+            function-like object that takes a frequency f as its input and
+            returns the equivalent sound pressure level at f
+        """
+        L_N = float(L_N)
+        try:
+            return self._itpl[L_N]
+        except KeyError:
+            itpl = iso226_spl_itpl(L_N, self.hfe, self.k)
+            self._itpl[L_N] = itpl
+            return itpl
@@ -204,7 +204,9 @@ def cplxpair(x, tol=None, dim=None):
 
     If the input vector is a multidimensional array, the rearrangement is done
     working along the axis specifid by the parameter ``dim`` or along the
-    first axis with non-unitary length if ``dim`` is not provided.
+    first axis with non-unitary length if ``dim`` is not provided. All the
+    vectors along that axis are paired at once, so that large batches of
+    root sets can be processed in a single call.
 
     Parameters
     ----------
@@ -224,6 +226,7 @@ def cplxpair(x, tol=None, dim=None):
         y is an array of complex values, with the same values in x, yet now
         sorted as complex pairs by increasing real part. Real elements in x
         are place after the complex pairs, sorted in increasing order.
+        y is real if there are no complex pairs in x.
 
     Raises
     ------
@@ -257,40 +260,6 @@ def cplxpair(x, tol=None, dim=None):
     eps : the system floating point accuracy
     """
 
-    def cplxpair_vec(x, tol):
-        real_mask = np.abs(x.imag) <= tol*np.abs(x)
-        x_real = np.sort(np.real(x[real_mask]))
-        x_cplx = np.sort(x[np.logical_not(real_mask)])
-        if x_cplx.size == 0:
-            return x_real
-        if (x_cplx.size % 2) != 0:
-            raise ValueError('Complex numbers cannot be paired')
-        if np.any(np.real(x_cplx[1::2])-np.real(x_cplx[0::2]) >
-                  tol*np.abs(x_cplx[0::2])):
-            raise ValueError('Complex numbers cannot be paired')
-        start = 0
-        while start < x_cplx.size:
-            sim_len = next((i for i, v in enumerate(x_cplx[start+1:]) if
-                           (np.abs(np.real(v)-np.real(x_cplx[start])) >
-                            tol*np.abs(v))), x_cplx.size-start-1)+1
-            if (sim_len % 2) != 0:
-                sim_len -= 1
-            # At this point, sim_len elements with identical real part
-            # have been identified.
-            sub_x = x_cplx[start:start+sim_len]
-            srt = np.argsort(np.imag(sub_x))
-            sub_x = sub_x[srt]
-            if np.any(np.abs(np.imag(sub_x)+np.imag(sub_x[::-1])) >
-                      tol*np.abs(sub_x)):
-                raise ValueError('Complex numbers cannot be paired')
-            # Output should contain "perfect" pairs. Hence, keep entries
-            # with positive imaginary parts amd use conjugate for pair
-            x_cplx[start:start+sim_len] = np.concatenate(
-                (np.conj(sub_x[:sim_len//2-1:-1]),
-                 sub_x[:sim_len//2-1:-1]))
-            start += sim_len
-        return np.concatenate((x_cplx, x_real))
-
     x = np.atleast_1d(x)
     if x.size == 0:
         return x
@@ -299,6 +268,58 @@ def cplxpair(x, tol=None, dim=None):
     if tol is None:
         try:
             tol = 100*eps(x.dtype)
-        except:
-            tol = 100*eps(np.float)
-    return np.apply_along_axis(cplxpair_vec, dim, x, tol)
+        except ValueError:
+            tol = 100*eps(float)
+    # Work on a batch of rows, one per vector along dim
+    xx = x.swapaxes(dim, -1)
+    shape = xx.shape
+    xx = xx.reshape(-1, shape[-1])
+    nr, n = xx.shape
+    rows = np.repeat(np.arange(nr), n)
+    xx = xx.reshape(-1)
+    real_mask = np.abs(xx.imag) <= tol*np.abs(xx)
+    # Complex values first, by increasing real and imaginary part, then
+    # the real ones, by increasing value, row by row
+    srt = np.lexsort((np.where(real_mask, 0, xx.imag), xx.real,
+                      real_mask, rows))
+    xx = xx[srt]
+    n_cplx = n-np.count_nonzero(real_mask.reshape(nr, n), axis=1)
+    if not np.any(n_cplx):
+        y = xx.real
+    else:
+        if np.any(n_cplx % 2 != 0):
+            raise ValueError('Complex numbers cannot be paired')
+        # Positions of the complex values in xx
+        pos = np.arange(n)
+        cplx = (pos < n_cplx[:, np.newaxis]).reshape(-1)
+        first = np.tile(pos == 0, nr)[cplx]
+        x_cplx = xx[cplx]
+        if np.any(x_cplx[1::2].real-x_cplx[0::2].real >
+                  tol*np.abs(x_cplx[0::2])):
+            raise ValueError('Complex numbers cannot be paired')
+        # Groups of pairs with the same real part, each sorted by
+        # increasing imaginary part
+        start = first.copy()
+        start[2::2] |= (x_cplx[2::2].real-x_cplx[1:-1:2].real >
+                        tol*np.abs(x_cplx[2::2]))
+        group = np.cumsum(start)-1
+        x_cplx = x_cplx[np.lexsort((x_cplx.imag, group))]
+        g_start = np.flatnonzero(start)
+        g_len = np.diff(np.append(g_start, len(x_cplx)))
+        g_start = g_start[group]
+        g_len = g_len[group]
+        offset = np.arange(len(x_cplx))-g_start
+        mirror = x_cplx[g_start+g_len-1-offset]
+        if np.any(np.abs(x_cplx.imag+mirror.imag) > tol*np.abs(x_cplx)):
+            raise ValueError('Complex numbers cannot be paired')
+        # Output should contain "perfect" pairs. Hence, keep entries
+        # with positive imaginary parts and use conjugate for pair.
+        # These are in decreasing order of imaginary part, the conjugates
+        # first
+        half = g_len//2
+        low = offset < half
+        src = x_cplx[g_start+g_len-1-np.where(low, offset, offset-half)]
+        xx[~cplx] = xx[~cplx].real
+        xx[cplx] = np.where(low, np.conj(src), src)
+        y = xx
+    return y.reshape(shape).swapaxes(dim, -1)
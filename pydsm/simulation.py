@@ -36,11 +36,18 @@ Functions
    :toctree: generated/
 
    simulateDSM   -- Delta sigma modulator simulation
+   simulateDSM_many -- Many concurrent delta sigma modulator simulations
+   simulateQDSM  -- Quadrature delta sigma modulator simulation
    ds_quantize   -- quantization function
+   ds_qquantize  -- quadrature quantization function
 """
 
 # Promote some functions/global variables to the simulation namespace
 from .delsig import simulateDSM
+from .delsig import simulateDSM_many
+from .delsig import simulateQDSM
 from .delsig import ds_quantize
+from .delsig import ds_qquantize
 
-__all__ = ['simulateDSM', 'ds_quantize']
+__all__ = ['simulateDSM', 'simulateDSM_many', 'simulateQDSM',
+           'ds_quantize', 'ds_qquantize']
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+from numpy.testing import TestCase, run_module_suite
+import numpy as np
+import scipy as sp
+__import__('scipy.signal')
+from pydsm.decimation import (CICDecimator, FIRDecimator, halfband_fir,
+                              decimation_chain)
+from pydsm.delsig import synthesizeNTF, simulateDSM
+
+__all__ = ["TestCICDecimator", "TestFIRDecimator", "TestDecimationChain"]
+
+
+def _chunked(dec, x, nchunks):
+    return np.concatenate([dec.update(c)
+                           for c in np.array_split(x, nchunks, axis=-1)],
+                          axis=-1)
+
+
+class TestCICDecimator(TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.x = rng.choice([-3, -1, 1, 3], size=(2, 10007))
+
+    def test_cic_reference(self):
+        ratio, order, delay = 16, 4, 2
+        h = np.ones(ratio*delay)
+        for i in range(order-1):
+            h = np.convolve(h, np.ones(ratio*delay))
+        ref = sp.signal.lfilter(h, 1, self.x, axis=1)[:, ratio-1::ratio]
+        dec = CICDecimator(ratio, order, delay)
+        y = _chunked(dec, self.x, 37)
+        self.assertEqual(y.dtype, np.int64)
+        np.testing.assert_array_equal(y, ref)
+
+    def test_cic_normalized(self):
+        dec = CICDecimator(8, 3, normalize=True)
+        y = dec.update(np.ones(800))
+        np.testing.assert_allclose(y[3:], 1.)
+
+    def test_cic_non_integer(self):
+        dec = CICDecimator(8)
+        self.assertRaises(ValueError, dec.update, np.array([0.5, 1.]))
+
+
+class TestFIRDecimator(TestCase):
+
+    def setUp(self):
+        self.x = np.random.RandomState(0).randn(10007)
+
+    def test_fir_reference(self):
+        h = sp.signal.firwin(40, 0.2)
+        ref = sp.signal.lfilter(h, 1, self.x)[2::3]
+        dec = FIRDecimator(h, 3)
+        np.testing.assert_allclose(_chunked(dec, self.x, 101), ref,
+                                   atol=1E-12)
+
+    def test_halfband(self):
+        h = halfband_fir(31, 0.125)
+        np.testing.assert_array_equal(h[1:15:2], 0.)
+        np.testing.assert_array_equal(h[17::2], 0.)
+        self.assertEqual(h[15], 0.5)
+        w, H = sp.signal.freqz(h, worN=4096, fs=1)
+        np.testing.assert_allclose(np.abs(H[w <= 0.125]), 1., atol=1E-6)
+        np.testing.assert_allclose(np.abs(H[w >= 0.375]), 0., atol=1E-6)
+
+
+class TestDecimationChain(TestCase):
+
+    def test_chain_chunking(self):
+        ntf = synthesizeNTF(5, 128, 1)
+        t = np.arange(65536)
+        v = simulateDSM(0.5*np.sin(2*np.pi*t*8./65536), ntf)[0]
+        dec = decimation_chain(64)
+        y1 = dec.apply(v, 3001)
+        dec.reset()
+        y2 = dec.apply(iter(np.array_split(v, 7)))
+        np.testing.assert_allclose(y1, y2, atol=1E-12)
+        self.assertEqual(len(y1), 1024)
+        # the in-band tone is preserved
+        Y = np.abs(np.fft.rfft(y1[512:]))/256
+        self.assertEqual(np.argmax(Y), 4)
+        self.assertAlmostEqual(Y[4], 0.5, 2)
+
+if __name__ == '__main__':
+    run_module_suite()
@@ -23,7 +23,8 @@
 from numpy.testing import TestCase, run_module_suite
 import numpy as np
 from scipy import signal
-from pydsm.ir import impulse_response
+from pydsm.ir import (impulse_response, impulse_responses,
+                      iter_impulse_response, guess_ir_length)
 from pydsm.delsig import evalTF
 from pydsm.relab import db
 
@@ -62,5 +63,52 @@ class TestIR(TestCase):
         ir = impulse_response(zpk, db=80)
         np.testing.assert_allclose(fir, ir)
 
+    def tail_db(self, h, ir):
+        full = impulse_response(h, m=100000)
+        np.testing.assert_allclose(full[:len(ir)], ir)
+        energy = np.sum(full**2)
+        return (10*np.log10(np.sum(full[len(ir):]**2)/energy),
+                10*np.log10(np.sum(full[len(ir)-1:]**2)/energy))
+
+    def test_repeated_poles_ir(self):
+        h = ([], [0.95]*6, 1.)
+        ir = impulse_response(h, db=80)
+        self.assertGreater(len(ir), guess_ir_length(h, db=80))
+        tail, tail1 = self.tail_db(h, ir)
+        # Shortest truncation leaving a tail below -80 dB
+        self.assertLessEqual(tail, -80)
+        self.assertGreater(tail1, -80)
+
+    def test_db_target(self):
+        hz = signal.butter(8, [0.005, 0.01], 'bandpass', output='zpk')
+        for target in [40, 80, 120]:
+            tail, tail1 = self.tail_db(hz, impulse_response(hz, db=target))
+            self.assertLessEqual(tail, -target)
+            self.assertGreater(tail1, -target)
+
+    def test_unstable(self):
+        self.assertRaises(ValueError, impulse_response, ([], [1.], 1.))
+        np.testing.assert_allclose(impulse_response(([], [1.], 1.), m=5),
+                                   np.ones(5))
+
+    def test_batch(self):
+        hh = [signal.butter(4, [w, 1.5*w], 'bandpass', output='zpk')
+              for w in [0.01, 0.05, 0.1]]
+        hh.append(([1.0, 0.5], [1.0, -0.9]))
+        for irs, kw in [(impulse_responses(hh), {}),
+                        (impulse_responses(hh, m=50), {'m': 50})]:
+            self.assertEqual(len(irs), len(hh))
+            for h, ir in zip(hh, irs):
+                np.testing.assert_array_equal(ir, impulse_response(h, **kw))
+
+    def test_chunks(self):
+        h = ([], [0.95]*6, 1.)
+        for m in [None, 250]:
+            chunks = list(iter_impulse_response(h, m=m, chunk=100))
+            self.assertTrue(all(len(c) == 100 for c in chunks[:-1]))
+            self.assertTrue(0 < len(chunks[-1]) <= 100)
+            np.testing.assert_array_equal(np.concatenate(chunks),
+                                          impulse_response(h, m=m))
+
 if __name__ == '__main__':
     run_module_suite()
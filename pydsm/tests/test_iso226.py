@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+from numpy.testing import TestCase, run_module_suite
+from pydsm.iso226 import (tabled_f, tabled_L_p, iso226_spl_itpl,
+                          ISO226Surface)
+
+__all__ = ["TestISO226Surface"]
+
+
+class TestISO226Surface(TestCase):
+
+    def setUp(self):
+        pass
+
+    def test_tabled_L_p_vector(self):
+        L_N = np.asarray([0., 20., 55., 90.])
+        for hfe in (False, True):
+            L_p = tabled_L_p(L_N, hfe)
+            self.assertEqual(L_p.shape, (4, len(tabled_f(hfe))))
+            for i, l in enumerate(L_N):
+                np.testing.assert_array_equal(L_p[i], tabled_L_p(l, hfe))
+
+    def test_surface_vs_itpl(self):
+        for hfe in (False, True):
+            surface = ISO226Surface(hfe)
+            ff = np.logspace(np.log10(20.), np.log10(tabled_f(hfe)[-1]), 100)
+            for L_N in (0., 3.3, 40., 40.2, 77.7, 90.):
+                np.testing.assert_allclose(surface(ff, L_N),
+                                           iso226_spl_itpl(L_N, hfe)(ff),
+                                           atol=1E-3)
+
+    def test_surface_pairs(self):
+        surface = ISO226Surface()
+        ff = np.asarray([100., 1000., 4000.])
+        ll = np.asarray([20., 40., 60.])
+        spl = surface(ff, ll)
+        self.assertEqual(spl.shape, (3,))
+        for f, l, s in zip(ff, ll, spl):
+            np.testing.assert_allclose(s, surface(f, l))
+        self.assertTrue(np.isscalar(surface(1000., 40.)))
+
+    def test_surface_table(self):
+        surface = ISO226Surface()
+        ff = np.asarray([1000., 100., 4000., 31.5])
+        ll = np.asarray([60., 0., 35.5])
+        np.testing.assert_allclose(surface.table(ff, ll),
+                                   surface(ff, ll[:, np.newaxis]),
+                                   rtol=1E-12)
+
+    def test_surface_range(self):
+        surface = ISO226Surface()
+        self.assertRaises(ValueError, surface, 1000., 91.)
+        self.assertRaises(ValueError, surface, [1000., 100.], [40., -1.])
+
+    def test_itpl_cache(self):
+        surface = ISO226Surface()
+        itpl = surface.itpl(40)
+        self.assertIs(surface.itpl(40.), itpl)
+        np.testing.assert_array_equal(itpl(tabled_f()),
+                                      iso226_spl_itpl(40)(tabled_f()))
+
+if __name__ == '__main__':
+    run_module_suite()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+import subprocess
+from numpy.testing import TestCase, run_module_suite
+
+__all__ = ["TestLazyImports"]
+
+
+def _loaded(code, modules):
+    """Tell which of modules are loaded after running code afresh"""
+    code = ("{}\nimport sys\n"
+            "print(' '.join(str(m in sys.modules) for m in {!r}))".
+            format(code, modules))
+    out = subprocess.check_output([sys.executable, '-c', code])
+    return [s == 'True' for s in out.decode().split()]
+
+
+class TestLazyImports(TestCase):
+
+    def setUp(self):
+        pass
+
+    def test_import_pydsm(self):
+        self.assertEqual(_loaded("import pydsm",
+                                 ['pydsm.delsig', 'scipy', 'matplotlib']),
+                         [False, False, False])
+
+    def test_simulation_only(self):
+        self.assertEqual(_loaded("from pydsm.delsig import simulateDSM",
+                                 ['scipy.signal', 'scipy.optimize',
+                                  'matplotlib']),
+                         [False, False, False])
+
+    def test_plotting_on_demand(self):
+        self.assertEqual(_loaded("import pydsm.delsig\n"
+                                 "pydsm.delsig.plotPZ",
+                                 ['pydsm.delsig._plot', 'matplotlib']),
+                         [True, True])
+
+    def test_attributes(self):
+        import pydsm
+        import pydsm.NTFdesign
+        self.assertTrue(callable(pydsm.ft.dtft))
+        self.assertTrue(callable(pydsm.NTFdesign.ntf_fir_weighting))
+        self.assertTrue(callable(pydsm.NTFdesign.weighting.q0_weighting))
+        self.assertIn('plotPZ', dir(pydsm.delsig))
+        self.assertIn('iso226', dir(pydsm))
+        self.assertRaises(AttributeError, getattr, pydsm, 'no_such_module')
+
+if __name__ == '__main__':
+    run_module_suite()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+
+from numpy.testing import TestCase, run_module_suite
+import numpy as np
+from pydsm.relab import cplxpair
+
+__all__ = ["TestCplxpair"]
+
+
+class TestCplxpair(TestCase):
+
+    def setUp(self):
+        pass
+
+    def test_pairs(self):
+        a = np.exp(2j*np.pi*np.arange(0, 5)/5)
+        np.testing.assert_allclose(
+            cplxpair(a[::-1]),
+            [-0.80901699-0.58778525j, -0.80901699+0.58778525j,
+             0.30901699-0.95105652j, 0.30901699+0.95105652j, 1.],
+            rtol=1e-8)
+
+    def test_repeated_real_part(self):
+        x = [1.+2j, 1.-1j, 3., 1.+1j, 1.-2j]
+        np.testing.assert_equal(cplxpair(x),
+                                [1.-2j, 1.-1j, 1.+2j, 1.+1j, 3.])
+
+    def test_perfect_pairs(self):
+        # Near conjugates become exact ones, near reals become reals
+        x = np.asarray([1.+1j, 1.-(1+1e-15)*1j, 2.+1e-16j])
+        y = cplxpair(x)
+        np.testing.assert_equal(y[0], np.conj(y[1]))
+        self.assertEqual(y[2].imag, 0.)
+
+    def test_real(self):
+        np.testing.assert_equal(cplxpair([[5, 6, 4], [3, 2, 1]], dim=1),
+                                [[4, 5, 6], [1, 2, 3]])
+        y = cplxpair(np.asarray([2., 1.], dtype=complex))
+        self.assertFalse(np.iscomplexobj(y))
+
+    def test_unpaired(self):
+        for x in [[1.+1j], [1.+1j, 1.+1j], [1.+1j, 2.-1j],
+                  [1.+1j, 1.-1j, 1.+2j, 1.-3j]]:
+            self.assertRaises(ValueError, cplxpair, x)
+        self.assertRaises(ValueError, cplxpair,
+                          [[1.+1j, 1.-1j], [1.+1j, 2.-1j]], dim=1)
+
+    def test_batch(self):
+        rng = np.random.RandomState(0)
+        z = rng.randn(50, 3)+1j*rng.randn(50, 3)
+        x = np.hstack((z, np.conj(z), rng.randn(50, 2)))
+        for row in x:
+            rng.shuffle(row)
+        y = cplxpair(x, dim=1)
+        for xi, yi in zip(x, y):
+            np.testing.assert_equal(cplxpair(xi), yi)
+        np.testing.assert_equal(cplxpair(x.T), y.T)
+        # Rows without complex pairs
+        x[0] = np.arange(8)
+        np.testing.assert_equal(cplxpair(x, dim=1)[0], np.arange(8))
+
+if __name__ == '__main__':
+    run_module_suite()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+import pickle
+import numpy as np
+from numpy.testing import TestCase, run_module_suite
+from scipy import signal
+from pydsm.tf import TF
+from pydsm.ir import impulse_response
+from pydsm.delsig import synthesizeNTF, simulateDSM, evalTF
+from pydsm.NTFdesign import quantization_noise_gain
+from pydsm.NTFdesign.weighting import q0_weighting, mult_weightings
+
+__all__ = ["TestTF"]
+
+
+class TestTF(TestCase):
+
+    def setUp(self):
+        self.h = synthesizeNTF(5, 32, 1)
+        self.tf = TF(self.h)
+
+    def test_tuple(self):
+        z, p, k = self.tf
+        np.testing.assert_array_equal(z, self.h[0])
+        np.testing.assert_array_equal(p, self.h[1])
+        self.assertEqual(k, self.h[2])
+        self.assertIs(TF(self.tf), self.tf)
+
+    def test_immutable(self):
+        self.assertRaises(ValueError, self.tf[0].__setitem__, 0, 0.)
+        self.assertRaises(AttributeError, setattr, self.tf, 'x', 0)
+        self.assertRaises(ValueError, self.tf.ba[0].__setitem__, 0, 0.)
+
+    def test_hash(self):
+        tf2 = TF(tuple(np.copy(x) for x in self.h))
+        self.assertEqual(self.tf, tf2)
+        self.assertEqual(hash(self.tf), hash(tf2))
+        self.assertEqual(TF(([-0.], [0.5], 1)), TF(([0.], [0.5], 1)))
+        self.assertNotEqual(self.tf, TF((self.h[0], self.h[1], 2)))
+        self.assertNotEqual(self.tf, self.h)
+        self.assertEqual(pickle.loads(pickle.dumps(self.tf)), self.tf)
+
+    def test_forms(self):
+        b, a = signal.zpk2tf(*self.h)
+        np.testing.assert_allclose(self.tf.ba[0], b)
+        np.testing.assert_allclose(self.tf.ba[1], a)
+        self.assertIs(self.tf.ba, self.tf.ba)
+        self.assertEqual(self.tf.ss[0].shape, (5, 5))
+        self.assertEqual(self.tf.sos.shape, (3, 6))
+        f, hf = self.tf.freqz(64)
+        np.testing.assert_allclose(hf, evalTF(self.h, np.exp(2j*np.pi*f)))
+
+    def test_ba(self):
+        ba = ([1., -1.], [1., -0.5])
+        tf = TF(ba)
+        np.testing.assert_array_equal(tf.ba[0], ba[0])
+        np.testing.assert_allclose(tf[0], [1.])
+        np.testing.assert_allclose(tf[1], [0.5])
+
+    def test_consumers(self):
+        np.testing.assert_allclose(impulse_response(self.tf),
+                                   impulse_response(self.h))
+        self.assertIs(impulse_response(self.tf), impulse_response(self.tf))
+        u = 0.5*np.sin(2*np.pi*85/8192*np.arange(8192))
+        np.testing.assert_equal(simulateDSM(u, self.tf)[0],
+                                simulateDSM(u, self.h)[0])
+
+    def test_weighting(self):
+        # A TF is accepted wherever a filter weighting is
+        w = signal.butter(4, 0.05, output='zpk')
+        tw = TF(w)
+        np.testing.assert_allclose(quantization_noise_gain(self.h, tw),
+                                   quantization_noise_gain(self.h, w))
+        np.testing.assert_allclose(q0_weighting(4, tw), q0_weighting(4, w))
+        f = np.linspace(0, 0.5, 11)
+        np.testing.assert_allclose(mult_weightings(tw, tw)(f),
+                                   mult_weightings(w, w)(f))
+
+if __name__ == '__main__':
+    run_module_suite()
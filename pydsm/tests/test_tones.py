@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+from numpy.testing import TestCase, run_module_suite
+import numpy as np
+import scipy as sp
+__import__('scipy.signal')
+from pydsm.ft import extract_tones, ToneExtractor
+
+__all__ = ["TestExtractTones"]
+
+
+class TestExtractTones(TestCase):
+
+    def setUp(self):
+        self.x = np.random.RandomState(0).randn(3, 5001)
+        self.f = np.array([0.0123, 0.2, 0.])
+
+    def reference(self, window, t0=0):
+        if window is None:
+            win = np.ones(self.x.shape[1])
+        else:
+            win = sp.signal.get_window(window, self.x.shape[1])
+        n = np.arange(self.x.shape[1])+t0
+        X = np.dot(self.x*win, np.exp(-2j*np.pi*np.outer(n, self.f)))
+        return X*np.array([2., 2., 1.])/np.sum(win)
+
+    def test_windows(self):
+        for window in [None, 'hann', 'blackman', 'flattop', ('kaiser', 8)]:
+            X = extract_tones(self.x, self.f, window=window, t0=7, block=999)
+            np.testing.assert_allclose(X, self.reference(window, 7),
+                                       atol=1E-12)
+
+    def test_streaming(self):
+        ext = ToneExtractor(2*self.f, 2., 'blackman', self.x.shape[1])
+        for c in np.array_split(self.x, 13, axis=1):
+            ext.update(c)
+        np.testing.assert_allclose(ext.tones(), self.reference('blackman'),
+                                   atol=1E-12)
+
+    def test_incomplete(self):
+        ext = ToneExtractor(self.f, nsamples=6000).update(self.x)
+        self.assertRaises(ValueError, ext.tones)
+
+    def test_tone(self):
+        n = np.arange(100000)
+        x = 0.7*np.cos(2*np.pi*0.0123*n+0.4)
+        X = extract_tones(x, 0.0123, window='blackmanharris')
+        self.assertEqual(np.shape(X), ())
+        self.assertAlmostEqual(np.abs(X), 0.7, 8)
+        self.assertAlmostEqual(np.angle(X), 0.4, 8)
+
+    def test_nyquist(self):
+        x = 0.7*np.cos(np.pi*np.arange(1024))
+        self.assertAlmostEqual(extract_tones(x, [0.5])[0], 0.7, 12)
+        self.assertAlmostEqual(extract_tones(x, 1., fs=2., window=None),
+                               0.7, 12)
+
+if __name__ == '__main__':
+    run_module_suite()
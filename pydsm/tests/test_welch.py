@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+from numpy.testing import TestCase, run_module_suite
+import numpy as np
+import scipy as sp
+__import__('scipy.signal')
+from pydsm.ft import WelchPSD
+
+__all__ = ["TestWelchPSD"]
+
+
+class TestWelchPSD(TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.x = rng.randn(3, 20000)
+
+    def check_chunked(self, chunks, **kwargs):
+        f0, P0 = sp.signal.welch(self.x[0], **kwargs)
+        est = WelchPSD(batch=3, **kwargs)
+        for c in np.array_split(self.x[0], chunks):
+            est.update(c)
+        f1, P1 = est.psd()
+        np.testing.assert_allclose(f1, f0, rtol=1E-12)
+        np.testing.assert_allclose(P1, P0, rtol=1E-10)
+
+    def test_welch_single_block(self):
+        self.check_chunked(1, nperseg=1024)
+
+    def test_welch_chunks(self):
+        self.check_chunked(37, nperseg=1024, fs=2.)
+
+    def test_welch_odd_spectrum(self):
+        self.check_chunked(11, nperseg=511, noverlap=100,
+                           window='blackman', scaling='spectrum',
+                           detrend='linear')
+
+    def test_welch_twosided(self):
+        self.check_chunked(5, nperseg=256, return_onesided=False,
+                           detrend=False)
+
+    def test_welch_channels(self):
+        f0, P0 = sp.signal.welch(self.x, nperseg=2048, axis=-1)
+        est = WelchPSD(nperseg=2048)
+        for c in np.array_split(self.x, 7, axis=1):
+            est.update(c)
+        f1, P1 = est.psd()
+        np.testing.assert_allclose(P1, P0, rtol=1E-10)
+
+    def test_welch_too_short(self):
+        est = WelchPSD(nperseg=1024).update(np.ones(1000))
+        self.assertRaises(ValueError, est.psd)
+
+if __name__ == '__main__':
+    run_module_suite()
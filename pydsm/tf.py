@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2012, Sergio Callegari
+# All rights reserved.
+
+# This file is part of PyDSM.
+
+# PyDSM is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyDSM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyDSM.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Transfer function objects (:mod:`pydsm.tf`)
+===========================================
+
+Immutable transfer functions of DT filters, caching their alternative
+representations.
+
+Throughout PyDSM, filters and NTFs are passed around as zpk or ba tuples.
+A :class:`TF` is a zpk tuple itself, so it is accepted everywhere these
+are. However, it computes its other forms (ba, state space, SOS, impulse
+response, frequency response) only once, on first request. This saves
+repeated conversions when the same NTF is evaluated, simulated and
+analyzed many times over.
+
+.. currentmodule:: pydsm.tf
+
+Classes
+-------
+
+.. autosummary::
+   :toctree: generated/
+
+   TF  -- Immutable transfer function with cached representations
+"""
+
+import numpy as np
+from ._lazy import lazy_module
+sp = lazy_module('scipy')
+
+__all__ = ["TF"]
+
+
+def _frozen(x):
+    # Read only copy of an array, or of a tuple of arrays
+    if isinstance(x, tuple):
+        return tuple(_frozen(xi) for xi in x)
+    x = np.array(x)
+    x.setflags(write=False)
+    return x
+
+
+class TF(tuple):
+    """
+    Immutable transfer function of a DT filter, with cached representations.
+
+    Parameters
+    ----------
+    h : tuple_like
+        the filter definition either in zpk or in ba form, or another TF.
+
+    Notes
+    -----
+    A TF is a (z, p, k) tuple, where the zeros z and the poles p are read
+    only complex arrays and the gain k is a scalar. Hence, it can be
+    passed to any PyDSM function expecting a filter or an NTF in zpk form.
+    The functions that can take advantage of the cached representations
+    (e.g. :func:`pydsm.ir.impulse_response`,
+    :func:`pydsm.delsig.evalTF`, :func:`pydsm.delsig.simulateDSM`)
+    do so automatically.
+
+    TFs are hashable, so that they can be used as keys in other caches.
+    Two TFs are equal when their zeros, poles and gain are identical, in
+    the same order. A TF is never equal to a plain tuple.
+
+    When a TF is built from the ba form, that is kept as it is and
+    returned by :attr:`ba`.
+
+    Examples
+    --------
+    >>> from pydsm.delsig import synthesizeNTF
+    >>> ntf = TF(synthesizeNTF(5, 32, 1))
+    >>> ntf.ba is ntf.ba
+    True
+    >>> len({ntf: 'a', TF(ntf.ba): 'b'})
+    2
+    """
+
+    def __new__(cls, h):
+        if isinstance(h, TF):
+            return h
+        ba = None
+        if len(h) == 2:
+            ba = _frozen((np.atleast_1d(h[0]), np.atleast_1d(h[1])))
+            z, p, k = sp.signal.tf2zpk(*ba)
+        elif len(h) == 3:
+            z, p, k = h
+        else:
+            raise ValueError('Invalid filter specification: '
+                             'zpk or ba tuple expected')
+        # Adding 0 turns negative zeros into positive ones, so that equal
+        # TFs have equal hashes
+        z = _frozen(np.asarray(z, dtype=complex).reshape(-1)+0.)
+        p = _frozen(np.asarray(p, dtype=complex).reshape(-1)+0.)
+        k = np.asarray(k).item()+0.
+        self = tuple.__new__(cls, (z, p, k))
+        self.__dict__['_cache'] = {}
+        if ba is not None:
+            self._cache['ba'] = ba
+        return self
+
+    def __reduce__(self):
+        # Caches are not pickled
+        return (TF, (tuple(self),))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('TF objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('TF objects are immutable')
+
+    def _key(self):
+        z, p, k = self
+        return (z.tobytes(), p.tobytes(), k)
+
+    def __hash__(self):
+        return self.cached('hash', lambda: hash(self._key()))
+
+    def __eq__(self, other):
+        # Never fall back to the tuple comparison, which is ambiguous on
+        # arrays
+        if not isinstance(other, TF):
+            return False
+        return self is other or self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return 'TF((%r, %r, %r))' % (self[0], self[1], self[2])
+
+    def cached(self, key, compute):
+        """
+        Returns a quantity derived from the TF, computing it once.
+
+        Parameters
+        ----------
+        key : hashable
+            name of the quantity
+        compute : callable
+            function without arguments computing the quantity. It is only
+            called if the quantity is not in the cache yet.
+
+        Returns
+        -------
+        value : any
+            the cached quantity
+
+        Notes
+        -----
+        This is how PyDSM functions attach their own preprocessed forms of
+        a filter (e.g. a modulator realization) to it. The cached value is
+        shared, so it should never be modified.
+        """
+        cache = self._cache
+        try:
+            return cache[key]
+        except KeyError:
+            return cache.setdefault(key, compute())
+
+    @property
+    def zpk(self):
+        """Zeros, poles and gain, as a plain tuple."""
+        return tuple(self)
+
+    @property
+    def ba(self):
+        """Numerator and denominator coefficients, in decreasing powers."""
+        return self.cached('ba',
+                           lambda: _frozen(sp.signal.zpk2tf(*self)))
+
+    @property
+    def ss(self):
+        """State space form (A, B, C, D)."""
+        return self.cached('ss',
+                           lambda: _frozen(sp.signal.zpk2ss(*self)))
+
+    @property
+    def sos(self):
+        """Second order sections, as returned by scipy zpk2sos."""
+        return self.cached('sos',
+                           lambda: _frozen(sp.signal.zpk2sos(*self)))
+
+    def impulse_response(self, m=None, db=80):
+        """
+        Computes the filter impulse response, once per m and db.
+
+        See :func:`pydsm.ir.impulse_response` for the meaning of the
+        parameters and of the result.
+        """
+        from .ir import _ir_blocks
+
+        def compute():
+            return _frozen(np.concatenate(
+                [np.zeros(0)]+list(_ir_blocks(self, m, db, None))))
+        return self.cached(('impulse_response', m, db), compute)
+
+    def freqz(self, n=512, whole=False):
+        """
+        Computes the frequency response on a grid, once per n and whole.
+
+        Parameters
+        ----------
+        n : int, optional
+            number of frequency points. Defaults to 512.
+        whole : bool, optional
+            whether the grid spans [0, 1) rather than [0, 0.5).
+            Defaults to False.
+
+        Returns
+        -------
+        f : ndarray
+            the normalized frequencies of the grid
+        h : ndarray
+            the frequency response at f
+
+        Notes
+        -----
+        The response is computed as in :func:`pydsm.delsig.evalTF`, so
+        that high order filters do not overflow.
+        """
+        from .delsig._tf import _tf_evaluator
+
+        def compute():
+            f = np.arange(n)*((1. if whole else 0.5)/n)
+            h = _tf_evaluator(self)(np.exp(2j*np.pi*f))
+            return _frozen((f, h))
+        return self.cached(('freqz', n, bool(whole)), compute)
@@ -54,6 +54,9 @@ ext_modules = [
               libraries=['cblas']),
     Extension('pydsm.delsig._simulateDSM_scipy_blas',
               ['pydsm/delsig/_simulateDSM_scipy_blas.pyx'],
+              include_dirs=[np.get_include()]),
+    Extension('pydsm.delsig._simulateQDSM_scipy_blas',
+              ['pydsm/delsig/_simulateQDSM_scipy_blas.pyx'],
               include_dirs=[np.get_include()])]
 
 description = 'Python Based Delta-Sigma modulator design tools'
@@ -69,6 +72,9 @@ if platform.system() != 'Linux':
     ext_modules = [
         Extension('pydsm.delsig._simulateDSM_scipy_blas',
                   ['pydsm/delsig/_simulateDSM_scipy_blas.pyx'],
+                  include_dirs=[np.get_include()]),
+        Extension('pydsm.delsig._simulateQDSM_scipy_blas',
+                  ['pydsm/delsig/_simulateQDSM_scipy_blas.pyx'],
                   include_dirs=[np.get_include()])]
 
 setup(
@@ -81,10 +87,9 @@ setup(
     url='https://github.com/sergiocallegari/PyDSM',
     license='GNU General Public License v3 or later (GPLv3+)',
     platforms=['Linux', 'Windows', 'Mac'],
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     package_data={'pydsm': ['RELEASE-VERSION'],
-                  '': ['tests/*.py', 'tests/Data/*',
-                       'benchmarks/*.py', 'benchmarks/Data/*']},
+                  '': ['tests/*.py', 'tests/Data/*']},
     ext_modules=ext_modules,
     test_suite="nose.collector",
     requires=['scipy (>=0.10.1)',